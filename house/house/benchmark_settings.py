@@ -0,0 +1,34 @@
+"""
+Settings for running `manage.py run_benchmarks` on a laptop: SQLite and the
+local-memory cache instead of MySQL and Redis.
+
+    DJANGO_SETTINGS_MODULE=house.benchmark_settings python manage.py run_benchmarks
+"""
+import os
+import tempfile
+from .settings import *  # noqa: F401,F403
+from .settings import SECRET_KEY
+
+SECRET_KEY = SECRET_KEY or "benchmark-only-secret-key"
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        # the benchmarks run in a throwaway test database; keep its base file out of the source tree
+        "NAME": os.path.join(tempfile.gettempdir(), "house-benchmark.sqlite3"),
+    }
+}
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "sessions": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "sessions",
+    },
+    "auth": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "auth",
+    },
+}
@@ -0,0 +1,27 @@
+"""
+Settings for trying replica routing on a laptop: two SQLite files stand in
+for the primary and a replica that never catches up.
+
+    export DJANGO_SETTINGS_MODULE=house.replica_settings
+    python manage.py migrate && python manage.py migrate --database replica
+    python manage.py runserver
+
+Reads of list and detail views come from replica.sqlite3 except for a
+landlord who wrote within REPLICA_PIN_SECONDS, so new rows show up only
+while pinned.
+"""
+from .benchmark_settings import *  # noqa: F401,F403
+from .settings import BASE_DIR
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "primary.sqlite3",
+    },
+    "replica": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "replica.sqlite3",
+    },
+}
+
+DATABASE_REPLICAS = ["replica"]
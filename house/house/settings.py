@@ -60,6 +60,11 @@ SESSION_EXPIRE_AT_BROWSER_CLOSE = True
 SESSION_COOKIE_AGE = 60 * 30  # 30 minutes
 # always ask for authentication after 5 minutes of inactivity
 SESSION_SAVE_EVERY_REQUEST = True
+# sessions live in the cache; unchanged sessions are only touched to slide their expiry
+SESSION_ENGINE = 'tennants.sessions'
+SESSION_CACHE_ALIAS = 'sessions'
+# set to True to keep logins working on the database while Redis is down
+SESSION_DB_FALLBACK = False
 
 
 
@@ -157,15 +162,28 @@ UNFOLD = {
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'tennants.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_RENDERER_CLASSES': [
+        'tennants.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'tennants.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'tennants.pagination.OptionalCursorPagination',
     'PAGE_SIZE': 10,
 }
 
+# JWT requests reuse the user row for this many seconds (see tennants.authentication)
+JWT_USER_CACHE_TTL = 60
+JWT_USER_CACHE_ALIAS = 'auth'
+
 CACHES = {
     "default": {
         "BACKEND": "django_redis.cache.RedisCache",
@@ -173,13 +191,34 @@ CACHES = {
         "OPTIONS": {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
         }
-    }
+    },
+    # its own database, so clearing cached pages does not log everyone out
+    "sessions": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": "redis://127.0.0.1:6379/2",
+        "OPTIONS": {
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+        }
+    },
+    # users resolved by CachedJWTAuthentication, kept apart from the pages for the same reason
+    "auth": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": "redis://127.0.0.1:6379/3",
+        "OPTIONS": {
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+        }
+    },
 }
 
 CACHE_TTL = 60 * 15  # 15 minutes
 
+# RequestMetricsMiddleware sends X-Query-Count and friends when REQUEST_METRICS_HEADERS is on
+# (defaults to DEBUG); the text of every statement is only kept for the query budget tests
+REQUEST_METRICS_KEEP_STATEMENTS = False
+
 
 MIDDLEWARE = [
+    'tennants.middleware.RequestMetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -245,6 +284,20 @@ DATABASES = {
     }
 }
 
+# read replica of the MySQL primary; list and detail views read from it (see tennants.routers)
+if os.getenv('REPLICA_HOST'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST': os.getenv('REPLICA_HOST'),
+        'PORT': os.getenv('REPLICA_PORT', os.getenv('PORT')),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['tennants.routers.ReplicaRouter']
+# seconds a landlord reads from the primary after a write; keep above the replication lag
+REPLICA_PIN_SECONDS = 5
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
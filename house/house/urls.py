@@ -196,4 +196,5 @@ urlpatterns = [
     path("login/", auth_views.LoginView.as_view(template_name='login.html'), name="login"),
     path("dashboard/", login_required(views.dashboard), name="dashboard"),
     path("logout/", auth_views.LogoutView.as_view(), name="logout"),    
+    path("", include("tennants.web_urls")),
 ]
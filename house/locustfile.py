@@ -0,0 +1,303 @@
+"""
+Capacity test for the landlord API.
+
+    pip install locust
+    python manage.py seed_load_test --large 2 --small 20      # writes load_users.json
+    python manage.py runserver --noreload                      # or gunicorn with N workers
+    locust --headless --host http://localhost:8000 \
+        --slo-p95-ms 500 --step-users 10 --step-seconds 60 --server-workers 1 --report-file locust-report.json
+
+Two personas log in as pre-seeded landlords: a few large estates paging
+through hundreds of tenants, and many small landlords with a handful of
+houses. The step load shape adds `--step-users` users every `--step-seconds`
+and stops at the first step whose p95 crosses `--slo-p95-ms` (or whose
+error rate crosses `--max-error-rate`). The report file holds latency
+percentiles and error rates per endpoint, the load steps, and the requests
+per second per server worker (`--server-workers`) of the last step within the SLO.
+"""
+import itertools
+import json
+import random
+from datetime import datetime
+from locust import HttpUser, LoadTestShape, between, events, task
+
+PERSONAS = ('large_estate', 'small_landlord')
+_accounts = {}
+
+
+@events.init_command_line_parser.add_listener
+def add_arguments(parser):
+    parser.add_argument('--users-file', default='load_users.json', env_var='LOCUST_USERS_FILE',
+                        help='Credentials written by `manage.py seed_load_test`')
+    parser.add_argument('--report-file', default='locust-report.json', env_var='LOCUST_REPORT_FILE')
+    parser.add_argument('--slo-p95-ms', type=float, default=500, env_var='LOCUST_SLO_P95_MS')
+    parser.add_argument('--max-error-rate', type=float, default=0.01, env_var='LOCUST_MAX_ERROR_RATE')
+    parser.add_argument('--step-users', type=int, default=10, env_var='LOCUST_STEP_USERS')
+    parser.add_argument('--step-seconds', type=int, default=60, env_var='LOCUST_STEP_SECONDS')
+    parser.add_argument('--max-steps', type=int, default=20, env_var='LOCUST_MAX_STEPS')
+    parser.add_argument('--server-workers', type=int, default=1, env_var='LOCUST_SERVER_WORKERS',
+                        help='Processes serving the app, to report requests per second per worker')
+
+
+@events.init.add_listener
+def load_accounts(environment, **kwargs):
+    options = environment.parsed_options
+    if options is None:
+        return
+    with open(options.users_file) as handle:
+        accounts = json.load(handle)
+    for persona in PERSONAS:
+        # each simulated user takes the next account of its persona
+        _accounts[persona] = itertools.cycle([a for a in accounts if a['persona'] == persona] or [None])
+
+
+class LandlordUser(HttpUser):
+    abstract = True
+    persona = None
+
+    def on_start(self):
+        self.access_token = self.refresh_token = None
+        self.tenant_ids = []
+        self.next_page = None
+        self.account = next(_accounts[self.persona])
+        if self.account is None:
+            raise RuntimeError(f'No {self.persona} accounts in the users file; run `manage.py seed_load_test`')
+        self.login()
+        self.load_tenants()
+
+    def login(self):
+        raise NotImplementedError
+
+    def store_tokens(self, response, access_key, refresh_key):
+        if response.status_code != 200:
+            response.failure(f'login failed with {response.status_code}')
+            return
+        data = response.json()
+        self.access_token, self.refresh_token = data.get(access_key), data.get(refresh_key)
+        if not self.access_token:
+            response.failure('no access token in response')
+
+    def refresh(self):
+        with self.client.post('/api/token/refresh/', json={'refresh': self.refresh_token},
+                              name='/api/token/refresh/', catch_response=True) as response:
+            if response.status_code == 200:
+                self.access_token = response.json()['access']
+            else:
+                response.failure(f'refresh failed with {response.status_code}')
+
+    def api(self, method, url, name=None, expected=(200,), **kwargs):
+        """ Authenticated request, refreshing the access token once on 401. """
+        for attempt in range(2):
+            headers = {'Authorization': f'Bearer {self.access_token}'}
+            with self.client.request(method, url, name=name or url, headers=headers,
+                                     catch_response=True, **kwargs) as response:
+                if response.status_code == 401 and attempt == 0:
+                    # not an error of the endpoint under test; retried below
+                    response.success()
+                    self.refresh()
+                    continue
+                if response.status_code not in expected:
+                    response.failure(f'{response.status_code}: {response.text[:200]}')
+                return response
+
+    def load_tenants(self):
+        response = self.api('GET', '/api/tennants/?cursor=', name='/api/tennants/?cursor=')
+        if response.status_code == 200:
+            self.tenant_ids = [tenant['id'] for tenant in response.json()['results']]
+
+    def tenant_detail(self):
+        if self.tenant_ids:
+            self.api('GET', f'/api/tennants/{random.choice(self.tenant_ids)}/', name='/api/tennants/[id]/')
+
+    def record_payment(self):
+        if not self.tenant_ids:
+            return
+        # far-future periods keep concurrent users from colliding on (tenant, year, month)
+        self.api('POST', '/api/rentpayments/', name='/api/rentpayments/ [create]', expected=(201,), json={
+            'tenant': random.choice(self.tenant_ids),
+            'year': random.randint(2030, 2099),
+            'rent_month': random.randint(1, 12),
+            'amount_paid': random.randint(5, 40) * 1000,
+            'payment_method': random.choice(['cash', 'mobile_money', 'bank_transfer']),
+        })
+
+    def rename_tenant(self):
+        if self.tenant_ids:
+            self.api('PATCH', f'/api/tennants/{random.choice(self.tenant_ids)}/', name='/api/tennants/[id]/ [update]',
+                     json={'full_name': f'Tenant {datetime.now():%H%M%S%f}'[:50]})
+
+
+class LargeEstateLandlord(LandlordUser):
+    """ Few of them, reading deep into large lists and reports. """
+    persona = 'large_estate'
+    weight = 1
+    wait_time = between(1, 3)
+
+    def login(self):
+        with self.client.post('/api/token/', name='/api/token/', catch_response=True, json={
+            'username': self.account['username'], 'password': self.account['password'],
+        }) as response:
+            self.store_tokens(response, 'access', 'refresh')
+
+    @task(10)
+    def list_tenants(self):
+        self.api('GET', '/api/tennants/')
+
+    @task(6)
+    def page_tenants(self):
+        url = self.next_page or '/api/tennants/?cursor='
+        response = self.api('GET', url, name='/api/tennants/?cursor=[page]')
+        if response.status_code == 200:
+            self.next_page = response.json().get('next')
+
+    @task(5)
+    def list_houses(self):
+        self.api('GET', '/api/houses/')
+
+    @task(4)
+    def list_rent_payments(self):
+        self.api('GET', '/api/rentpayments/')
+
+    @task(4)
+    def arrears(self):
+        self.api('GET', '/api/arrears/')
+
+    @task(2)
+    def arrears_summary(self):
+        self.api('GET', '/api/arrears/summary/')
+
+    @task(2)
+    def counts(self):
+        self.api('GET', '/api/counts/')
+
+    @task(1)
+    def collections(self):
+        self.api('GET', f'/api/collections/?year={datetime.now().year}', name='/api/collections/')
+
+    @task(3)
+    def view_tenant(self):
+        self.tenant_detail()
+
+    @task(2)
+    def pay(self):
+        self.record_payment()
+
+    @task(1)
+    def update_tenant(self):
+        self.rename_tenant()
+
+
+class SmallLandlord(LandlordUser):
+    """ Many of them, checking a handful of houses and recording payments. """
+    persona = 'small_landlord'
+    weight = 3
+    wait_time = between(2, 5)
+
+    def login(self):
+        with self.client.post('/api/user/login/', name='/api/user/login/', catch_response=True, json={
+            'username': self.account['username'], 'password': self.account['password'],
+        }) as response:
+            self.store_tokens(response, 'access_token', 'refresh_token')
+
+    @task(5)
+    def list_flats(self):
+        self.api('GET', '/api/flats/')
+
+    @task(5)
+    def list_houses(self):
+        self.api('GET', '/api/houses/')
+
+    @task(5)
+    def list_tenants(self):
+        self.api('GET', '/api/tennants/')
+
+    @task(2)
+    def view_tenant(self):
+        self.tenant_detail()
+
+    @task(2)
+    def arrears(self):
+        self.api('GET', '/api/arrears/')
+
+    @task(2)
+    def pay(self):
+        self.record_payment()
+
+
+class CapacitySteps(LoadTestShape):
+    """ Step the user count up until p95 or the error rate leaves the SLO. """
+
+    def __init__(self):
+        super().__init__()
+        self.steps = []
+        self.stopped = False
+
+    def sample(self, users):
+        total = self.runner.environment.stats.total
+        rps = total.current_rps or 0
+        self.steps.append({
+            'users': users,
+            'rps': round(rps, 2),
+            'p95_ms': total.get_current_response_time_percentile(0.95) or 0,
+            'error_rate': round(total.current_fail_per_sec / rps, 4) if rps else 0,
+        })
+        return self.steps[-1]
+
+    def tick(self):
+        if self.stopped:
+            return None
+        options = self.runner.environment.parsed_options
+        step = int(self.get_run_time() // options.step_seconds)
+        if step > len(self.steps):
+            # sample the step that just ended, over locust's trailing window
+            last = self.sample((len(self.steps) + 1) * options.step_users)
+            if last['p95_ms'] > options.slo_p95_ms or last['error_rate'] > options.max_error_rate \
+                    or step >= options.max_steps:
+                self.stopped = True
+                return None
+        return (step + 1) * options.step_users, options.step_users
+
+
+def endpoint_stats(entry):
+    return {
+        'requests': entry.num_requests,
+        'failures': entry.num_failures,
+        'error_rate': round(entry.fail_ratio, 4),
+        'rps': round(entry.total_rps, 2),
+        'avg_ms': round(entry.avg_response_time, 1),
+        'p50_ms': entry.get_response_time_percentile(0.5),
+        'p95_ms': entry.get_response_time_percentile(0.95),
+        'p99_ms': entry.get_response_time_percentile(0.99),
+    }
+
+
+@events.quitting.add_listener
+def write_report(environment, **kwargs):
+    options = environment.parsed_options
+    if options is None or environment.stats is None:
+        return
+    shape = environment.shape_class
+    steps = getattr(shape, 'steps', [])
+    within_slo = [
+        step for step in steps
+        if step['p95_ms'] <= options.slo_p95_ms and step['error_rate'] <= options.max_error_rate
+    ]
+    best = max(within_slo, key=lambda step: step['rps'], default=None)
+    report = {
+        'slo_p95_ms': options.slo_p95_ms,
+        'max_error_rate': options.max_error_rate,
+        'server_workers': options.server_workers,
+        'capacity': best and {
+            'users': best['users'],
+            'rps': best['rps'],
+            'rps_per_worker': round(best['rps'] / max(options.server_workers, 1), 2),
+        },
+        'steps': steps,
+        'total': endpoint_stats(environment.stats.total),
+        'endpoints': {
+            f'{method} {name}': endpoint_stats(entry)
+            for (name, method), entry in sorted(environment.stats.entries.items())
+        },
+    }
+    with open(options.report_file, 'w') as handle:
+        json.dump(report, handle, indent=2)
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Tenant, House, RentPayment,FlatBuilding,PaymentHistory
+from .models import Tenant, House, RentPayment,FlatBuilding,PaymentHistory,TenantLedgerEntry,RentReminder,TenantArrears,BuildingCollection
 from django.contrib.auth.models import Group
 from rest_framework.authtoken.models import Token
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
@@ -14,6 +14,7 @@ class TenantAdmin(admin.ModelAdmin):
     list_display = ('user','full_name', 'email', 'phone', 'house', 'rent', 'security_deposit', 'balance','building_name')
     ordering = ('full_name',)
     readonly_fields = ('rent', 'security_deposit', 'balance','user')
+    list_select_related = ('user', 'house__flat_building')
 
     def deposit_amount(self, obj):
         return obj.security_deposit
@@ -38,6 +39,7 @@ class HouseAdmin(admin.ModelAdmin):
     readonly_fields = ( 'occupation',)
     list_filter = ('flat_building', 'occupation')
     search_fields = ('house_number', 'flat_building__building_name')
+    list_select_related = ('flat_building',)
 
 
     def save_model(self, request, obj, form, change):
@@ -49,6 +51,7 @@ class RentPaymentAdmin(admin.ModelAdmin):
     list_filter = ('payment_date',)
     ordering = ('-payment_date',)
     readonly_fields = ('rent_amount', 'balance',)
+    list_select_related = ('user', 'tenant')
 
     def house(self, obj):
         return obj.tenant.house.house_number if obj.tenant and obj.tenant.house else None
@@ -64,20 +67,27 @@ class RentPaymentAdmin(admin.ModelAdmin):
 class FlatBuildingAdmin(admin.ModelAdmin):
     list_display = ('user','building_name', 'address', 'number_of_houses', 'how_many_occupied', 'vacant_houses','tenant_count')
     search_fields = ('biulding_name', 'address')
+    list_select_related = ('user',)
     readonly_fields = ('how_many_occupied', 'vacant_houses')
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_stats()
+
     def how_many_occupied(self, obj):
         return obj.how_many_occupied
     how_many_occupied.short_description = 'Occupied Houses'
+    how_many_occupied.admin_order_field = 'occupied_total'
 
     def tenant_count(self, obj):
         return obj.tenant_count()
     tenant_count.short_description = 'Number of Tenants'
+    tenant_count.admin_order_field = 'active_tenant_total'
 
 
     def vacant_houses(self, obj):
         return obj.vacant_houses
     vacant_houses.short_description = 'Vacant Houses'
+    vacant_houses.admin_order_field = 'vacant_total'
 
     def save_model(self, request, obj, form, change):
         super().save_model(request, obj, form, change)
@@ -88,7 +98,69 @@ class PaymentHistoryAdmin(admin.ModelAdmin):
     list_display = ("user",'tenant', 'house', 'payment_amount', 'payment_date', 'payment_method')
     list_filter = ('payment_date',)
     ordering = ('-payment_date',)
+    list_select_related = ('user', 'tenant', 'house__flat_building')
 
     def save_model(self, request, obj, form, change):
         obj.auto_set_fields()
-        super().save_model(request, obj, form, change)
\ No newline at end of file
+        super().save_model(request, obj, form, change)
+
+
+@admin.register(TenantLedgerEntry)
+class TenantLedgerEntryAdmin(admin.ModelAdmin):
+    list_display = ('tenant', 'entry_type', 'amount', 'rent_payment', 'created_at')
+    list_filter = ('entry_type',)
+    ordering = ('-created_at',)
+    list_select_related = ('tenant', 'rent_payment__tenant')
+
+    # the ledger is append-only, and entries are only posted alongside the
+    # tenant's stored balance; an admin-added row would leave it behind
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(RentReminder)
+class RentReminderAdmin(admin.ModelAdmin):
+    list_display = ('tenant', 'cycle', 'kind', 'amount_due', 'backend', 'sent_at')
+    list_filter = ('kind', 'cycle')
+    ordering = ('-sent_at',)
+    list_select_related = ('tenant',)
+
+    # reminders are a send log
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(TenantArrears)
+class TenantArrearsAdmin(admin.ModelAdmin):
+    list_display = ('tenant', 'flat_building', 'current', 'days_1_30', 'days_31_60', 'days_61_90',
+                    'days_over_90', 'total', 'as_of')
+    ordering = ('-total',)
+    list_select_related = ('tenant', 'flat_building')
+
+    # rebuilt from the invoices by rebuild_arrears
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(BuildingCollection)
+class BuildingCollectionAdmin(admin.ModelAdmin):
+    list_display = ('flat_building', 'year', 'month', 'expected_rent', 'collected', 'paid_invoices', 'unpaid_invoices')
+    list_filter = ('year', 'month')
+    ordering = ('-year', '-month')
+    list_select_related = ('flat_building',)
+
+    # rebuilt from the invoices by backfill_collections
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
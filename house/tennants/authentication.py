@@ -0,0 +1,77 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+# seconds a resolved user is reused; bounds staleness for writes that skip signals (queryset.update())
+JWT_USER_CACHE_TTL = 60
+# what the API's views and permission checks read from request.user; never the password hash
+CACHED_USER_FIELDS = ('id', 'username', 'is_active', 'is_staff', 'is_superuser')
+
+
+def user_cache():
+    """ JWT_USER_CACHE_ALIAS: its own Redis alias by default, so clearing cached pages keeps the users. """
+    return caches[getattr(settings, 'JWT_USER_CACHE_ALIAS', 'auth')]
+
+
+def user_cache_key(user_id):
+    return f"jwt_user:{user_id}"
+
+
+def evict_cached_user(user_id):
+    user_cache().delete(user_cache_key(user_id))
+
+
+def cache_user(user):
+    entry = {field: getattr(user, field) for field in CACHED_USER_FIELDS}
+    # enough for the revoke check without caching the hash itself
+    entry['password_digest'] = get_md5_hash_password(user.password)
+    user_cache().set(user_cache_key(user.pk), entry, getattr(settings, 'JWT_USER_CACHE_TTL', JWT_USER_CACHE_TTL))
+
+
+def cached_user(entry):
+    """
+    A User holding only the cached fields. The others are deferred: reading one
+    loads it, and save() writes back nothing but the cached fields.
+    """
+    User = get_user_model()
+    # from_db() takes the loaded values in the model's field order
+    names = [field.attname for field in User._meta.concrete_fields if field.attname in CACHED_USER_FIELDS]
+    return User.from_db(router.db_for_read(User), names, [entry[name] for name in names])
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that reuses the user's CACHED_USER_FIELDS for
+    JWT_USER_CACHE_TTL seconds instead of reading auth_user on every
+    request. The token itself is
+    still decoded and verified on every request, so expiry and any
+    configured blacklisting apply as before. Saving or deleting a user,
+    changing their groups or permissions, and logging out evict the entry.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        entry = user_cache().get(user_cache_key(user_id))
+        if entry is None:
+            user = super().get_user(validated_token)
+            cache_user(user)
+            return user
+
+        # the cached row passed these checks when it was loaded, but the token may be older or newer
+        if api_settings.CHECK_USER_IS_ACTIVE and not entry['is_active']:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN and (
+            validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != entry['password_digest']
+        ):
+            raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+        return cached_user(entry)
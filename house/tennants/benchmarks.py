@@ -0,0 +1,173 @@
+import math
+import platform
+import time
+import tracemalloc
+from contextlib import contextmanager
+import django
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from django.db import connection
+from django.test import Client, override_settings
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+from tennants.synthetic import Scale, SyntheticDataGenerator, SYNTHETIC_USERNAME
+
+SCALES = {
+    'small': Scale(users=1, buildings=2, houses=10, years=1),
+    'medium': Scale(users=2, buildings=10, houses=20, years=2),
+    'large': Scale(users=4, buildings=25, houses=40, years=2),
+}
+
+# (name, url, whether it is a JWT-authenticated API endpoint)
+ENDPOINTS = [
+    ('tenant-list', '/api/tennants/', True),
+    ('house-list', '/api/houses/', True),
+    ('rent-payment-list', '/api/rentpayments/', True),
+    ('dashboard', '/dashboard/', False),
+    ('building-list', '/buildings/', False),
+]
+
+LOCAL_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'sessions': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'sessions'},
+}
+
+
+def percentile(samples, pct):
+    """ Nearest-rank percentile. """
+    ordered = sorted(samples)
+    return ordered[max(math.ceil(pct / 100 * len(ordered)) - 1, 0)]
+
+
+@contextmanager
+def local_cache_fallback(log=None):
+    """ Run on the configured cache when it answers, otherwise (no Redis on a laptop) on local memory. """
+    try:
+        cache.set('benchmark:ping', 1, 5)
+    except Exception as error:
+        if log:
+            log(f'Cache unavailable ({type(error).__name__}); using the local-memory cache')
+        with override_settings(CACHES=LOCAL_CACHES):
+            yield
+        return
+    yield
+
+
+class BenchmarkRunner:
+    """
+    Seeds a dataset and drives each endpoint through the test client as the
+    landlord with the most data. Every endpoint is measured cold (cache
+    cleared before each request), warm (cache kept), and once more under
+    tracemalloc for peak memory so the timings are not slowed by tracing.
+    """
+
+    def __init__(self, runs=20, log=None):
+        self.runs = runs
+        self.log = log or (lambda message: None)
+
+    def seed(self, scale):
+        started = time.perf_counter()
+        counts = SyntheticDataGenerator(scale).run()
+        self.log(f"  seeded {counts['rent_payments']} rent payments in {time.perf_counter() - started:.1f}s")
+        return counts
+
+    def clients(self):
+        user = User.objects.filter(username__startswith=SYNTHETIC_USERNAME).order_by('pk').first()
+        web = Client()
+        web.force_login(user)
+        api = Client(headers={'Authorization': f'Bearer {RefreshToken.for_user(user).access_token}'})
+        return api, web
+
+    def request(self, client, url):
+        started = time.perf_counter()
+        response = client.get(url)
+        elapsed = time.perf_counter() - started
+        if response.status_code != 200:
+            raise RuntimeError(f'{url} answered {response.status_code}')
+        return elapsed, response.request_metrics.queries
+
+    def measure(self, client, url):
+        # the first request pays for imports and template compilation
+        self.request(client, url)
+
+        cold, queries = [], 0
+        for _ in range(self.runs):
+            cache.clear()
+            elapsed, count = self.request(client, url)
+            cold.append(elapsed)
+            queries = max(queries, count)
+
+        warm, warm_queries = [], 0
+        for _ in range(self.runs):
+            elapsed, count = self.request(client, url)
+            warm.append(elapsed)
+            warm_queries = max(warm_queries, count)
+
+        cache.clear()
+        tracemalloc.start()
+        try:
+            self.request(client, url)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        return {
+            'queries': queries,
+            'p50_ms': round(percentile(cold, 50) * 1000, 3),
+            'p95_ms': round(percentile(cold, 95) * 1000, 3),
+            'warm_queries': warm_queries,
+            'warm_p50_ms': round(percentile(warm, 50) * 1000, 3),
+            'warm_p95_ms': round(percentile(warm, 95) * 1000, 3),
+            'peak_memory_kb': round(peak / 1024, 1),
+        }
+
+    def run_scale(self, scale):
+        """ Seed `scale` into the (empty) database and measure every endpoint against it. """
+        counts = self.seed(scale)
+        api, web = self.clients()
+        endpoints = {}
+        for name, url, is_api in ENDPOINTS:
+            endpoints[name] = self.measure(api if is_api else web, url)
+            self.log(f"  {name}: {endpoints[name]['queries']} queries, p50 {endpoints[name]['p50_ms']}ms, "
+                     f"p95 {endpoints[name]['p95_ms']}ms, peak {endpoints[name]['peak_memory_kb']}KB")
+        return {'rows': counts, 'endpoints': endpoints}
+
+
+def environment():
+    return {
+        'created_at': timezone.now().isoformat(),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        'cache': type(caches['default']).__name__,
+    }
+
+
+# how far each metric may grow before it counts as a regression; query counts may not grow at all
+COMPARED_METRICS = {
+    'queries': False,
+    'warm_queries': False,
+    'p95_ms': True,
+    'warm_p95_ms': True,
+    'peak_memory_kb': True,
+}
+
+
+def compare(results, baseline, threshold):
+    """ Regressions of `results` against `baseline`, as readable lines. """
+    regressions = []
+    for scale, measured in results['scales'].items():
+        base_endpoints = baseline.get('scales', {}).get(scale, {}).get('endpoints', {})
+        for endpoint, metrics in measured['endpoints'].items():
+            base = base_endpoints.get(endpoint)
+            if base is None:
+                continue
+            for metric, relative in COMPARED_METRICS.items():
+                if metric not in base or metric not in metrics:
+                    continue
+                limit = base[metric] * (1 + threshold) if relative else base[metric]
+                if metrics[metric] > limit:
+                    regressions.append(
+                        f'{scale} {endpoint} {metric}: {metrics[metric]} (baseline {base[metric]})'
+                    )
+    return regressions
@@ -0,0 +1,135 @@
+import csv
+import io
+import logging
+from collections import Counter
+from django.db import transaction, IntegrityError
+from django.db.models import Exists, OuterRef, Q
+from .caching import bump_cache_version
+from .models import Tenant, House, FlatBuilding, HOUSE_OCCUPIED_MESSAGE
+from .serializers import TenantBulkRowSerializer
+
+logger = logging.getLogger(__name__)
+
+BULK_BATCH_SIZE = 1000
+UNIQUE_FIELDS = ('email', 'phone', 'id_number')
+
+
+def read_csv_rows(upload):
+    """ Turn an uploaded CSV file into row dicts, treating empty cells as missing. """
+    text = io.TextIOWrapper(upload.file, encoding='utf-8-sig')
+    return [
+        {key.strip(): value.strip() for key, value in row.items() if key and value not in (None, '')}
+        for row in csv.DictReader(text)
+    ]
+
+
+def validate_tenant_batch(user, rows):
+    """
+    Validate a batch of tenant rows with a fixed number of queries.
+
+    Returns (valid_rows, errors) where errors maps a row index to a list of messages.
+    """
+    errors = {}
+    valid = {}
+    for index, row in enumerate(rows):
+        serializer = TenantBulkRowSerializer(data=row)
+        if serializer.is_valid():
+            valid[index] = serializer.validated_data
+        else:
+            errors[index] = [
+                f"{field}: {' '.join(str(message) for message in messages)}"
+                for field, messages in serializer.errors.items()
+            ]
+    for data in valid.values():
+        data['id_number'] = data.get('id_number') or None
+
+    # duplicates inside the batch itself
+    for field in UNIQUE_FIELDS:
+        seen = Counter(str(data[field]) for data in valid.values() if data.get(field))
+        for index, data in valid.items():
+            if data.get(field) and seen[str(data[field])] > 1:
+                errors.setdefault(index, []).append(f"{field}: duplicated within the upload")
+
+    # duplicates against existing tenants, one query for all three fields
+    lookup = Q()
+    for field in UNIQUE_FIELDS:
+        values = [data[field] for data in valid.values() if data.get(field)]
+        if values:
+            lookup |= Q(**{f"{field}__in": values})
+    taken = {field: set() for field in UNIQUE_FIELDS}
+    if lookup:
+        for existing in Tenant.objects.filter(lookup).values(*UNIQUE_FIELDS):
+            for field in UNIQUE_FIELDS:
+                if existing[field]:
+                    taken[field].add(str(existing[field]))
+    for index, data in valid.items():
+        for field in UNIQUE_FIELDS:
+            if data.get(field) and str(data[field]) in taken[field]:
+                errors.setdefault(index, []).append(f"{field}: {data[field]} is already in use")
+
+    # house ownership, building and occupancy in one query
+    house_ids = {data['house'] for data in valid.values() if data.get('house')}
+    houses = {}
+    if house_ids:
+        houses = {
+            house['pk']: house
+            for house in House.objects.filter(user=user, pk__in=house_ids).annotate(
+                has_active_tenant=Exists(Tenant.objects.filter(house=OuterRef('pk'), is_active=True))
+            ).values('pk', 'flat_building_id', 'has_active_tenant')
+        }
+    claimed = Counter(data['house'] for data in valid.values() if data.get('house') and data['is_active'])
+    for index, data in valid.items():
+        house_id = data.get('house')
+        if not house_id:
+            continue
+        house = houses.get(house_id)
+        if house is None:
+            errors.setdefault(index, []).append(f"house: House {house_id} does not exist")
+        elif not house['flat_building_id']:
+            errors.setdefault(index, []).append("house: House must be associated with a flat building")
+        elif data['is_active'] and house['has_active_tenant']:
+            errors.setdefault(index, []).append(f"house: House {house_id} is already occupied by another tenant")
+        elif data['is_active'] and claimed[house_id] > 1:
+            errors.setdefault(index, []).append(f"house: House {house_id} is assigned to more than one active tenant in the upload")
+
+    valid_rows = [data for index, data in valid.items() if index not in errors]
+    return valid_rows, errors
+
+
+def import_tenants(user, rows):
+    """
+    Validate and insert a batch of tenants without the per-row save() path.
+
+    Occupation, building counters and cache generations are fixed up once per
+    affected house and building. Returns (created_count, errors).
+    """
+    valid_rows, errors = validate_tenant_batch(user, rows)
+    if errors:
+        return 0, errors
+
+    tenants = []
+    for data in valid_rows:
+        fields = {key: value for key, value in data.items() if key != 'house'}
+        tenants.append(Tenant(user=user, house_id=data.get('house'), **fields))
+
+    occupied_house_ids = {tenant.house_id for tenant in tenants if tenant.house_id and tenant.is_active}
+    try:
+        with transaction.atomic():
+            if Tenant.lock_occupied_houses(occupied_house_ids, Tenant.objects.db):
+                return 0, {None: [HOUSE_OCCUPIED_MESSAGE]}
+            Tenant.objects.bulk_create(tenants, batch_size=BULK_BATCH_SIZE)
+            if occupied_house_ids:
+                House.objects.filter(pk__in=occupied_house_ids).update(occupation=True)
+                FlatBuilding.objects.filter(
+                    pk__in=House.objects.filter(pk__in=occupied_house_ids).values('flat_building_id')
+                ).recompute_counts()
+    except IntegrityError as e:
+        # a concurrent writer took one of the unique values after validation
+        logger.warning(f"Bulk tenant import for user={user} failed: {e}")
+        if Tenant.is_house_occupied_error(e):
+            return 0, {None: [HOUSE_OCCUPIED_MESSAGE]}
+        return 0, {None: [str(e)]}
+
+    bump_cache_version(user.id, 'tenants', 'houses', 'flats')
+    logger.info(f"Bulk imported {len(tenants)} tenants for user={user}")
+    return len(tenants), {}
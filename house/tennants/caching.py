@@ -0,0 +1,167 @@
+import gzip
+import hashlib
+import time
+import logging
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.middleware.gzip import re_accepts_gzip
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+from tennants.routers import pin_to_primary
+
+logger = logging.getLogger(__name__)
+
+CACHE_TTL = getattr(settings, 'CACHE_TTL', 60 * 15)
+# cached bodies are compressed once when stored; 6 is gzip's usual speed/size trade-off
+CACHE_COMPRESSLEVEL = 6
+
+# which cached API resources go stale when a model is written
+RESOURCE_DEPENDENCIES = {
+    # tenant writes also move the building's active tenant counter
+    'Tenant': ('tenants', 'houses', 'flats', 'arrears'),
+    # the arrears report shows each tenant's house number
+    'House': ('houses', 'flats', 'arrears'),
+    'FlatBuilding': ('flats', 'arrears'),
+    'RentPayment': ('rent_payments', 'tenants', 'arrears'),
+}
+
+
+def version_key(user_id, resource):
+    return f"cache_version:{user_id}:{resource}"
+
+
+def get_cache_version(user_id, resource):
+    """ Current generation of a (user, resource) namespace. """
+    key = version_key(user_id, resource)
+    version = cache.get(key)
+    if version is None:
+        # start from the clock so an evicted counter never falls back onto
+        # a generation that still has pages cached under it
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_cache_version(user_id, *resources):
+    """ Invalidate every cached page of the given resources in O(1). """
+    if user_id is None:
+        return
+    # the new pages must not be rendered from a replica that has not seen the write yet
+    pin_to_primary(user_id)
+    for resource in resources:
+        key = version_key(user_id, resource)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, int(time.time() * 1000), timeout=None)
+        logger.debug(f"Bumped cache version for user={user_id} resource={resource}")
+
+
+def invalidate_for_instance(instance):
+    """ Bump the namespaces that depend on a saved or deleted model instance. """
+    resources = RESOURCE_DEPENDENCIES.get(type(instance).__name__, ())
+    bump_cache_version(getattr(instance, 'user_id', None), *resources)
+
+
+def make_cache_key(request, prefix=""):
+    user_id = getattr(request.user, 'id', 'anonymous')
+    version = get_cache_version(user_id, prefix)
+    key = f"{prefix}:{version}:{user_id}:{request.get_full_path()}"
+    return hashlib.md5(key.encode('utf-8')).hexdigest()
+
+
+# responses differ by renderer and by content coding
+VARY_HEADERS = ('Accept', 'Accept-Encoding')
+
+
+def make_etag(cache_key, renderer_format):
+    """
+    Validator for a response: the key already folds in the data version, the
+    renderer format tells JSON from the browsable API. It is weak because the
+    gzipped and identity bodies of a cache entry share it.
+    """
+    return f'W/"{cache_key}-{renderer_format}"'
+
+
+def etag_matches(etag, if_none_match):
+    """ Weak comparison of an ETag against an If-None-Match header, as RFC 9110 asks for GET. """
+    tags = parse_etags(if_none_match)
+    return '*' in tags or etag.removeprefix('W/') in {tag.removeprefix('W/') for tag in tags}
+
+
+def render_cached_response(etag, content_type, body):
+    """ The (etag, content type, gzipped body) entry stored for a rendered 200 response. """
+    return etag, content_type, gzip.compress(body, compresslevel=CACHE_COMPRESSLEVEL)
+
+
+def serve_cached_response(request, entry):
+    """ Answer straight from a cache entry, decompressing only for clients that do not accept gzip. """
+    etag, content_type, body = entry
+    if re_accepts_gzip.search(request.headers.get('Accept-Encoding', '')):
+        response = HttpResponse(body, content_type=content_type)
+        response['Content-Encoding'] = 'gzip'
+    else:
+        response = HttpResponse(gzip.decompress(body), content_type=content_type)
+    response['ETag'] = etag
+    patch_vary_headers(response, VARY_HEADERS)
+    return response
+
+
+def get_cached_count(user_id, resource, queryset):
+    """ COUNT(*) of a resource, kept until a write bumps the resource's namespace. """
+    key = f"count:{resource}:{get_cache_version(user_id, resource)}:{user_id}"
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, CACHE_TTL)
+    return count
+
+
+class VersionedCacheMixin:
+    """
+    Conditional GET and response caching for API views, keyed on the
+    requesting user's version of `cache_prefix`.
+
+    A matching If-None-Match is answered with 304 after a single cache read,
+    before any queryset or serializer work. JSON responses are cached as
+    their final gzipped bytes, so a hit is one more cache read and no
+    rendering. Detail views set `cache_responses = False` and only get the ETag.
+    """
+    cache_prefix = None
+    cache_responses = True
+
+    def get(self, request, *args, **kwargs):
+        key = make_cache_key(request, self.cache_prefix)
+        etag = make_etag(key, request.accepted_renderer.format)
+        if etag_matches(etag, request.headers.get('If-None-Match', '')):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+            patch_vary_headers(response, VARY_HEADERS)
+            return response
+
+        # the browsable API renders per request, only JSON goes through the cache
+        cacheable = self.cache_responses and request.accepted_renderer.format == 'json'
+        cached = cache.get(key) if cacheable else None
+        if cached is not None:
+            logger.debug(f"Serving cached {self.cache_prefix} for user={request.user}")
+            return serve_cached_response(request, cached)
+
+        response = super().get(request, *args, **kwargs)
+        if response.status_code != status.HTTP_200_OK:
+            return response
+        if not cacheable:
+            response['ETag'] = etag
+            patch_vary_headers(response, VARY_HEADERS)
+            return response
+
+        renderer = request.accepted_renderer
+        body = renderer.render(response.data, request.accepted_media_type, self.get_renderer_context())
+        content_type = request.accepted_media_type
+        if renderer.charset:
+            content_type = f'{content_type}; charset={renderer.charset}'
+        entry = render_cached_response(etag, content_type, body)
+        cache.set(key, entry, CACHE_TTL)
+        logger.debug(f"Caching {self.cache_prefix} for user={request.user}")
+        return serve_cached_response(request, entry)
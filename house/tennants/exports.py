@@ -0,0 +1,105 @@
+import csv
+import json
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from phonenumber_field.phonenumber import PhoneNumber
+
+EXPORT_CHUNK_SIZE = 2000
+
+# (column name, queryset lookup); related columns are joined by values() in the same query
+RENT_PAYMENT_COLUMNS = [
+    ('id', 'id'),
+    ('tenant_id', 'tenant_id'),
+    ('tenant', 'tenant__full_name'),
+    ('house', 'tenant__house__house_number'),
+    ('building', 'tenant__house__flat_building__building_name'),
+    ('year', 'year'),
+    ('rent_month', 'rent_month'),
+    ('rent_amount', 'rent_amount'),
+    ('amount_paid', 'amount_paid'),
+    ('is_paid', 'is_paid'),
+    ('payment_method', 'payment_method'),
+    ('payment_date', 'payment_date'),
+]
+
+TENANT_COLUMNS = [
+    ('id', 'id'),
+    ('full_name', 'full_name'),
+    ('email', 'email'),
+    ('phone', 'phone'),
+    ('id_number', 'id_number'),
+    ('house', 'house__house_number'),
+    ('building', 'house__flat_building__building_name'),
+    ('rent', 'house__house_rent_amount'),
+    ('balance', 'balance'),
+    ('is_active', 'is_active'),
+    ('rent_due_date', 'rent_due_date'),
+]
+
+HOUSE_COLUMNS = [
+    ('id', 'id'),
+    ('house_number', 'house_number'),
+    ('building', 'flat_building__building_name'),
+    ('house_size', 'house_size'),
+    ('house_rent_amount', 'house_rent_amount'),
+    ('deposit_amount', 'deposit_amount'),
+    ('occupation', 'occupation'),
+]
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+class ExportJSONEncoder(DjangoJSONEncoder):
+    def default(self, o):
+        if isinstance(o, PhoneNumber):
+            return str(o)
+        return super().default(o)
+
+
+class Echo:
+    """ File-like object whose write() hands the line back to the csv writer's caller. """
+    def write(self, value):
+        return value
+
+
+def iter_rows(queryset, columns, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield the export rows in pk order, one keyset page of `chunk_size` at a time.
+    Unlike iterator(), this holds at most one page in memory on MySQL too, whose
+    driver buffers the whole result set of a query client-side.
+    """
+    lookups = [lookup for _, lookup in columns]
+    queryset = queryset.order_by('pk').values_list('pk', *lookups)
+    last_pk = None
+    while True:
+        page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        rows = list(page[:chunk_size])
+        for row in rows:
+            yield row[1:]
+        if len(rows) < chunk_size:
+            return
+        last_pk = rows[-1][0]
+
+
+def stream_csv(queryset, columns):
+    writer = csv.writer(Echo())
+    yield writer.writerow([name for name, _ in columns])
+    for row in iter_rows(queryset, columns):
+        yield writer.writerow(row)
+
+
+def stream_ndjson(queryset, columns):
+    names = [name for name, _ in columns]
+    for row in iter_rows(queryset, columns):
+        yield json.dumps(dict(zip(names, row)), cls=ExportJSONEncoder) + '\n'
+
+
+def export_response(queryset, columns, filename, export_format):
+    """ Stream a queryset as CSV or NDJSON without building the file in memory. """
+    stream = stream_csv if export_format == 'csv' else stream_ndjson
+    response = StreamingHttpResponse(stream(queryset, columns), content_type=EXPORT_FORMATS[export_format])
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{export_format}"'
+    return response
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from tennants.models import BuildingCollection, FlatBuilding
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the per-building monthly collection rollup from the rent invoices'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, help='Only rebuild buildings owned by this user id')
+        parser.add_argument('--year', type=int, help='Only rebuild this year')
+
+    def handle(self, *args, **options):
+        building_ids = None
+        if options['user']:
+            building_ids = list(FlatBuilding.objects.filter(user_id=options['user']).values_list('pk', flat=True))
+
+        written = BuildingCollection.recompute(building_ids, year=options['year'])
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {written} building-month collection rows.'))
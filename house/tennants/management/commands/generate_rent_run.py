@@ -0,0 +1,36 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from tennants.caching import bump_cache_version
+from tennants.models import RentPayment, Tenant
+
+
+class Command(BaseCommand):
+    help = 'Create the unpaid rent invoices of a month for every active tenant'
+
+    def add_arguments(self, parser):
+        today = timezone.now().date()
+        parser.add_argument('--year', type=int, default=today.year)
+        parser.add_argument('--month', type=int, default=today.month)
+        parser.add_argument('--user', type=int, help='Only bill tenants of this landlord user id')
+
+    def handle(self, *args, **options):
+        year, month = options['year'], options['month']
+        if not 1 <= month <= 12:
+            raise CommandError("Month must be between 1 and 12")
+
+        if options['user']:
+            users = User.objects.filter(pk=options['user'])
+        else:
+            users = User.objects.filter(
+                pk__in=Tenant.objects.filter(is_active=True).values('user_id')
+            )
+
+        total = 0
+        for user in users:
+            created = RentPayment.create_rent_run(user, year, month)
+            if created:
+                bump_cache_version(user.id, 'rent_payments', 'tenants', 'arrears')
+            total += created
+
+        self.stdout.write(self.style.SUCCESS(f'Created {total} rent invoices for {month}/{year}.'))
@@ -1,27 +1,48 @@
-from django.core.management.base import BaseCommand
-from tennants.models import FlatBuilding, House
+import time
+from django.core.management.base import BaseCommand, CommandError
+from tennants.synthetic import Scale, SyntheticDataGenerator, SYNTHETIC_PASSWORD
 
-class Command(BaseCommand):
-    help = 'Populate dummy data for house management project'
 
-    def handle(self, *args, **kwargs):
-        # Create and save Flat Buildings to ensure they have primary keys
-        building1 = FlatBuilding(name="Green View Apartments", address="123 Green Street", number_of_houses=5)
-        building1.save()  # Save to generate the primary key
+class Command(BaseCommand):
+    help = (
+        'Bulk-load a synthetic dataset of any size. For example '
+        '--users 20 --buildings 50 --houses 40 --years 2 loads about 860k rent payments.'
+    )
 
-        building2 = FlatBuilding(name="Blue Sky Towers", address="456 Blue Avenue", number_of_houses=3)
-        building2.save()  # Save to generate the primary key
+    def add_arguments(self, parser):
+        defaults = Scale()
+        parser.add_argument('--users', type=int, default=defaults.users, help='Landlord accounts')
+        parser.add_argument('--buildings', type=int, default=defaults.buildings, help='Buildings per landlord')
+        parser.add_argument('--houses', type=int, default=defaults.houses, help='Houses per building')
+        parser.add_argument('--tenants', type=int, default=None,
+                            help='Total tenants; beyond the occupied houses they are former, inactive tenants')
+        parser.add_argument('--occupancy', type=float, default=defaults.occupancy, help='Share of houses let')
+        parser.add_argument('--years', type=int, default=defaults.years, help='Years of monthly invoices')
+        parser.add_argument('--paid-rate', type=float, default=defaults.paid_rate,
+                            help='Share of invoices paid in full')
+        parser.add_argument('--seed', type=int, default=defaults.seed)
+        parser.add_argument('--batch-size', type=int, default=defaults.batch_size)
 
-        # Add Houses to Green View Apartments
-        House.objects.create(flat_building=building1, house_num="A1", house_size="2 bedroom", house_rent_amount=1500.00, occupation=True)
-        House.objects.create(flat_building=building1, house_num="A2", house_size="1 bedroom", house_rent_amount=1200.00, occupation=False)
-        House.objects.create(flat_building=building1, house_num="A3", house_size="1 bedroom", house_rent_amount=1100.00, occupation=True)
-        House.objects.create(flat_building=building1, house_num="A4", house_size="3 bedroom", house_rent_amount=2500.00, occupation=False)
-        House.objects.create(flat_building=building1, house_num="A5", house_size="2 bedroom", house_rent_amount=1800.00, occupation=True)
+    def handle(self, *args, **options):
+        scale = Scale(
+            users=options['users'], buildings=options['buildings'], houses=options['houses'],
+            tenants=options['tenants'], occupancy=options['occupancy'], years=options['years'],
+            paid_rate=options['paid_rate'], seed=options['seed'], batch_size=options['batch_size'],
+        )
+        if not 0 <= scale.occupancy <= 1 or not 0 <= scale.paid_rate <= 1:
+            raise CommandError("Occupancy and paid rate must be between 0 and 1")
+        if min(scale.users, scale.buildings, scale.houses, scale.years, scale.batch_size) < 1:
+            raise CommandError("Users, buildings, houses, years and batch size must be positive")
+        if scale.houses > 99999:
+            raise CommandError("House numbers are at most 5 digits")
 
-        # Add Houses to Blue Sky Towers
-        House.objects.create(flat_building=building2, house_num="B1", house_size="1 bedroom", house_rent_amount=1000.00, occupation=False)
-        House.objects.create(flat_building=building2, house_num="B2", house_size="2 bedroom", house_rent_amount=2000.00, occupation=True)
-        House.objects.create(flat_building=building2, house_num="B3", house_size="3 bedroom", house_rent_amount=3000.00, occupation=True)
+        verbose = options['verbosity'] > 1
+        self.stdout.write(f'Generating about {scale.payment_count} rent payments...')
+        started = time.perf_counter()
+        counts = SyntheticDataGenerator(scale, log=self.stdout.write if verbose else None).run()
 
-        self.stdout.write(self.style.SUCCESS('Dummy data populated successfully!'))
+        summary = ', '.join(f"{count} {name.replace('_', ' ')}" for name, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {summary} in {time.perf_counter() - started:.1f}s. '
+            f'Landlords log in with password "{SYNTHETIC_PASSWORD}".'
+        ))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from tennants.caching import bump_cache_version
+from tennants.models import TenantArrears
+
+
+class Command(BaseCommand):
+    help = 'Recompute the arrears aging table from the unpaid rent invoices; run nightly so ages move with the calendar'
+
+    def handle(self, *args, **options):
+        written = TenantArrears.refresh()
+
+        for user_id in TenantArrears.objects.order_by().values_list('user_id', flat=True).distinct():
+            bump_cache_version(user_id, 'arrears')
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt arrears for {written} tenants.'))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+from tennants.caching import bump_cache_version
+from tennants.models import Tenant
+
+
+class Command(BaseCommand):
+    help = 'Recompute every tenant balance from the tenant ledger'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, help='Only reconcile tenants of this landlord user id')
+
+    def handle(self, *args, **options):
+        tenants = Tenant.objects.all()
+        if options['user']:
+            tenants = tenants.filter(user_id=options['user'])
+
+        drifted = dict(tenants.drifted_balances().order_by().values('user_id').annotate(
+            tenants=Count('pk')).values_list('user_id', 'tenants'))
+
+        tenants.reconcile_balances()
+
+        for user_id in drifted:
+            bump_cache_version(user_id, 'tenants')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Reconciled tenant balances ({sum(drifted.values())} had drifted).'))
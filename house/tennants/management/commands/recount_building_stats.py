@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from tennants.caching import bump_cache_version
+from tennants.models import FlatBuilding
+
+
+class Command(BaseCommand):
+    help = 'Recompute the occupied house and active tenant counters of every flat building'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, help='Only repair buildings owned by this user id')
+
+    def handle(self, *args, **options):
+        buildings = FlatBuilding.objects.all()
+        if options['user']:
+            buildings = buildings.filter(user_id=options['user'])
+
+        updated = buildings.recompute_counts()
+
+        for user_id in buildings.order_by().values_list('user_id', flat=True).distinct():
+            bump_cache_version(user_id, 'flats')
+
+        self.stdout.write(self.style.SUCCESS(f'Recounted {updated} buildings.'))
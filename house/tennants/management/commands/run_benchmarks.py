@@ -0,0 +1,70 @@
+import json
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from tennants.benchmarks import SCALES, BenchmarkRunner, compare, environment, local_cache_fallback
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed synthetic datasets into a throwaway test database and measure query count, '
+        'p50/p95 wall time and peak memory of the hot API and HTML endpoints'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scales', nargs='+', choices=list(SCALES), default=['small', 'medium'],
+                            help='Dataset sizes to run, smallest first')
+        parser.add_argument('--runs', type=int, default=20, help='Timed requests per endpoint and cache state')
+        parser.add_argument('--output', default='benchmark-results.json', help='Where to write the results')
+        parser.add_argument('--baseline', help='Results file to compare against')
+        parser.add_argument('--threshold', type=float, default=0.2,
+                            help='Allowed relative growth of timings and memory before failing (0.2 = 20%%)')
+        parser.add_argument('--update-baseline', action='store_true',
+                            help='Write the results to --baseline instead of comparing')
+
+    def handle(self, *args, **options):
+        if options['runs'] < 1:
+            raise CommandError("Runs must be positive")
+        if options['update_baseline'] and not options['baseline']:
+            raise CommandError("--update-baseline needs --baseline")
+        baseline = None
+        if options['baseline'] and not options['update_baseline']:
+            try:
+                with open(options['baseline']) as handle:
+                    baseline = json.load(handle)
+            except (OSError, ValueError) as error:
+                raise CommandError(f"Cannot read baseline: {error}")
+
+        results = self.run(options)
+
+        path = options['baseline'] if options['update_baseline'] else options['output']
+        with open(path, 'w') as handle:
+            json.dump(results, handle, indent=2, sort_keys=True)
+        self.stdout.write(f'Wrote {path}')
+
+        if baseline is None:
+            return
+        regressions = compare(results, baseline, options['threshold'])
+        if regressions:
+            for line in regressions:
+                self.stderr.write(f'  {line}')
+            raise CommandError(f"{len(regressions)} regressions against {options['baseline']}")
+        self.stdout.write(self.style.SUCCESS(f"No regressions against {options['baseline']}."))
+
+    def run(self, options):
+        runner = BenchmarkRunner(runs=options['runs'], log=self.stdout.write)
+        setup_test_environment()
+        database_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            with local_cache_fallback(log=self.stdout.write):
+                results = {'environment': environment(), 'runs': options['runs'], 'scales': {}}
+                for name in options['scales']:
+                    self.stdout.write(f'{name}:')
+                    call_command('flush', interactive=False, verbosity=0)
+                    results['scales'][name] = runner.run_scale(SCALES[name])
+        finally:
+            connection.creation.destroy_test_db(database_name, verbosity=0)
+            teardown_test_environment()
+        return results
@@ -0,0 +1,43 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from tennants.synthetic import Scale, SyntheticDataGenerator, SYNTHETIC_PASSWORD
+
+# landlord personas driven by locustfile.py
+PERSONAS = {
+    'large_estate': Scale(buildings=20, houses=40, years=2),
+    'small_landlord': Scale(buildings=1, houses=5, years=1),
+}
+
+
+class Command(BaseCommand):
+    help = 'Seed landlord accounts for the Locust load profile and write their credentials for locustfile.py'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--large', type=int, default=2, help='Large-estate landlords')
+        parser.add_argument('--small', type=int, default=20, help='Small landlords')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--output', default='load_users.json', help='Credentials file read by locustfile.py')
+
+    def handle(self, *args, **options):
+        counts = {'large_estate': options['large'], 'small_landlord': options['small']}
+        if min(counts.values()) < 0 or not sum(counts.values()):
+            raise CommandError("Seed at least one landlord")
+
+        accounts = []
+        for persona, users in counts.items():
+            if not users:
+                continue
+            scale = PERSONAS[persona]
+            generator = SyntheticDataGenerator(Scale(
+                users=users, buildings=scale.buildings, houses=scale.houses, years=scale.years,
+                seed=options['seed'],
+            ))
+            generator.run()
+            accounts += [
+                {'username': user.username, 'password': SYNTHETIC_PASSWORD, 'persona': persona}
+                for user in generator.users
+            ]
+
+        with open(options['output'], 'w') as handle:
+            json.dump(accounts, handle, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Seeded {len(accounts)} landlords into {options['output']}."))
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+from tennants.reminders import (
+    REMINDER_BATCH_SIZE, REMINDER_CONCURRENCY, REMINDER_DAYS_AHEAD, ConsoleReminderBackend,
+    get_reminder_backend, send_rent_reminders,
+)
+
+
+class Command(BaseCommand):
+    help = 'Send rent reminders to due and overdue tenants, once per tenant per month'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=REMINDER_BATCH_SIZE)
+        parser.add_argument('--concurrency', type=int, default=REMINDER_CONCURRENCY,
+                            help='Reminders in flight at once')
+        parser.add_argument('--days-ahead', type=int, default=REMINDER_DAYS_AHEAD,
+                            help='Remind tenants whose rent falls due within this many days')
+        parser.add_argument('--backend', help='Dotted path of the reminder backend (default: RENT_REMINDER_BACKEND)')
+        parser.add_argument('--user', type=int, help='Only remind tenants of this landlord user id')
+        parser.add_argument('--dry-run', action='store_true', help='Count the reminders without sending them')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1 or options['concurrency'] < 1:
+            raise CommandError("Batch size and concurrency must be positive")
+
+        try:
+            backend = get_reminder_backend(options['backend'])
+        except ImportError as error:
+            raise CommandError(f"Cannot load reminder backend: {error}")
+        if isinstance(backend, ConsoleReminderBackend) and backend.stream is None:
+            backend.stream = self.stdout
+
+        selected, sent = send_rent_reminders(
+            backend, batch_size=options['batch_size'], concurrency=options['concurrency'],
+            dry_run=options['dry_run'], days_ahead=options['days_ahead'], user_id=options['user'],
+        )
+
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f'{selected} tenants would be reminded.'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Sent {sent} of {selected} rent reminders.'))
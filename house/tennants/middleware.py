@@ -0,0 +1,186 @@
+import contextvars
+import json
+import logging
+import time
+from contextlib import ExitStack, contextmanager
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+
+logger = logging.getLogger('tennants.metrics')
+
+SLOWEST_SQL_LENGTH = 500
+
+_current_metrics = contextvars.ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    """
+    SQL and cache activity of one request. Installed as a connection execute_wrapper.
+    The text of every statement is only kept with `keep_statements`; otherwise
+    `statements` is None and queries are just counted.
+    """
+
+    def __init__(self, keep_statements=False):
+        self.queries = 0
+        self.db_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_sql = ''
+        self.statements = [] if keep_statements else None
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_sets = 0
+        self.in_cache_call = False
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.queries += 1
+            self.db_time += duration
+            if self.statements is not None:
+                self.statements.append(sql)
+            if duration >= self.slowest_time:
+                self.slowest_time = duration
+                self.slowest_sql = sql
+
+    def as_dict(self):
+        return {
+            'queries': self.queries,
+            'db_time_ms': round(self.db_time * 1000, 2),
+            'slowest_query_ms': round(self.slowest_time * 1000, 2),
+            'slowest_query': ' '.join(self.slowest_sql.split())[:SLOWEST_SQL_LENGTH],
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'cache_sets': self.cache_sets,
+        }
+
+
+def _record_get(metrics, args, kwargs, result):
+    default = args[1] if len(args) > 1 else kwargs.get('default')
+    if result is default:
+        metrics.cache_misses += 1
+    else:
+        metrics.cache_hits += 1
+
+
+def _record_get_many(metrics, args, kwargs, result):
+    keys = list(args[0] if args else kwargs.get('keys', ()))
+    metrics.cache_hits += len(result)
+    metrics.cache_misses += len(keys) - len(result)
+
+
+def _record_set(metrics, args, kwargs, result):
+    metrics.cache_sets += 1
+
+
+def _record_set_many(metrics, args, kwargs, result):
+    data = args[0] if args else kwargs.get('data', {})
+    metrics.cache_sets += len(data)
+
+
+CACHE_RECORDERS = {
+    'get': _record_get,
+    'get_many': _record_get_many,
+    'set': _record_set,
+    'add': _record_set,
+    'incr': _record_set,
+    'set_many': _record_set_many,
+}
+
+
+def _instrument(method, record):
+    def wrapper(*args, **kwargs):
+        metrics = _current_metrics.get()
+        # calls made by another instrumented method (BaseCache.get_many loops
+        # over get) are passed straight through
+        if metrics is None or metrics.in_cache_call:
+            return method(*args, **kwargs)
+        metrics.in_cache_call = True
+        try:
+            result = method(*args, **kwargs)
+        finally:
+            metrics.in_cache_call = False
+        record(metrics, args, kwargs, result)
+        return result
+    wrapper.__wrapped__ = method
+    return wrapper
+
+
+@contextmanager
+def instrument_caches():
+    """
+    Count hits, misses and sets for the duration of the block. Only the
+    cache instances of the current thread (or async context) are wrapped,
+    and only until the block exits; the backend classes are left alone.
+    """
+    instrumented = []
+    for alias in settings.CACHES:
+        backend = caches[alias]
+        # an enclosing block already counts this instance
+        if 'get' in vars(backend):
+            continue
+        for name, record in CACHE_RECORDERS.items():
+            setattr(backend, name, _instrument(getattr(backend, name), record))
+        instrumented.append(backend)
+    try:
+        yield
+    finally:
+        for backend in instrumented:
+            for name in CACHE_RECORDERS:
+                delattr(backend, name)
+
+
+@contextmanager
+def collect_metrics(keep_statements=True):
+    """ Record the queries and cache calls made inside the block. """
+    metrics = RequestMetrics(keep_statements)
+    token = _current_metrics.set(metrics)
+    try:
+        with ExitStack() as stack:
+            stack.enter_context(instrument_caches())
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(metrics))
+            yield metrics
+    finally:
+        _current_metrics.reset(token)
+
+
+class RequestMetricsMiddleware:
+    """
+    Per-request query and cache budget. Exposed as X-* response headers when
+    REQUEST_METRICS_HEADERS is on (defaults to DEBUG), otherwise written as one
+    JSON log line on the `tennants.metrics` logger. Statement text is only kept
+    with REQUEST_METRICS_KEEP_STATEMENTS.
+
+    Streaming responses are measured before their body is iterated.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        keep_statements = getattr(settings, 'REQUEST_METRICS_KEEP_STATEMENTS', False)
+        with collect_metrics(keep_statements=keep_statements) as metrics:
+            response = self.get_response(request)
+        response.request_metrics = metrics
+
+        summary = metrics.as_dict()
+        if getattr(settings, 'REQUEST_METRICS_HEADERS', settings.DEBUG):
+            response['X-Query-Count'] = summary['queries']
+            response['X-DB-Time-Ms'] = summary['db_time_ms']
+            response['X-Slowest-Query-Ms'] = summary['slowest_query_ms']
+            response['X-Slowest-Query'] = summary['slowest_query'][:200]
+            response['X-Cache-Hits'] = summary['cache_hits']
+            response['X-Cache-Misses'] = summary['cache_misses']
+            response['X-Cache-Sets'] = summary['cache_sets']
+        else:
+            logger.info(json.dumps({
+                'method': request.method,
+                'path': request.path,
+                'status': response.status_code,
+                **summary,
+            }))
+        return response
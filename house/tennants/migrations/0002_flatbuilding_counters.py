@@ -0,0 +1,40 @@
+# Generated by Django 5.1.7 on 2026-10-18 11:50
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counts(apps, schema_editor):
+    FlatBuilding = apps.get_model('tennants', 'FlatBuilding')
+    House = apps.get_model('tennants', 'House')
+    Tenant = apps.get_model('tennants', 'Tenant')
+    occupied = House.objects.filter(flat_building=OuterRef('pk'), occupation=True).order_by().values(
+        'flat_building').annotate(total=Count('pk')).values('total')
+    active_tenants = Tenant.objects.filter(house__flat_building=OuterRef('pk'), is_active=True).order_by().values(
+        'house__flat_building').annotate(total=Count('pk')).values('total')
+    FlatBuilding.objects.update(
+        occupied_count=Coalesce(Subquery(occupied), 0),
+        active_tenant_count=Coalesce(Subquery(active_tenants), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tennants', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='flatbuilding',
+            name='active_tenant_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='flatbuilding',
+            name='occupied_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counts, migrations.RunPython.noop),
+    ]
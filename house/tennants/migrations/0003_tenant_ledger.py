@@ -0,0 +1,57 @@
+# Generated by Django 5.1.7 on 2026-10-18 11:59
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def backfill_ledger(apps, schema_editor):
+    """ Open the ledger with one charge and one payment per existing invoice. """
+    RentPayment = apps.get_model('tennants', 'RentPayment')
+    Tenant = apps.get_model('tennants', 'Tenant')
+    TenantLedgerEntry = apps.get_model('tennants', 'TenantLedgerEntry')
+    entries = []
+    invoices = RentPayment.objects.values_list('pk', 'user_id', 'tenant_id', 'rent_amount', 'amount_paid')
+    for invoice_id, user_id, tenant_id, rent, paid in invoices.iterator(chunk_size=2000):
+        common = dict(user_id=user_id, tenant_id=tenant_id, rent_payment_id=invoice_id)
+        if rent:
+            entries.append(TenantLedgerEntry(entry_type='charge', amount=rent, **common))
+        if min(paid, rent):
+            entries.append(TenantLedgerEntry(entry_type='payment', amount=-min(paid, rent), **common))
+        if len(entries) >= 2000:
+            TenantLedgerEntry.objects.bulk_create(entries)
+            entries = []
+    TenantLedgerEntry.objects.bulk_create(entries)
+
+    total = TenantLedgerEntry.objects.filter(tenant=OuterRef('pk')).order_by().values('tenant').annotate(
+        total=Sum('amount')).values('total')
+    Tenant.objects.update(balance=Coalesce(Subquery(total), 0, output_field=models.DecimalField()))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tennants', '0002_flatbuilding_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TenantLedgerEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entry_type', models.CharField(choices=[('charge', 'Charge'), ('payment', 'Payment'), ('reversal', 'Reversal')], max_length=10)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('rent_payment', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='ledger_entries', to='tennants.rentpayment')),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ledger_entries', to='tennants.tenant')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'tenant ledger entries',
+            },
+        ),
+        migrations.RunPython(backfill_ledger, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.1.7 on 2026-10-18 12:18
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def check_active_tenants(apps, schema_editor):
+    """
+    Refuse to add the constraint while a house has several active tenants.
+    Which of them still lives there is a decision for the landlord, so the
+    conflicts are listed for an operator to resolve rather than guessed.
+    """
+    Tenant = apps.get_model('tennants', 'Tenant')
+    crowded = Tenant.objects.filter(is_active=True, house__isnull=False).order_by().values('house').annotate(
+        total=Count('pk')).filter(total__gt=1).values('house')
+    conflicts = Tenant.objects.filter(is_active=True, house__in=crowded).order_by('house_id', 'pk').values_list(
+        'house_id', 'pk', 'full_name')
+    lines = [f"  house {house_id}: tenant {pk} ({full_name})" for house_id, pk, full_name in conflicts]
+    if lines:
+        raise RuntimeError(
+            "These houses have more than one active tenant. Deactivate all but one tenant of each house "
+            "(run recount_building_stats if you edit the rows directly) and migrate again:\n" + "\n".join(lines)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tennants', '0003_tenant_ledger'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(check_active_tenants, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='tenant',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_active', True)), fields=('house',), name='one_active_tenant_per_house', violation_error_message='This house is already occupied by another tenant.'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.1.7 on 2026-10-18 12:35
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tennants', '0004_one_active_tenant_per_house'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RentReminder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cycle', models.DateField()),
+                ('kind', models.CharField(choices=[('due', 'Rent due'), ('overdue', 'Rent overdue')], max_length=10)),
+                ('amount_due', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('backend', models.CharField(max_length=100)),
+                ('sent_at', models.DateTimeField(auto_now_add=True)),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rent_reminders', to='tennants.tenant')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('tenant', 'cycle'), name='one_reminder_per_tenant_cycle')],
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.7 on 2026-10-18 12:41
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tennants', '0005_rent_reminders'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TenantArrears',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('current', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('days_1_30', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('days_31_60', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('days_61_90', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('days_over_90', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('oldest_unpaid', models.DateField(blank=True, null=True)),
+                ('as_of', models.DateField()),
+                ('flat_building', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='tenant_arrears', to='tennants.flatbuilding')),
+                ('tenant', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='arrears', to='tennants.tenant')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'tenant arrears',
+                'indexes': [models.Index(fields=['user', '-total'], name='arrears_user_total_idx'), models.Index(fields=['flat_building', '-total'], name='arrears_building_total_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.1.7 on 2026-10-18 12:47
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tennants', '0006_tenant_arrears'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BuildingCollection',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.IntegerField()),
+                ('month', models.IntegerField(choices=[(1, 'January'), (2, 'February'), (3, 'March'), (4, 'April'), (5, 'May'), (6, 'June'), (7, 'July'), (8, 'August'), (9, 'September'), (10, 'October'), (11, 'November'), (12, 'December')])),
+                ('expected_rent', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('collected', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('paid_invoices', models.IntegerField(default=0)),
+                ('unpaid_invoices', models.IntegerField(default=0)),
+                ('flat_building', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='collections', to='tennants.flatbuilding')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'year', 'month'], name='collection_user_period_idx')],
+                'constraints': [models.UniqueConstraint(fields=('flat_building', 'year', 'month'), name='one_collection_per_building_month')],
+            },
+        ),
+    ]
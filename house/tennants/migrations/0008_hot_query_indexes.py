@@ -0,0 +1,41 @@
+# Generated by Django 5.1.7 on 2026-10-18 13:08
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tennants', '0007_building_collections'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='house',
+            name='deposit_amount',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=10),
+        ),
+        migrations.AlterField(
+            model_name='tenant',
+            name='is_active',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AddIndex(
+            model_name='house',
+            index=models.Index(fields=['user', 'occupation', 'id'], name='house_user_occupation_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rentpayment',
+            index=models.Index(fields=['user', 'is_paid', 'id'], name='payment_user_paid_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rentpayment',
+            index=models.Index(fields=['user', '-payment_date'], name='payment_user_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tenant',
+            index=models.Index(fields=['user', 'is_active', 'id'], name='tenant_user_active_idx'),
+        ),
+    ]
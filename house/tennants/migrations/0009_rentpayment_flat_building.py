@@ -0,0 +1,29 @@
+# Generated by Django 5.1.7 on 2026-10-18 14:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def set_invoice_buildings(apps, schema_editor):
+    """ Existing invoices were issued for the building their tenant lives in now; the rollup rows agree. """
+    RentPayment = apps.get_model('tennants', 'RentPayment')
+    Tenant = apps.get_model('tennants', 'Tenant')
+    building = Tenant.objects.filter(pk=OuterRef('tenant_id')).values('house__flat_building_id')[:1]
+    RentPayment.objects.update(flat_building_id=Subquery(building))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tennants', '0008_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rentpayment',
+            name='flat_building',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='invoices', to='tennants.flatbuilding'),
+        ),
+        migrations.RunPython(set_invoice_buildings, migrations.RunPython.noop),
+    ]
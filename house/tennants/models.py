@@ -1,23 +1,104 @@
-from django.db import models, transaction
+from django.db import models, transaction, IntegrityError, connections, router
 from django.contrib.auth.models import User
-from datetime import datetime
+from datetime import date, datetime
 from django.utils import timezone
 from phonenumber_field.modelfields import PhoneNumberField
 from phonenumbers import parse, format_number, PhoneNumberFormat, NumberParseException
 from django.core.exceptions import ValidationError
 import logging
 from django.core.cache import cache
-from django.db.models import Sum
+from django.db.models import Sum, F, Q, Count, Exists, OuterRef, Subquery, Min, ExpressionWrapper
+from django.db.models.functions import Coalesce
 
 logger = logging.getLogger(__name__)
 
 
+class TrackedFieldsMixin:
+    """
+    Remembers the column values an instance was loaded or last saved with, so
+    save() and the signal receivers can skip work for fields that did not change.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.snapshot_fields(field_names)
+        return instance
+
+    def snapshot_fields(self, names=None):
+        """ Record the current values of `names`, or start over from every loaded column. """
+        if names is None:
+            deferred = self.get_deferred_fields()
+            self._loaded_values = {}
+            attnames = [field.attname for field in self._meta.concrete_fields if field.attname not in deferred]
+        else:
+            self._loaded_values = getattr(self, '_loaded_values', {})
+            attnames = [self._meta.get_field(name).attname for name in names]
+        self._loaded_values.update({attname: getattr(self, attname) for attname in attnames})
+
+    def changed_fields(self, update_fields=None):
+        """ attnames that differ from the snapshot (all of them for an unsaved instance),
+        limited to `update_fields` when the save was restricted. """
+        loaded = getattr(self, '_loaded_values', None)
+        fields = self._meta.concrete_fields
+        if update_fields is not None:
+            fields = [self._meta.get_field(name) for name in update_fields]
+        if loaded is None:
+            return {field.attname for field in fields}
+        return {
+            field.attname for field in fields
+            if (field.attname in loaded and getattr(self, field.attname) != loaded[field.attname])
+            or (field.attname not in loaded and field.attname in self.__dict__)
+        }
+
+    def has_changed(self, *attnames, update_fields=None):
+        return bool(self.changed_fields(update_fields) & set(attnames))
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.snapshot_fields(kwargs.get('update_fields'))
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        if fields is not None:
+            fields = [name for name in fields if self._meta.get_field(name).concrete]
+        self.snapshot_fields(fields)
+
+
+
+class FlatBuildingQuerySet(models.QuerySet):
+
+    def with_stats(self):
+        """ Annotate occupied, vacant and active tenant counts in the same SQL statement. """
+        return self.annotate(
+            occupied_total=Count('houses', filter=Q(houses__occupation=True), distinct=True),
+            active_tenant_total=Count('houses__tenants', filter=Q(houses__tenants__is_active=True), distinct=True),
+        ).annotate(vacant_total=F('number_of_houses') - F('occupied_total'))
+
+    def recompute_counts(self):
+        """ Recalculate the denormalized counters of every building in the queryset with one UPDATE. """
+        occupied = House.objects.filter(flat_building=OuterRef('pk'), occupation=True).order_by().values(
+            'flat_building').annotate(total=Count('pk')).values('total')
+        active_tenants = Tenant.objects.filter(house__flat_building=OuterRef('pk'), is_active=True).order_by().values(
+            'house__flat_building').annotate(total=Count('pk')).values('total')
+        return self.update(
+            occupied_count=Coalesce(Subquery(occupied), 0),
+            active_tenant_count=Coalesce(Subquery(active_tenants), 0),
+        )
+
+
+class FlatBuilding(TrackedFieldsMixin, models.Model):
+    COUNTER_FIELDS = ('occupied_count', 'active_tenant_count')
 
-class FlatBuilding(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, blank=True, null=True)
     building_name = models.CharField(max_length=50, blank=False, null=False)
     address = models.CharField(max_length=50)
     number_of_houses = models.IntegerField(default=0, db_index=True)
+    # denormalized counters, moved with F() updates by House and Tenant writes
+    occupied_count = models.IntegerField(default=0, editable=False)
+    active_tenant_count = models.IntegerField(default=0, editable=False)
+
+    objects = FlatBuildingQuerySet.as_manager()
 
     @property
     def how_many_occupied(self):
@@ -29,7 +110,9 @@ class FlatBuilding(models.Model):
         return self.get_vacant_count()
 
     def tenant_count(self):
-        return self.houses.filter(tenants__is_active=True).distinct().count()
+        # prefer the with_stats() annotation when the queryset provided one
+        annotated = getattr(self, 'active_tenant_total', None)
+        return self.active_tenant_count if annotated is None else annotated
 
     
     def clean(self):
@@ -48,28 +131,33 @@ class FlatBuilding(models.Model):
 
 
     def get_occupied_count(self):
-            """ Retrieve occupied houses from cache or database. """
-            occupied = cache.get(f"flat_{self.pk}_occupied")
-
-            if occupied is None:
-                occupied = self.houses.filter(occupation=True).count()
-                cache.set(f"flat_{self.pk}_occupied", occupied, timeout=60*15)
-
-            return occupied
+        annotated = getattr(self, 'occupied_total', None)
+        return self.occupied_count if annotated is None else annotated
 
     def get_vacant_count(self):
-        vacant = cache.get(f"flat_{self.pk}_vacant")
-
-        if vacant is None:
-            vacant = self.number_of_houses - self.get_occupied_count()
-            cache.set(f"flat_{self.pk}_vacant", vacant, timeout=60*15)
-
-        return vacant
+        annotated = getattr(self, 'vacant_total', None)
+        return self.number_of_houses - self.occupied_count if annotated is None else annotated
+
+    @classmethod
+    def adjust_counts(cls, building_id, occupied=0, active_tenants=0):
+        """ Atomically move the counters of one building by the given deltas. """
+        updates = {}
+        if occupied:
+            updates['occupied_count'] = F('occupied_count') + occupied
+        if active_tenants:
+            updates['active_tenant_count'] = F('active_tenant_count') + active_tenants
+        if building_id and updates:
+            cls.objects.filter(pk=building_id).update(**updates)
 
     def save(self, *args, **kwargs):
         self.full_clean()
-   
-        super().save()
+        # never write the counters back from a possibly stale instance
+        if not self._state.adding and 'update_fields' not in kwargs:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
 
 
     def __str__(self):
@@ -78,7 +166,29 @@ class FlatBuilding(models.Model):
 
 
 
-class Tenant(models.Model):
+class TenantQuerySet(models.QuerySet):
+
+    @staticmethod
+    def ledger_total():
+        """ The sum of the outer tenant's ledger entries, 0 without any. """
+        total = TenantLedgerEntry.objects.filter(tenant=OuterRef('pk')).order_by().values('tenant').annotate(
+            total=Sum('amount')).values('total')
+        return Coalesce(Subquery(total), 0, output_field=models.DecimalField())
+
+    def drifted_balances(self):
+        """ Tenants whose stored balance no longer matches their ledger. """
+        return self.annotate(ledger_total=self.ledger_total()).exclude(balance=F('ledger_total'))
+
+    def reconcile_balances(self):
+        """ Set every balance in the queryset to the sum of its ledger with one UPDATE. """
+        return self.update(balance=self.ledger_total())
+
+
+ACTIVE_TENANT_CONSTRAINT = 'one_active_tenant_per_house'
+HOUSE_OCCUPIED_MESSAGE = "This house is already occupied by another tenant."
+
+
+class Tenant(TrackedFieldsMixin, models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE,blank=True, null=True, db_index=True)
     full_name = models.CharField(max_length=50, blank=False, null=False, db_index=True)
     email = models.EmailField(unique=True, db_index=True)
@@ -87,9 +197,48 @@ class Tenant(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     rent_due_date = models.DateField(default=datetime.now)
     house = models.ForeignKey('House', on_delete=models.CASCADE, related_name='tenants', blank=True, null=True, db_index=True)#house number
-    is_active = models.BooleanField(default=True, db_index=True)
+    is_active = models.BooleanField(default=True)
     balance = models.DecimalField(max_digits=10, decimal_places=2, default=0)
 
+    objects = TenantQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['house'], condition=Q(is_active=True), name=ACTIVE_TENANT_CONSTRAINT,
+                violation_error_message=HOUSE_OCCUPIED_MESSAGE,
+            )
+        ]
+        indexes = [
+            # tenant list and dashboard filter by landlord and activity and page by id
+            models.Index(fields=['user', 'is_active', 'id'], name='tenant_user_active_idx'),
+        ]
+
+    @classmethod
+    def is_house_occupied_error(cls, error):
+        """ Whether an IntegrityError came from the one-active-tenant-per-house constraint. """
+        # PostgreSQL names the constraint, SQLite names the indexed column. MySQL has no partial
+        # indexes, so the constraint does not exist there; lock_occupied_houses() checks instead
+        message = str(error)
+        return ACTIVE_TENANT_CONSTRAINT in message or f"{cls._meta.db_table}.house_id" in message
+
+    @classmethod
+    def lock_occupied_houses(cls, house_ids, using, exclude=None):
+        """
+        On backends without partial indexes (MySQL) the database does not enforce
+        ACTIVE_TENANT_CONSTRAINT: lock the houses' rows and return the ids among them
+        that already have an active tenant. Returns an empty set everywhere else.
+        Must run inside the transaction that writes the tenants.
+        """
+        if connections[using].features.supports_partial_indexes or not house_ids:
+            return set()
+        # the house row lock serialises concurrent claims on the same house
+        list(House.objects.using(using).select_for_update().filter(pk__in=house_ids).values_list('pk', flat=True))
+        active = cls.objects.using(using).filter(house_id__in=house_ids, is_active=True)
+        if exclude is not None:
+            active = active.exclude(pk=exclude)
+        return set(active.values_list('house_id', flat=True))
+
     @property
     def building_name(self):
         if self.house and self.house.flat_building:
@@ -117,35 +266,77 @@ class Tenant(models.Model):
         return 0
 
     def clean(self):
-        if self.house and self.house.tenants.exclude(pk=self.pk).filter(is_active=True).exists():
-            raise ValidationError(f"House {self.house} is already occupied by another tenant.")
-    
+        # one active tenant per house is enforced by the one_active_tenant_per_house constraint,
+        # or by the locked check in save() where the backend has no partial indexes
         if self.balance < 0:
             raise ValidationError("Balance cannot be negative")
         if not self.full_name:
             raise ValidationError("Tenant full name is required")
         if not self.phone:
             raise ValidationError("Phone number is required")
-        if self.id_number and Tenant.objects.exclude(pk=self.pk).filter(id_number=self.id_number).exists():
-            raise ValidationError(f"ID number {self.id_number} is already in use")
-        if self.house and not self.house.flat_building:
-            raise ValidationError("House must be associated with a flat building")
-        
+        # id_number uniqueness is covered by validate_unique(); a house always has a building
 
     def update_balance(self):
-        total_due = self.rent_payments.filter(is_paid=False).aggregate(
-        total = Sum(models.F('rent_amount') - models.F('amount_paid'))
-        )['total'] or 0
+        """ Reconcile the stored balance with the sum of this tenant's ledger. """
+        total_due = self.ledger_entries.aggregate(total=Sum('amount'))['total'] or 0
+        # write the column directly so neither full_clean() nor the save signals run
+        Tenant.objects.filter(pk=self.pk).update(balance=total_due)
         self.balance = total_due
-        # update only the balance field to avoid overwriting other changes
-        self.save(update_fields=['balance'])
         return self.balance
 
 
+    def counted_house_id(self):
+        """ The house whose building currently counts this tenant as active, as stored in the database. """
+        loaded = getattr(self, '_loaded_values', None)
+        if loaded is None:
+            return None
+        house_id = loaded.get('house_id', self.house_id)
+        is_active = loaded.get('is_active', self.is_active)
+        return house_id if is_active else None
+
+    def adjust_building_tenant_count(self, house_id, delta):
+        if house_id is None:
+            return
+        if house_id == self.house_id and Tenant.house.is_cached(self):
+            building_id = self.house.flat_building_id
+            if House.flat_building.is_cached(self.house):
+                self.house.flat_building.active_tenant_count += delta
+        else:
+            building_id = Subquery(House.objects.filter(pk=house_id).values('flat_building_id')[:1])
+        FlatBuilding.adjust_counts(building_id, active_tenants=delta)
+
     def save(self, *args, **kwargs):
-        self.full_clean()
-        logger.info(f"Saving tenant: {self.full_name}, Phone: {self.phone}, House: {self.house}, Active: {self.is_active}")
-        super().save(*args, **kwargs)
+        # the database checks the active tenant constraint and the foreign keys as part of the write,
+        # and unique columns that still hold their loaded value need no lookup
+        changed = self.changed_fields()
+        unchanged_unique = [name for name in ('email', 'phone', 'id_number') if name not in changed]
+        self.full_clean(exclude=['user', 'house', *unchanged_unique], validate_constraints=False)
+        logger.info(f"Saving tenant: {self.full_name}, Phone: {self.phone}, House: {self.house_id}, Active: {self.is_active}")
+        previous = self.counted_house_id()
+        # the balance is only moved by ledger postings; never write it back from a stale instance
+        if not self._state.adding and 'update_fields' not in kwargs:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'balance'
+            ]
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        claims_house = self.is_active and self.house_id and self.has_changed(
+            'house_id', 'is_active', update_fields=kwargs.get('update_fields'))
+        try:
+            with transaction.atomic(using=using):
+                if claims_house and self.lock_occupied_houses([self.house_id], using, exclude=self.pk):
+                    raise ValidationError(HOUSE_OCCUPIED_MESSAGE)
+                super().save(*args, **kwargs)
+        except IntegrityError as e:
+            if self.is_house_occupied_error(e):
+                raise ValidationError(HOUSE_OCCUPIED_MESSAGE)
+            raise
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or {'house', 'house_id', 'is_active'} & set(update_fields):
+            current = self.house_id if self.is_active else None
+            if previous != current:
+                self.adjust_building_tenant_count(previous, -1)
+                self.adjust_building_tenant_count(current, 1)
    
 
     def __str__(self):
@@ -155,19 +346,23 @@ class Tenant(models.Model):
 
 
 
-class House(models.Model):
+class House(TrackedFieldsMixin, models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, blank=True, null=True,db_index=True)
     flat_building = models.ForeignKey(FlatBuilding,related_name='houses',on_delete=models.CASCADE, db_index=True)
     house_number = models.CharField(max_length=5, db_index=True)
     house_size = models.CharField(max_length=10, default='1 bedroom')
     house_rent_amount = models.DecimalField(max_digits=10, decimal_places=2, default=0, db_index=True)
-    deposit_amount = models.DecimalField(max_digits=10, decimal_places=2, default=0,db_index=True)
+    deposit_amount = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     occupation = models.BooleanField(default=False)
     
     class Meta:
         constraints = [
             models.UniqueConstraint(fields=['flat_building', 'house_number'], name='unique_house_per_building')
         ]
+        indexes = [
+            # dashboard occupancy and the vacant-house pickers
+            models.Index(fields=['user', 'occupation', 'id'], name='house_user_occupation_idx'),
+        ]
 
 
     def delete(self, *args, **kwargs):
@@ -177,53 +372,95 @@ class House(models.Model):
         super().delete(*args, **kwargs)
 
 
+    def adjust_building_occupied_count(self, delta):
+        if House.flat_building.is_cached(self):
+            self.flat_building.occupied_count += delta
+        FlatBuilding.adjust_counts(self.flat_building_id, occupied=delta)
+
+    @classmethod
+    def set_occupation(cls, house_id, occupied, house=None):
+        """
+        Flip a house's occupation without loading it. Only the writer that
+        actually flips the row moves the building counter. `house` is an
+        in-memory copy to keep in step.
+        """
+        flipped = cls.objects.filter(pk=house_id).exclude(occupation=occupied).update(occupation=occupied)
+        delta = (1 if occupied else -1) if flipped else 0
+        if house is not None:
+            house.occupation = occupied
+            house.snapshot_fields(['occupation'])
+            if delta:
+                house.adjust_building_occupied_count(delta)
+        elif delta:
+            building_id = Subquery(cls.objects.filter(pk=house_id).values('flat_building_id')[:1])
+            FlatBuilding.adjust_counts(building_id, occupied=delta)
+        return bool(flipped)
+
     def auto_change_occupation(self):
         new_house = self.tenants.filter(is_active=True).exists()
         if self.occupation != new_house:
-            House.objects.filter(pk=self.pk).update(occupation=new_house)
+            House.set_occupation(self.pk, new_house, house=self)
 
 
     def clean(self):
-
-        with transaction.atomic():
-            existing_house = self.flat_building.houses.exclude(pk=self.pk).count()
-
-            if not self.pk:
-                existing_house += 1
-                if existing_house > self.flat_building.number_of_houses:
-                    raise ValidationError (
-                    f"Cannot add house. {self.flat_building.building_name} "
-                    f"can only have {self.flat_building.number_of_houses} houses "
-                    f"(currently has {existing_house} houses)."
+        if self.house_rent_amount < 0 or self.deposit_amount < 0:
+            raise ValidationError("Rent amount and deposit must be non-negative")
+        if not self.flat_building_id:
+            raise ValidationError("House must be associated with a flat building")
+        if not self.house_number:
+            raise ValidationError("House number is required")
+
+        # the row lock serialises concurrent saves into the same building; save()
+        # keeps its transaction open until the row is written. Errors are raised
+        # after the block so they don't mark an enclosing transaction for rollback.
+        with transaction.atomic(savepoint=False):
+            building = FlatBuilding.objects.select_for_update().only(
+                'building_name', 'number_of_houses').filter(pk=self.flat_building_id).first()
+            if building is not None:
+                others = ~Q(pk=self.pk)
+                stats = building.houses.aggregate(
+                    others=Count('pk', filter=others),
+                    occupied=Count('pk', filter=Q(occupation=True)),
+                    duplicates=Count('pk', filter=others & Q(house_number=self.house_number)),
                 )
-                else:
-                    if existing_house > self.flat_building.number_of_houses:
-                        raise ValidationError (
-                        f"Cannot add house. {self.flat_building.building_name} "
-                        f"can only have {self.flat_building.number_of_houses} houses "
-                        f"(currently has {existing_house} houses)."
-                    )
-            if self.flat_building.houses.filter(occupation=True).count() > self.flat_building.number_of_houses:
-                raise ValidationError(f"Cannot occupy more houses than available in {self.flat_building.building_name}")
-            if self.pk and self.occupation and self.tenants.filter(is_active=True).count() > 1:
-                raise ValidationError(f"House {self.house_number} can only have one active tenant")
-            if self.house_rent_amount < 0 or self.deposit_amount < 0:
-                raise ValidationError("Rent amount and deposit must be non-negative")
-            if not self.flat_building:
-                raise ValidationError("House must be associated with a flat building")
-            if not self.house_number:
-                raise ValidationError("House number is required")
-            if self.flat_building.houses.exclude(pk=self.pk).filter(house_number=self.house_number).exists():
-                raise ValidationError(f"House number {self.house_number} already exists in {self.flat_building.building_name}")
-            if self.flat_building.number_of_houses < self.flat_building.how_many_occupied:
-                raise ValidationError(f"Number of houses in {self.flat_building.building_name} cannot be less than occupied houses")
-            if self.flat_building.number_of_houses < 0:
-                raise ValidationError("Number of houses must be non-negative")    
-            
+
+        if building is None:
+            raise ValidationError("House must be associated with a flat building")
+        if self._state.adding or getattr(self, '_loaded_values', {}).get('flat_building_id', building.pk) != building.pk:
+            existing_house = stats['others'] + 1
+            if existing_house > building.number_of_houses:
+                raise ValidationError (
+                f"Cannot add house. {building.building_name} "
+                f"can only have {building.number_of_houses} houses "
+                f"(currently has {existing_house} houses)."
+            )
+        if stats['occupied'] > building.number_of_houses:
+            raise ValidationError(f"Cannot occupy more houses than available in {building.building_name}")
+        if stats['duplicates']:
+            raise ValidationError(f"House number {self.house_number} already exists in {building.building_name}")
+        if building.number_of_houses < 0:
+            raise ValidationError("Number of houses must be non-negative")
 
     def save(self, *args, **kwargs):
-        self.full_clean()
-        super().save(*args, **kwargs)
+        adding = self._state.adding
+        loaded = getattr(self, '_loaded_values', {})
+        with transaction.atomic():
+            # clean() already loaded the building and checked house_number
+            # uniqueness under its lock; the user FK is left to the database
+            self.full_clean(exclude=['user', 'flat_building'], validate_constraints=False)
+            super().save(*args, **kwargs)
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and not {'flat_building', 'flat_building_id', 'occupation'} & set(update_fields):
+                return
+            previous_building = loaded.get('flat_building_id', self.flat_building_id)
+            previous_occupation = loaded.get('occupation', self.occupation)
+            if adding:
+                if self.occupation:
+                    self.adjust_building_occupied_count(1)
+            elif previous_building != self.flat_building_id:
+                FlatBuilding.objects.filter(pk__in=[previous_building, self.flat_building_id]).recompute_counts()
+            elif previous_occupation != self.occupation:
+                self.adjust_building_occupied_count(1 if self.occupation else -1)
     
 
 
@@ -234,7 +471,7 @@ class House(models.Model):
     #     return f"House {self.house_number}"
 
 
-class RentPayment(models.Model):
+class RentPayment(TrackedFieldsMixin, models.Model):
     MONTH_CHOICES = [
         (1, 'January'),
         (2, 'February'),
@@ -251,6 +488,9 @@ class RentPayment(models.Model):
     ]
     user = models.ForeignKey(User, on_delete=models.CASCADE, blank=True, null=True, db_index=True)
     tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE, related_name='rent_payments', db_index=True)
+    # the building the invoice was issued for; its collection rollup stays there when the tenant moves
+    flat_building = models.ForeignKey(FlatBuilding, on_delete=models.SET_NULL, related_name='invoices',
+                                      blank=True, null=True, editable=False)
     payment_date = models.DateField(auto_now_add=True)
     def current_year():
         return timezone.now().year
@@ -268,7 +508,14 @@ class RentPayment(models.Model):
     rent_amount = models.DecimalField(max_digits=10, decimal_places=2, default=0, editable=False)
 
     class Meta:
+        # also serves a tenant's (unpaid) invoices, which are at most a few dozen rows
         unique_together = ('tenant', 'rent_month', 'year')
+        indexes = [
+            # RentPaymentListView: paid invoices of a landlord in id order
+            models.Index(fields=['user', 'is_paid', 'id'], name='payment_user_paid_idx'),
+            # dashboard recent payments
+            models.Index(fields=['user', '-payment_date'], name='payment_user_date_idx'),
+        ]
 
 
     def fully_paid(self):
@@ -284,6 +531,9 @@ class RentPayment(models.Model):
             raise ValidationError("amount paid cannot be negative")
         if self.rent_month < 1 or self.rent_month > 12:
             raise ValidationError("Rent month must be between 1 and 12")
+        # the tenant was already checked when the invoice was created or last moved
+        if not self._state.adding and not self.has_changed('tenant_id'):
+            return
         if not self.tenant:
             raise ValidationError("Rent payment must be associated with a tenant")
         if not self.tenant.house:
@@ -292,13 +542,101 @@ class RentPayment(models.Model):
 
 
     def save(self, *args, **kwargs):
-        self.full_clean()
+        # unchanged foreign keys and an unchanged (tenant, month, year) need no lookups
+        changed = self.changed_fields()
+        # the building is copied from the tenant's house below, never taken from input
+        exclude = ['flat_building'] if 'user_id' in changed else ['user', 'flat_building']
+        if not {'tenant_id', 'year', 'rent_month'} & changed:
+            exclude += ['tenant', 'year', 'rent_month']
+        self.full_clean(exclude=exclude)
         # auto get rent amount for a specific tenant from their house
         if not self.rent_amount and self.tenant and self.tenant.house:
             self.rent_amount = self.tenant.house.house_rent_amount
-        super().save(*args, **kwargs)
-
-
+        if self._state.adding or 'tenant_id' in changed:
+            # clean() made sure the tenant has a house
+            self.flat_building_id = self.tenant.house.flat_building_id
+        adding = self._state.adding
+        amounts_changed = adding or self.has_changed('rent_amount', 'amount_paid')
+        moved = not adding and self.has_changed('tenant_id', 'year', 'rent_month')
+        if not amounts_changed and 'update_fields' not in kwargs:
+            # leave the amounts (and the ledger) alone rather than rewrite them from a stale copy
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in ('rent_amount', 'amount_paid')
+            ]
+        with transaction.atomic():
+            previous = None
+            if (amounts_changed or moved) and not adding:
+                # lock the invoice so concurrent payment posts see each other's amounts
+                previous = RentPayment.objects.select_for_update().filter(pk=self.pk).values_list(
+                    'rent_amount', 'amount_paid', 'flat_building_id', 'year', 'rent_month').first()
+            super().save(*args, **kwargs)
+            if amounts_changed:
+                self.post_ledger_entries(previous and previous[:2])
+            if amounts_changed or moved:
+                self.post_collection(previous, amounts_changed)
+
+    @staticmethod
+    def outstanding(rent_amount, amount_paid):
+        """ What an invoice adds to the tenant balance; overpayments are not carried as credit. """
+        return max((rent_amount or 0) - (amount_paid or 0), 0)
+
+    def post_collection(self, previous=None, amounts_changed=True):
+        """ Move this invoice's share of the building-month collection rows from `previous` to what was saved. """
+        deltas = BuildingCollection.contribution(self.rent_amount, self.amount_paid)
+        if previous is not None:
+            old_rent, old_paid, old_building_id, old_year, old_month = previous
+            if not amounts_changed:
+                # the amounts were not written; the locked row has the current ones
+                deltas = BuildingCollection.contribution(old_rent, old_paid)
+            removed = BuildingCollection.contribution(old_rent, old_paid, sign=-1)
+            if (old_building_id, old_year, old_month) == (self.flat_building_id, self.year, self.rent_month):
+                deltas = {field: delta + removed[field] for field, delta in deltas.items()}
+            else:
+                BuildingCollection.post(old_building_id, old_year, old_month, removed)
+        BuildingCollection.post(self.flat_building_id, self.year, self.rent_month, deltas)
+
+    def post_ledger_entries(self, previous=None):
+        if previous is None:
+            TenantLedgerEntry.post(self.tenant_id, self.rent_amount, TenantLedgerEntry.CHARGE,
+                                   rent_payment=self, user_id=self.user_id)
+            TenantLedgerEntry.post(self.tenant_id, -min(self.amount_paid, self.rent_amount),
+                                   TenantLedgerEntry.PAYMENT, rent_payment=self, user_id=self.user_id)
+            return
+        delta = self.outstanding(self.rent_amount, self.amount_paid) - self.outstanding(*previous)
+        TenantLedgerEntry.post(self.tenant_id, delta, TenantLedgerEntry.PAYMENT,
+                               rent_payment=self, user_id=self.user_id)
+
+
+
+    @classmethod
+    def create_rent_run(cls, user, year, month, batch_size=1000):
+        """
+        Create the missing unpaid invoices of one month for every active tenant of a landlord.
+
+        Tenants and their house rent are read in one query and the invoices are
+        written with one bulk_create; unique_together makes reruns a no-op.
+        Returns the number of invoices created, which is fewer than were built
+        when a concurrent run inserted some of them first.
+        """
+        already_billed = cls.objects.filter(tenant=OuterRef('pk'), year=year, rent_month=month)
+        tenants = Tenant.objects.filter(user=user, is_active=True, house__isnull=False).exclude(
+            Exists(already_billed)).values_list('pk', 'house__house_rent_amount', 'house__flat_building_id')
+        invoices = []
+        building_ids = set()
+        for tenant_id, rent, building_id in tenants:
+            invoices.append(cls(user=user, tenant_id=tenant_id, flat_building_id=building_id, year=year,
+                                rent_month=month, rent_amount=rent))
+            building_ids.add(building_id)
+        if not invoices:
+            return 0
+        with transaction.atomic():
+            cls.objects.bulk_create(invoices, batch_size=batch_size, ignore_conflicts=True)
+            tenant_ids = [invoice.tenant_id for invoice in invoices]
+            created = TenantLedgerEntry.post_rent_run_charges(user, year, month, tenant_ids)
+            TenantArrears.refresh(tenant_ids)
+            BuildingCollection.recompute(building_ids, year, month)
+        return created
 
     def update_payment_status(self):
         new_status = self.amount_paid >= ( self.rent_amount or 0)
@@ -318,6 +656,315 @@ class RentPayment(models.Model):
 
 
 
+class TenantLedgerEntry(models.Model):
+    """ Append-only record of every movement of a tenant's balance. """
+    CHARGE = 'charge'
+    PAYMENT = 'payment'
+    REVERSAL = 'reversal'
+    ENTRY_TYPES = [
+        (CHARGE, 'Charge'),
+        (PAYMENT, 'Payment'),
+        (REVERSAL, 'Reversal'),
+    ]
+    user = models.ForeignKey(User, on_delete=models.CASCADE, blank=True, null=True, db_index=True)
+    tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE, related_name='ledger_entries')
+    rent_payment = models.ForeignKey(RentPayment, on_delete=models.SET_NULL, related_name='ledger_entries',
+                                     blank=True, null=True)
+    entry_type = models.CharField(max_length=10, choices=ENTRY_TYPES)
+    # positive amounts raise what the tenant owes, negative amounts reduce it
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name_plural = 'tenant ledger entries'
+
+    @classmethod
+    def post(cls, tenant_id, amount, entry_type, rent_payment=None, user_id=None):
+        """ Append one entry and move the tenant balance by the same amount atomically. """
+        if not amount:
+            return None
+        with transaction.atomic():
+            entry = cls.objects.create(tenant_id=tenant_id, amount=amount, entry_type=entry_type,
+                                       rent_payment=rent_payment, user_id=user_id)
+            Tenant.objects.filter(pk=tenant_id).update(balance=F('balance') + amount)
+        return entry
+
+    @classmethod
+    def post_rent_run_charges(cls, user, year, month, tenant_ids, batch_size=1000):
+        """
+        Charge a month of bulk-created invoices with one insert and one balance
+        UPDATE. Returns the number of invoices that were still uncharged, i.e.
+        the ones this run created.
+        """
+        invoices = list(RentPayment.objects.filter(
+            user=user, year=year, rent_month=month, tenant_id__in=tenant_ids, ledger_entries__isnull=True
+        ).values_list('pk', 'tenant_id', 'rent_amount'))
+        entries = [
+            cls(user=user, tenant_id=tenant_id, rent_payment_id=invoice_id, entry_type=cls.CHARGE, amount=rent)
+            for invoice_id, tenant_id, rent in invoices if rent
+        ]
+        cls.objects.bulk_create(entries, batch_size=batch_size)
+        rent = RentPayment.objects.filter(tenant=OuterRef('pk'), year=year, rent_month=month).values('rent_amount')[:1]
+        Tenant.objects.filter(pk__in=[entry.tenant_id for entry in entries]).update(
+            balance=F('balance') + Subquery(rent))
+        return len(invoices)
+
+    def __str__(self):
+        return f"{self.get_entry_type_display()} of {self.amount} for tenant {self.tenant_id}"
+
+
+
+class RentReminder(models.Model):
+    """ One reminder sent to a tenant in a billing cycle; reruns of the dispatcher skip these tenants. """
+    DUE = 'due'
+    OVERDUE = 'overdue'
+    KINDS = [
+        (DUE, 'Rent due'),
+        (OVERDUE, 'Rent overdue'),
+    ]
+    user = models.ForeignKey(User, on_delete=models.CASCADE, blank=True, null=True, db_index=True)
+    tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE, related_name='rent_reminders')
+    # first day of the month the reminder belongs to
+    cycle = models.DateField()
+    kind = models.CharField(max_length=10, choices=KINDS)
+    amount_due = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    backend = models.CharField(max_length=100)
+    sent_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['tenant', 'cycle'], name='one_reminder_per_tenant_cycle')
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} reminder to tenant {self.tenant_id} for {self.cycle:%B %Y}"
+
+
+def month_index(year, month):
+    """ Months since year 0, so (year, rent_month) pairs compare as one integer. """
+    return year * 12 + month - 1
+
+
+class TenantArrearsQuerySet(models.QuerySet):
+
+    def rollup(self, *group_by):
+        """
+        Bucket totals for the whole queryset, or one row per value of `group_by`
+        (e.g. 'flat_building' or 'user') ordered by what is owed.
+        """
+        sums = {
+            name: Sum(name, default=0)
+            for name in TenantArrears.BUCKET_FIELDS + ('total',)
+        }
+        if not group_by:
+            return self.aggregate(tenants=Count('pk'), **sums)
+        return self.order_by().values(*group_by).annotate(tenants=Count('pk'), **sums).order_by('-total')
+
+
+class TenantArrears(models.Model):
+    """
+    What each tenant owes, aged into buckets by how long each unpaid month has
+    been overdue. An invoice is current during its own month and overdue from
+    the first day of the next one.
+
+    Rows are refreshed for one tenant whenever one of its invoices is written,
+    but ages only move with the calendar, so `rebuild_arrears` recomputes the
+    whole table nightly. Tenants who owe nothing have no row.
+    """
+    BUCKETS = [
+        ('current', 'Current', None),
+        ('days_1_30', '1-30 days', 30),
+        ('days_31_60', '31-60 days', 60),
+        ('days_61_90', '61-90 days', 90),
+        ('days_over_90', '90+ days', None),
+    ]
+    BUCKET_FIELDS = tuple(name for name, _, _ in BUCKETS)
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, blank=True, null=True)
+    tenant = models.OneToOneField(Tenant, on_delete=models.CASCADE, related_name='arrears')
+    flat_building = models.ForeignKey(
+        FlatBuilding, on_delete=models.SET_NULL, related_name='tenant_arrears', blank=True, null=True
+    )
+    current = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    days_1_30 = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    days_31_60 = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    days_61_90 = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    days_over_90 = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    total = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    # first day of the oldest unpaid month
+    oldest_unpaid = models.DateField(blank=True, null=True)
+    as_of = models.DateField()
+
+    objects = TenantArrearsQuerySet.as_manager()
+
+    class Meta:
+        verbose_name_plural = 'tenant arrears'
+        indexes = [
+            models.Index(fields=['user', '-total'], name='arrears_user_total_idx'),
+            models.Index(fields=['flat_building', '-total'], name='arrears_building_total_idx'),
+        ]
+
+    @staticmethod
+    def bucket_cutoff(as_of, days):
+        """ The oldest month index whose invoice has been overdue for at most `days` days on `as_of`. """
+        index = month_index(as_of.year, as_of.month)
+        while True:
+            year, month = divmod(index, 12)  # first day of the month the invoice at `index - 1` fell overdue
+            if (as_of - date(year, month + 1, 1)).days + 1 > days:
+                return index
+            index -= 1
+
+    @classmethod
+    def refresh(cls, tenant_ids=None, as_of=None, batch_size=1000):
+        """
+        Recompute the rows of `tenant_ids`, or the whole table, from the unpaid
+        invoices with one grouped query and a bulk insert. Returns the number of rows written.
+        """
+        as_of = as_of or timezone.now().date()
+        current = month_index(as_of.year, as_of.month)
+        cutoffs = [current] + [cls.bucket_cutoff(as_of, days) for _, _, days in cls.BUCKETS if days]
+        windows = [Q(month_index__gte=current)] + [
+            Q(month_index__gte=older, month_index__lt=newer) for newer, older in zip(cutoffs, cutoffs[1:])
+        ] + [Q(month_index__lt=cutoffs[-1])]
+
+        owed = ExpressionWrapper(F('rent_amount') - F('amount_paid'), output_field=models.DecimalField())
+        invoices = RentPayment.objects.filter(amount_paid__lt=F('rent_amount'))
+        existing = cls.objects.all()
+        if tenant_ids is not None:
+            invoices = invoices.filter(tenant_id__in=tenant_ids)
+            existing = existing.filter(tenant_id__in=tenant_ids)
+        rows = invoices.alias(
+            month_index=ExpressionWrapper(F('year') * 12 + F('rent_month') - 1, output_field=models.IntegerField())
+        ).order_by().values('tenant_id').annotate(
+            landlord_id=F('tenant__user_id'),
+            building_id=F('tenant__house__flat_building_id'),
+            total=Sum(owed),
+            oldest=Min('month_index'),
+            **{name: Sum(owed, filter=window, default=0) for name, window in zip(cls.BUCKET_FIELDS, windows)},
+        )
+
+        written = 0
+        with transaction.atomic():
+            existing.delete()
+            batch = []
+            for row in rows.iterator(chunk_size=batch_size):
+                year, month = divmod(row.pop('oldest'), 12)
+                batch.append(cls(
+                    user_id=row.pop('landlord_id'), flat_building_id=row.pop('building_id'),
+                    oldest_unpaid=date(year, month + 1, 1), as_of=as_of, **row
+                ))
+                if len(batch) >= batch_size:
+                    written += len(cls.objects.bulk_create(batch))
+                    batch = []
+            written += len(cls.objects.bulk_create(batch))
+        return written
+
+    def __str__(self):
+        return f"Arrears of {self.total} for tenant {self.tenant_id}"
+
+
+class BuildingCollection(models.Model):
+    """
+    Expected rent against what was collected for one building and month, so
+    collection reports read one row per building-month instead of
+    aggregating every invoice.
+
+    Rows are keyed on the building each invoice was issued for, so a tenant's
+    history stays with the building they lived in. Invoice writes move the row
+    with F() updates; `recompute` rebuilds rows from the invoices (after rent
+    runs, and from `backfill_collections`, which also repairs rows left behind
+    by cascaded deletes).
+    """
+    flat_building = models.ForeignKey(FlatBuilding, on_delete=models.CASCADE, related_name='collections')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, blank=True, null=True)
+    year = models.IntegerField()
+    month = models.IntegerField(choices=RentPayment.MONTH_CHOICES)
+    expected_rent = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    collected = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    paid_invoices = models.IntegerField(default=0)
+    unpaid_invoices = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['flat_building', 'year', 'month'], name='one_collection_per_building_month')
+        ]
+        indexes = [
+            models.Index(fields=['user', 'year', 'month'], name='collection_user_period_idx'),
+        ]
+
+    @property
+    def collection_rate(self):
+        return self.collected / self.expected_rent if self.expected_rent else None
+
+    @staticmethod
+    def contribution(rent_amount, amount_paid, sign=1):
+        """ What one invoice adds to its building-month row, negated with sign=-1. """
+        paid = amount_paid >= rent_amount
+        return {
+            'expected_rent': sign * rent_amount,
+            'collected': sign * amount_paid,
+            'paid_invoices': sign * int(paid),
+            'unpaid_invoices': sign * int(not paid),
+        }
+
+    @classmethod
+    def post(cls, building_id, year, month, deltas):
+        """ Add `deltas` to a building-month row with one UPDATE, creating the row on its first invoice. """
+        if building_id is None or not any(deltas.values()):
+            return
+        rows = cls.objects.filter(flat_building_id=building_id, year=year, month=month)
+        if rows.update(**{field: F(field) + delta for field, delta in deltas.items()}):
+            return
+        user_id = FlatBuilding.objects.filter(pk=building_id).values_list('user_id', flat=True).first()
+        try:
+            with transaction.atomic():
+                cls.objects.create(flat_building_id=building_id, user_id=user_id, year=year, month=month, **deltas)
+        except IntegrityError:
+            # a concurrent writer created it first
+            rows.update(**{field: F(field) + delta for field, delta in deltas.items()})
+
+    @classmethod
+    def recompute(cls, building_ids=None, year=None, month=None, batch_size=1000):
+        """
+        Rebuild the rows of the given buildings and period (everything by
+        default) from the invoices with one grouped query and a bulk insert.
+        Returns the number of rows written.
+        """
+        invoices = RentPayment.objects.filter(flat_building__isnull=False)
+        rows = cls.objects.all()
+        if building_ids is not None:
+            invoices = invoices.filter(flat_building_id__in=building_ids)
+            rows = rows.filter(flat_building_id__in=building_ids)
+        if year is not None:
+            invoices = invoices.filter(year=year)
+            rows = rows.filter(year=year)
+        if month is not None:
+            invoices = invoices.filter(rent_month=month)
+            rows = rows.filter(month=month)
+
+        paid = Q(amount_paid__gte=F('rent_amount'))
+        totals = invoices.order_by().values('flat_building_id', 'year', 'rent_month').annotate(
+            landlord_id=F('flat_building__user_id'),
+            expected=Sum('rent_amount'),
+            amount_collected=Sum('amount_paid'),
+            paid=Count('pk', filter=paid),
+            unpaid=Count('pk', filter=~paid),
+        )
+        with transaction.atomic():
+            rows.delete()
+            return len(cls.objects.bulk_create([
+                cls(
+                    flat_building_id=row['flat_building_id'], user_id=row['landlord_id'],
+                    year=row['year'], month=row['rent_month'], expected_rent=row['expected'],
+                    collected=row['amount_collected'], paid_invoices=row['paid'], unpaid_invoices=row['unpaid'],
+                )
+                for row in totals.iterator(chunk_size=batch_size)
+            ], batch_size=batch_size))
+
+    def __str__(self):
+        return f"{self.flat_building_id} {self.month}/{self.year}: {self.collected} of {self.expected_rent}"
+
+
 class PaymentHistory(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, blank=True, null=True, db_index=True)
     tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE, related_name='payment_history')
@@ -0,0 +1,33 @@
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class KeysetCursorPagination(CursorPagination):
+    """ Keyset pages on the list views' `order_by('id')`: no COUNT, no OFFSET. """
+    ordering = 'id'
+
+
+class OptionalCursorPagination(PageNumberPagination):
+    """
+    Page-number pagination by default; switches to keyset pagination when the
+    request carries `?cursor=` (an empty value asks for the first page).
+    Totals for cursor clients are served separately by `/api/counts/`.
+    """
+    cursor_query_param = 'cursor'
+    cursor_paginator = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.cursor_query_param in request.query_params:
+            self.cursor_paginator = KeysetCursorPagination()
+            self.cursor_paginator.page_size = self.page_size
+            return self.cursor_paginator.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def to_html(self):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.to_html()
+        return super().to_html()
@@ -0,0 +1,208 @@
+import asyncio
+import json
+import logging
+import threading
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+from decimal import Decimal
+from django.conf import settings
+from django.core.mail import send_mail
+from django.db.models import DecimalField, Exists, F, IntegerField, OuterRef, Q, Subquery, Sum, Count
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from tennants.models import RentPayment, RentReminder, Tenant
+
+logger = logging.getLogger(__name__)
+
+REMINDER_BATCH_SIZE = 1000
+REMINDER_CONCURRENCY = 50
+REMINDER_DAYS_AHEAD = 3
+DEFAULT_REMINDER_BACKEND = 'tennants.reminders.ConsoleReminderBackend'
+
+MONEY = DecimalField(max_digits=10, decimal_places=2)
+CENTS = Decimal('0.01')
+
+
+@dataclass
+class Reminder:
+    tenant_id: int
+    user_id: int
+    full_name: str
+    email: str
+    phone: str
+    kind: str
+    amount_due: Decimal
+    overdue_months: int
+    cycle: str
+
+    @property
+    def message(self):
+        if self.kind == RentReminder.OVERDUE:
+            return (f"Dear {self.full_name}, you have {self.overdue_months} unpaid month(s) "
+                    f"totalling {self.amount_due}. Please pay to avoid penalties.")
+        return f"Dear {self.full_name}, your rent of {self.amount_due} is due. Please pay on time."
+
+
+def billing_cycle(today):
+    """ The first day of the month a reminder is sent for. """
+    return today.replace(day=1)
+
+
+def reminder_candidates(today, days_ahead=REMINDER_DAYS_AHEAD, user_id=None):
+    """
+    Active, housed tenants that owe rent and were not reminded this cycle, with
+    what they owe annotated in the same query. A tenant is overdue with any
+    unpaid invoice from an earlier month, and due when their due date falls
+    within `days_ahead` days and this month's invoice is not paid.
+    """
+    cycle = billing_cycle(today)
+    earlier = Q(year__lt=today.year) | Q(year=today.year, rent_month__lt=today.month)
+    # settled invoices are judged by amount, is_paid is not kept in sync on every write path
+    arrears = RentPayment.objects.filter(
+        earlier, tenant=OuterRef('pk'), amount_paid__lt=F('rent_amount')
+    ).order_by().values('tenant')
+    overdue_amount = arrears.annotate(total=Sum(F('rent_amount') - F('amount_paid'), output_field=MONEY)).values('total')
+    overdue_months = arrears.annotate(months=Count('pk')).values('months')
+    paid_this_cycle = RentPayment.objects.filter(
+        tenant=OuterRef('pk'), year=today.year, rent_month=today.month, amount_paid__gte=F('rent_amount')
+    )
+    reminded = RentReminder.objects.filter(tenant=OuterRef('pk'), cycle=cycle)
+
+    tenants = Tenant.objects.filter(is_active=True, house__isnull=False)
+    if user_id:
+        tenants = tenants.filter(user_id=user_id)
+    return tenants.annotate(
+        overdue_amount=Coalesce(Subquery(overdue_amount), 0, output_field=MONEY),
+        overdue_months=Coalesce(Subquery(overdue_months), 0, output_field=IntegerField()),
+        paid_this_cycle=Exists(paid_this_cycle),
+    ).filter(
+        Q(overdue_months__gt=0) | Q(rent_due_date__lte=today + timedelta(days=days_ahead), paid_this_cycle=False)
+    ).exclude(Exists(reminded))
+
+
+def iter_reminder_batches(today, batch_size=REMINDER_BATCH_SIZE, **kwargs):
+    """ Yield lists of Reminder, one keyset-paginated query per batch. """
+    cycle = billing_cycle(today)
+    candidates = reminder_candidates(today, **kwargs).order_by('pk').values_list(
+        'pk', 'user_id', 'full_name', 'email', 'phone', 'overdue_amount', 'overdue_months',
+        'house__house_rent_amount',
+    )
+    last_pk = 0
+    while True:
+        rows = list(candidates.filter(pk__gt=last_pk)[:batch_size])
+        if not rows:
+            return
+        yield [
+            Reminder(
+                tenant_id=pk, user_id=user_id, full_name=full_name, email=email, phone=str(phone),
+                kind=RentReminder.OVERDUE if overdue_months else RentReminder.DUE,
+                amount_due=(overdue_amount if overdue_months else rent).quantize(CENTS),
+                overdue_months=overdue_months, cycle=cycle.isoformat(),
+            )
+            for pk, user_id, full_name, email, phone, overdue_amount, overdue_months, rent in rows
+        ]
+        last_pk = rows[-1][0]
+
+
+class BaseReminderBackend:
+    """ Delivers one reminder. send() is awaited concurrently, so it must not block the event loop. """
+
+    def __init__(self, **options):
+        self.options = options
+
+    @property
+    def name(self):
+        return f'{type(self).__module__}.{type(self).__qualname__}'
+
+    async def send(self, reminder):
+        raise NotImplementedError
+
+
+class ConsoleReminderBackend(BaseReminderBackend):
+    """ Writes each reminder to a stream; for development and dry runs. """
+
+    def __init__(self, stream=None, **options):
+        super().__init__(**options)
+        self.stream = stream
+
+    async def send(self, reminder):
+        if self.stream is not None:
+            self.stream.write(f'[{reminder.kind}] {reminder.phone}: {reminder.message}\n')
+
+
+class FileReminderBackend(BaseReminderBackend):
+    """ Appends each reminder as a JSON line to RENT_REMINDER_FILE_PATH. """
+
+    def __init__(self, path=None, **options):
+        super().__init__(**options)
+        self.path = path or getattr(settings, 'RENT_REMINDER_FILE_PATH', 'rent_reminders.jsonl')
+        # every batch runs in its own event loop, so the writers share a thread lock
+        self.lock = threading.Lock()
+
+    async def send(self, reminder):
+        line = json.dumps({**asdict(reminder), 'message': reminder.message}, default=str) + '\n'
+        await asyncio.to_thread(self._append, line)
+
+    def _append(self, line):
+        with self.lock, open(self.path, 'a') as handle:
+            handle.write(line)
+
+
+class EmailReminderBackend(BaseReminderBackend):
+    """ Emails the reminder; send_mail runs in a worker thread. """
+
+    async def send(self, reminder):
+        await asyncio.to_thread(
+            send_mail, 'Rent reminder', reminder.message, None, [reminder.email], fail_silently=False
+        )
+
+
+def get_reminder_backend(path=None, **options):
+    return import_string(path or getattr(settings, 'RENT_REMINDER_BACKEND', DEFAULT_REMINDER_BACKEND))(**options)
+
+
+async def dispatch(reminders, backend, concurrency=REMINDER_CONCURRENCY):
+    """ Send reminders with at most `concurrency` in flight; return the ones that were delivered. """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def deliver(reminder):
+        async with semaphore:
+            try:
+                await backend.send(reminder)
+            except Exception:
+                logger.exception('Rent reminder to tenant %s failed', reminder.tenant_id)
+                return None
+            return reminder
+
+    results = await asyncio.gather(*(deliver(reminder) for reminder in reminders))
+    return [reminder for reminder in results if reminder is not None]
+
+
+def record_sent(reminders, backend):
+    """ Remember delivered reminders so later runs in the same cycle skip these tenants. """
+    RentReminder.objects.bulk_create(
+        [
+            RentReminder(
+                user_id=reminder.user_id, tenant_id=reminder.tenant_id, cycle=reminder.cycle,
+                kind=reminder.kind, amount_due=reminder.amount_due, backend=backend.name,
+            )
+            for reminder in reminders
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def send_rent_reminders(backend, today=None, batch_size=REMINDER_BATCH_SIZE,
+                        concurrency=REMINDER_CONCURRENCY, dry_run=False, **kwargs):
+    """ Select, send and record reminders batch by batch. Returns (selected, sent). """
+    today = today or timezone.now().date()
+    selected = sent = 0
+    for batch in iter_reminder_batches(today, batch_size=batch_size, **kwargs):
+        selected += len(batch)
+        if dry_run:
+            continue
+        delivered = asyncio.run(dispatch(batch, backend, concurrency))
+        record_sent(delivered, backend)
+        sent += len(delivered)
+    return selected, sent
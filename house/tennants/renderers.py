@@ -0,0 +1,40 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+from phonenumber_field.phonenumber import PhoneNumber
+
+# orjson writes these raw; the stdlib renderer escapes them for embedding in JavaScript
+LINE_SEPARATORS = ((b'\xe2\x80\xa8', b'\\u2028'), (b'\xe2\x80\xa9', b'\\u2029'))
+
+
+class ORJSONEncoder(JSONEncoder):
+    """ DRF's fallbacks for what orjson cannot encode itself, plus PhoneNumber. """
+
+    def default(self, obj):
+        if isinstance(obj, PhoneNumber):
+            return str(obj)
+        return super().default(obj)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer on orjson. Dicts, lists, strings and numbers are encoded
+    natively; Decimal, dates and PhoneNumber go through ORJSONEncoder so
+    values come out exactly as the stdlib renderer writes them. Indented
+    output (`?format=json; indent=4` or the browsable API) is left to the
+    stdlib renderer.
+    """
+    encoder_class = ORJSONEncoder
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=self.encoder_class().default, option=self.options)
+        for raw, escaped in LINE_SEPARATORS:
+            if raw in ret:
+                ret = ret.replace(raw, escaped)
+        return ret
@@ -0,0 +1,92 @@
+import contextvars
+import random
+from contextlib import contextmanager
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.template.response import TemplateResponse
+
+# seconds a landlord keeps reading from the primary after their data changed
+REPLICA_PIN_SECONDS = 5
+
+_routing = contextvars.ContextVar('replica_routing', default=None)
+
+
+class ReplicaRouting:
+    """ Routing state of one read-only view call. """
+
+    def __init__(self):
+        self.wrote = False
+
+
+def replica_aliases():
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+
+def pin_key(user_id):
+    return f"replica_pin:{user_id}"
+
+
+def pin_to_primary(user_id):
+    """ Route the user's reads to the primary until replicas have caught up with a write. """
+    if user_id is None or not replica_aliases():
+        return
+    cache.set(pin_key(user_id), 1, getattr(settings, 'REPLICA_PIN_SECONDS', REPLICA_PIN_SECONDS))
+
+
+def is_pinned(user_id):
+    return user_id is not None and cache.get(pin_key(user_id)) is not None
+
+
+@contextmanager
+def replica_reads(user_id=None):
+    """ Let ReplicaRouter send the block's reads to a replica, unless `user_id` is pinned to the primary. """
+    if not replica_aliases() or is_pinned(user_id):
+        yield
+        return
+    token = _routing.set(ReplicaRouting())
+    try:
+        yield
+    finally:
+        _routing.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Writes, select_for_update() and reads outside `replica_reads()` go to
+    the primary. Reads inside it go to a random DATABASE_REPLICAS alias
+    until the block writes, after which it reads its own writes from the
+    primary as well.
+    """
+
+    def db_for_read(self, model, **hints):
+        routing = _routing.get()
+        if routing is None or routing.wrote:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replica_aliases())
+
+    def db_for_write(self, model, **hints):
+        routing = _routing.get()
+        if routing is not None:
+            routing.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # replicas hold the same rows as the primary
+        databases = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+class ReplicaReadMixin:
+    """ Serve GET (and HEAD) of a view from a replica. Goes before the view class. """
+
+    def get(self, request, *args, **kwargs):
+        user_id = getattr(request.user, 'pk', None)
+        with replica_reads(user_id):
+            response = super().get(request, *args, **kwargs)
+            # HTML views run their template's queries when rendered; DRF responses are serialized already
+            if isinstance(response, TemplateResponse):
+                response.render()
+            return response
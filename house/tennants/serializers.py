@@ -1,13 +1,28 @@
 from rest_framework import serializers
-from .models import Tenant, House, RentPayment, FlatBuilding
+from phonenumber_field.serializerfields import PhoneNumberField
+from .models import Tenant, House, RentPayment, FlatBuilding, TenantArrears
 from django.contrib.auth.models import User
 
 class TenantSerializer(serializers.ModelSerializer):
     user = serializers.HiddenField(default=serializers.CurrentUserDefault())
+    # explicit default so form-encoded creates don't read a missing checkbox as False
+    is_active = serializers.BooleanField(default=True)
 
     class Meta:
         model = Tenant
         fields = '__all__'
+        # moved only by ledger postings
+        read_only_fields = ['balance']
+
+class TenantBulkRowSerializer(serializers.Serializer):
+    """ Field-level validation only; uniqueness and house checks run set-based over the whole batch. """
+    full_name = serializers.CharField(max_length=50)
+    email = serializers.EmailField()
+    phone = PhoneNumberField()
+    id_number = serializers.CharField(max_length=10, required=False, allow_null=True, allow_blank=True)
+    house = serializers.IntegerField(required=False, allow_null=True)
+    rent_due_date = serializers.DateField(required=False)
+    is_active = serializers.BooleanField(default=True)
 
 class HouseSerializer(serializers.ModelSerializer):
     user = serializers.HiddenField(default=serializers.CurrentUserDefault())
@@ -38,6 +53,26 @@ class RentPaymentSerializer(serializers.ModelSerializer):
         model = RentPayment
         fields = '__all__'
 
+class TenantArrearsSerializer(serializers.ModelSerializer):
+    tenant_name = serializers.CharField(source='tenant.full_name', read_only=True)
+    house_number = serializers.CharField(source='tenant.house.house_number', read_only=True, default=None)
+    building_name = serializers.CharField(source='flat_building.building_name', read_only=True, default=None)
+
+    class Meta:
+        model = TenantArrears
+        fields = ['id', 'tenant', 'tenant_name', 'house_number', 'flat_building', 'building_name',
+                  'current', 'days_1_30', 'days_31_60', 'days_61_90', 'days_over_90', 'total',
+                  'oldest_unpaid', 'as_of']
+        read_only_fields = fields
+
+class RentRunSerializer(serializers.Serializer):
+    year = serializers.IntegerField(min_value=2000, max_value=2100)
+    rent_month = serializers.ChoiceField(choices=RentPayment.MONTH_CHOICES)
+
+class CollectionReportSerializer(serializers.Serializer):
+    year = serializers.IntegerField(min_value=2000, max_value=2100)
+    month = serializers.ChoiceField(choices=RentPayment.MONTH_CHOICES, required=False)
+
 class RegisterAdminSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True)
 
@@ -0,0 +1,81 @@
+"""
+Session engine on the cache (SESSION_ENGINE = 'tennants.sessions').
+
+With SESSION_SAVE_EVERY_REQUEST every response saves the session to slide
+its expiry. A session that did not change is not written again here: its
+cache entry only gets a new timeout. With SESSION_DB_FALLBACK on, sessions
+are read and written on the database while the cache is unreachable.
+"""
+import functools
+import logging
+from django.conf import settings
+from django.contrib.sessions.backends.base import CreateError, UpdateError
+from django.contrib.sessions.backends.cache import SessionStore as CacheSessionStore
+from django.contrib.sessions.backends.db import SessionStore as DBSessionStore
+
+logger = logging.getLogger(__name__)
+
+
+def save_to_db(store, must_create=False):
+    try:
+        DBSessionStore.save(store, must_create)
+    except UpdateError:
+        # the session had only been stored in the cache so far
+        DBSessionStore.save(store, must_create=True)
+
+
+def db_fallback(db_method):
+    """ Run `db_method` instead when the cache raises and SESSION_DB_FALLBACK is on. """
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return method(self, *args, **kwargs)
+            except (CreateError, UpdateError):
+                raise
+            except Exception:
+                if not getattr(settings, 'SESSION_DB_FALLBACK', False):
+                    raise
+                logger.warning(f"Session cache unavailable, using the database for {method.__name__}()",
+                               exc_info=True)
+                return db_method(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class SessionStore(CacheSessionStore, DBSessionStore):
+    """ Cache session store that refreshes unchanged sessions with a touch. """
+
+    @db_fallback(DBSessionStore.load)
+    def load(self):
+        # unlike the cache backend, let cache errors through so the fallback can answer
+        session_data = self._cache.get(self.cache_key)
+        if session_data is not None:
+            return session_data
+        self._session_key = None
+        return {}
+
+    @db_fallback(DBSessionStore.exists)
+    def exists(self, session_key):
+        return super().exists(session_key)
+
+    @db_fallback(save_to_db)
+    def save(self, must_create=False):
+        if self.session_key is not None and not must_create and not self.modified:
+            # unchanged: only slide the expiry; a session that expired meanwhile stays expired
+            self._cache.touch(self.cache_key, self.get_expiry_age())
+            return
+        super().save(must_create)
+
+    @db_fallback(DBSessionStore.delete)
+    def delete(self, session_key=None):
+        super().delete(session_key)
+
+    @classmethod
+    def clear_expired(cls):
+        # only sessions written while the cache was down live in the database
+        if getattr(settings, 'SESSION_DB_FALLBACK', False):
+            DBSessionStore.clear_expired.__func__(cls)
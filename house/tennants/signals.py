@@ -7,11 +7,16 @@ from django.core.exceptions import ValidationError
 from rest_framework.authtoken.models import Token
 from django.contrib.auth.models import User
 from django.db.models.signals import pre_save
-from .models import Tenant, FlatBuilding, House
+from .models import Tenant, FlatBuilding, House, TenantLedgerEntry, TenantArrears, BuildingCollection
 from django.db import models
+from django.db.models import Subquery
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.core.cache import cache
+from .caching import invalidate_for_instance
+from .authentication import evict_cached_user
+from django.contrib.auth.signals import user_logged_out
+from django.db.models.signals import m2m_changed
 
 
 
@@ -21,21 +26,52 @@ def create_auth_token(sender, instance=None, created=False, **kwargs):
         Token.objects.create(user=instance)
 
 
+# JWT requests reuse a cached user row; drop it whenever the row or its permissions change
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def evict_jwt_user(sender, instance, **kwargs):
+    evict_cached_user(instance.pk)
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def evict_jwt_user_permissions(sender, instance, reverse, pk_set, **kwargs):
+    if not reverse:
+        evict_cached_user(instance.pk)
+    else:
+        # changed from the group's or permission's side
+        for user_id in pk_set or ():
+            evict_cached_user(user_id)
+
+
+@receiver(user_logged_out)
+def evict_jwt_user_on_logout(sender, request, user, **kwargs):
+    if user is not None:
+        evict_cached_user(user.pk)
+
+
 
+# a house has at most one active tenant (one_active_tenant_per_house), so the
+# house a tenant stops counting for is vacant and the one it starts counting for is occupied
 @receiver(post_delete, sender=Tenant)
 def update_house_occupation(sender, instance, **kwargs):
-    house_id = instance.house_id  # just get the raw ID (safe)
-    if house_id and House.objects.filter(pk=house_id).exists():
-        house = House.objects.get(pk=house_id)
-        house.auto_change_occupation()
+    house_id = instance.counted_house_id()
+    if house_id:
+        House.set_occupation(house_id, False)
 
 
-# whenever a Tenant is created or updated
+# whenever a Tenant is created, moved or (de)activated
 @receiver(post_save, sender=Tenant)
-def update_house_occupation_on_save(sender, instance, **kwargs):
-    
-    if instance.house:
-        instance.house.auto_change_occupation()
+def update_house_occupation_on_save(sender, instance, created=False, update_fields=None, **kwargs):
+    if not created and not instance.has_changed('house_id', 'is_active', update_fields=update_fields):
+        return
+    previous = instance.counted_house_id()
+    current = instance.house_id if instance.is_active else None
+    if previous and previous != current:
+        House.set_occupation(previous, False)
+    if current:
+        cached = instance.house if Tenant.house.is_cached(instance) else None
+        House.set_occupation(current, True, house=cached)
 
 
 @receiver(post_save, sender=RentPayment)
@@ -46,23 +82,86 @@ def set_payment_status_on_save(sender, instance, **kwargs):
     # prevent recursive save signals
     
 
-@receiver(pre_delete, sender=RentPayment)
-def adjust_tenant_balance_on_delete(sender, instance, **kwargs):
-    tenant = instance.tenant
-    if tenant:
-        tenant.balance += instance.amount_paid
+def deleted_directly(origin):
+    # when a tenant (or its house/landlord) is deleted its ledger and arrears go with it
+    return isinstance(origin, RentPayment) or (
+        isinstance(origin, models.QuerySet) and origin.model is RentPayment
+    )
+
+
+@receiver(post_delete, sender=RentPayment)
+def adjust_tenant_balance_on_delete(sender, instance, origin=None, **kwargs):
+    if deleted_directly(origin):
+        TenantLedgerEntry.post(
+            instance.tenant_id,
+            -RentPayment.outstanding(instance.rent_amount, instance.amount_paid),
+            TenantLedgerEntry.REVERSAL,
+            user_id=instance.user_id,
+        )
 
 
 @receiver([post_save, post_delete], sender=Tenant)
-def clear_tenant_cache(sender, instance, **kwargs):
+def clear_tenant_cache(sender, instance, signal=None, update_fields=None, **kwargs):
+    if signal is post_save and not instance.changed_fields(update_fields):
+        return
     cache_key = f"tenant:{instance.id}"
     cache.delete(cache_key)
 
 
 
+@receiver(post_delete, sender=Tenant)
+def release_building_tenant_count(sender, instance, **kwargs):
+    instance.adjust_building_tenant_count(instance.counted_house_id(), -1)
+
+
+@receiver(post_delete, sender=House)
+def recount_building_on_house_delete(sender, instance, **kwargs):
+    # cascaded tenant deletes may already have moved the counters, so recount
+    FlatBuilding.objects.filter(pk=instance.flat_building_id).recompute_counts()
+
+
+# bump the per-user API cache generations so stale list pages stop being served
+@receiver([post_save, post_delete], sender=Tenant)
 @receiver([post_save, post_delete], sender=House)
-def clear_building_cache(sender, instance, **kwargs):
-    if instance.flat_building_id:
-        cache.delete(f"flat_{instance.flat_building_id}_occupied")
-        cache.delete(f"flat_{instance.flat_building_id}_vacant")
-        cache.delete(f"flat_{instance.flat_building_id}_tenant_count")
\ No newline at end of file
+@receiver([post_save, post_delete], sender=FlatBuilding)
+@receiver([post_save, post_delete], sender=RentPayment)
+def bump_api_cache_versions(sender, instance, signal=None, update_fields=None, **kwargs):
+    # a save that wrote the same values leaves every cached page valid
+    if signal is post_save and not instance.changed_fields(update_fields):
+        return
+    invalidate_for_instance(instance)
+
+
+@receiver(post_save, sender=RentPayment)
+def refresh_arrears_on_save(sender, instance, created=False, update_fields=None, **kwargs):
+    changed = instance.changed_fields(update_fields)
+    if not created and not changed & {'tenant_id', 'year', 'rent_month', 'rent_amount', 'amount_paid'}:
+        return
+    tenant_ids = {instance.tenant_id}
+    if 'tenant_id' in changed and not created:
+        # the invoice moved; the old tenant no longer owes it
+        tenant_ids.add(getattr(instance, '_loaded_values', {}).get('tenant_id'))
+    TenantArrears.refresh(tenant_ids - {None})
+
+
+@receiver(post_delete, sender=RentPayment)
+def refresh_arrears_on_delete(sender, instance, origin=None, **kwargs):
+    if deleted_directly(origin):
+        TenantArrears.refresh([instance.tenant_id])
+
+
+@receiver(post_delete, sender=RentPayment)
+def remove_from_building_collection(sender, instance, origin=None, **kwargs):
+    if deleted_directly(origin):
+        BuildingCollection.post(
+            instance.flat_building_id, instance.year, instance.rent_month,
+            BuildingCollection.contribution(instance.rent_amount, instance.amount_paid, sign=-1),
+        )
+
+
+@receiver(post_save, sender=Tenant)
+def move_arrears_with_tenant(sender, instance, created=False, update_fields=None, **kwargs):
+    if created or not instance.has_changed('house_id', update_fields=update_fields):
+        return
+    building = House.objects.filter(pk=instance.house_id).values('flat_building_id')[:1]
+    TenantArrears.objects.filter(tenant=instance).update(flat_building_id=Subquery(building))
@@ -0,0 +1,213 @@
+import random
+from dataclasses import dataclass
+from decimal import Decimal
+from itertools import islice
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connections, transaction
+from django.db.models import Exists, F, OuterRef, Sum
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from tennants.models import (FlatBuilding, House, Tenant, RentPayment, TenantLedgerEntry,
+                             TenantArrears, BuildingCollection, month_index)
+
+SYNTHETIC_USERNAME = 'synthetic'
+SYNTHETIC_EMAIL_DOMAIN = 'synthetic.example'
+SYNTHETIC_PASSWORD = 'synthetic-pass-123'
+HOUSE_SIZES = ['bedsitter', '1 bedroom', '2 bedroom', '3 bedroom']
+PAYMENT_METHODS = [method for method, _ in RentPayment.PAYNENT_METHODS]
+
+
+@dataclass
+class Scale:
+    """ How much data to generate. `buildings` is per user and `houses` per building. """
+    users: int = 1
+    buildings: int = 2
+    houses: int = 10
+    # every tenant beyond the occupied houses is a former, inactive tenant
+    tenants: int = None
+    occupancy: float = 0.9
+    years: int = 1
+    # share of invoices paid in full; the rest are split between partly paid and unpaid
+    paid_rate: float = 0.85
+    seed: int = 42
+    batch_size: int = 5000
+
+    @property
+    def house_count(self):
+        return self.users * self.buildings * self.houses
+
+    @property
+    def payment_count(self):
+        occupied = round(self.house_count * self.occupancy)
+        if self.tenants is not None:
+            occupied = min(occupied, self.tenants)
+        return occupied * self.years * 12
+
+
+def batched(objects, size):
+    iterator = iter(objects)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class SyntheticDataGenerator:
+    """
+    Loads a landlord-shaped dataset of any size with bulk_create: no per-row
+    full_clean(), save() or signals. The denormalized state those would have
+    maintained (house occupation, building counters, ledger balances, arrears
+    and collection rollups) is rebuilt set-based at the end.
+
+    The same seed and scale always produce the same rows. Names, emails and
+    phones are numbered after the synthetic rows already in the database, so
+    runs can be repeated to grow a dataset.
+    """
+
+    def __init__(self, scale, today=None, log=None):
+        self.scale = scale
+        self.rng = random.Random(scale.seed)
+        self.today = today or timezone.now().date()
+        self.log = log or (lambda message: None)
+
+    def run(self):
+        with transaction.atomic():
+            users = self.create_users()
+            buildings = self.create_buildings(users)
+            houses = self.create_houses(buildings)
+            tenants = self.create_tenants(houses)
+            payments = self.create_payments(tenants)
+            self.fix_up(users, buildings)
+        self.users = users
+        return {
+            'users': len(users),
+            'buildings': len(buildings),
+            'houses': len(houses),
+            'tenants': len(tenants),
+            'rent_payments': payments,
+        }
+
+    def bulk_create(self, model, objects, natural_key=None):
+        """
+        Insert `objects` in batches. Backends that cannot return rows from a bulk
+        insert (MySQL) leave the pks unset; when later rows point at these, pass
+        the `natural_key` fields that identify a row so the pks are read back.
+        """
+        reread = (natural_key is not None
+                  and not connections[model.objects.db].features.can_return_rows_from_bulk_insert)
+        created = []
+        for batch in batched(objects, self.scale.batch_size):
+            model.objects.bulk_create(batch)
+            if reread:
+                self.read_back_pks(model, batch, natural_key)
+            created += batch
+        self.log(f'{len(created)} {model._meta.verbose_name_plural}')
+        return created
+
+    def read_back_pks(self, model, batch, natural_key):
+        first = natural_key[0]
+        rows = model.objects.filter(**{f'{first}__in': {getattr(obj, first) for obj in batch}})
+        pks = {tuple(key): pk for pk, *key in rows.values_list('pk', *natural_key)}
+        for obj in batch:
+            obj.pk = pks[tuple(getattr(obj, field) for field in natural_key)]
+
+    def create_users(self):
+        offset = User.objects.filter(username__startswith=SYNTHETIC_USERNAME).count()
+        password = make_password(SYNTHETIC_PASSWORD)
+        users = self.bulk_create(User, (
+            User(username=f'{SYNTHETIC_USERNAME}{offset + i}', password=password,
+                 email=f'landlord{offset + i}@{SYNTHETIC_EMAIL_DOMAIN}')
+            for i in range(self.scale.users)
+        ), natural_key=('username',))
+        Token.objects.bulk_create([Token(user=user, key=Token.generate_key()) for user in users])
+        return users
+
+    def create_buildings(self, users):
+        return self.bulk_create(FlatBuilding, (
+            FlatBuilding(
+                user=user, building_name=f'{user.username} Block {number + 1}',
+                address=f'{self.rng.randint(1, 999)} Synthetic Street', number_of_houses=self.scale.houses,
+            )
+            for user in users for number in range(self.scale.buildings)
+        ), natural_key=('user_id', 'building_name'))
+
+    def create_houses(self, buildings):
+        houses = []
+        for building in buildings:
+            for number in range(self.scale.houses):
+                rent = Decimal(self.rng.randrange(8000, 40001, 500))
+                houses.append(House(
+                    user_id=building.user_id, flat_building=building, house_number=str(number + 1),
+                    house_size=self.rng.choice(HOUSE_SIZES), house_rent_amount=rent, deposit_amount=rent,
+                ))
+        return self.bulk_create(House, houses, natural_key=('flat_building_id', 'house_number'))
+
+    def create_tenants(self, houses):
+        occupied = round(len(houses) * self.scale.occupancy)
+        total = occupied if self.scale.tenants is None else self.scale.tenants
+        occupied = min(occupied, total)
+        homes = self.rng.sample(houses, occupied)
+        homes += [self.rng.choice(houses) for _ in range(total - occupied)]
+
+        offset = Tenant.objects.filter(email__endswith=f'@{SYNTHETIC_EMAIL_DOMAIN}').count()
+        due_date = self.today.replace(day=5)
+        return self.bulk_create(Tenant, (
+            Tenant(
+                user_id=house.user_id, full_name=f'Tenant {offset + i}',
+                email=f'tenant{offset + i}@{SYNTHETIC_EMAIL_DOMAIN}', phone=f'+2547{90000000 + offset + i}',
+                id_number=f'S{offset + i:09d}', house=house, is_active=i < occupied, rent_due_date=due_date,
+            )
+            for i, house in enumerate(homes)
+        ), natural_key=('email',))
+
+    def invoices(self, tenants):
+        rents = {tenant.pk: tenant.house.house_rent_amount for tenant in tenants}
+        current = month_index(self.today.year, self.today.month)
+        months = [divmod(index, 12) for index in range(current - self.scale.years * 12 + 1, current + 1)]
+        partly_paid = self.scale.paid_rate + (1 - self.scale.paid_rate) / 2
+        for tenant in tenants:
+            if not tenant.is_active:
+                continue
+            rent = rents[tenant.pk]
+            for year, month in months:
+                outcome = self.rng.random()
+                if outcome < self.scale.paid_rate:
+                    paid = rent
+                elif outcome < partly_paid:
+                    paid = (rent * Decimal(self.rng.randint(1, 9)) / 10).quantize(Decimal('0.01'))
+                else:
+                    paid = Decimal('0.00')
+                yield RentPayment(
+                    user_id=tenant.user_id, tenant_id=tenant.pk, flat_building_id=tenant.house.flat_building_id,
+                    year=year, rent_month=month + 1, rent_amount=rent, amount_paid=paid, is_paid=paid >= rent,
+                    payment_method=self.rng.choice(PAYMENT_METHODS),
+                )
+
+    def create_payments(self, tenants):
+        created = 0
+        for batch in batched(self.invoices(tenants), self.scale.batch_size):
+            RentPayment.objects.bulk_create(batch)
+            created += len(batch)
+        self.log(f'{created} rent payments')
+        return created
+
+    def fix_up(self, users, buildings):
+        """ Rebuild, set-based, what the skipped save() methods and signals maintain. """
+        building_ids = [building.pk for building in buildings]
+        House.objects.filter(flat_building_id__in=building_ids).update(occupation=Exists(
+            Tenant.objects.filter(house=OuterRef('pk'), is_active=True)))
+        FlatBuilding.objects.filter(pk__in=building_ids).recompute_counts()
+
+        # one opening charge per owing tenant stands in for the per-invoice ledger postings
+        owing = RentPayment.objects.filter(
+            user__in=users, amount_paid__lt=F('rent_amount')
+        ).order_by().values('tenant_id', 'user_id').annotate(owed=Sum(F('rent_amount') - F('amount_paid')))
+        self.bulk_create(TenantLedgerEntry, (
+            TenantLedgerEntry(user_id=row['user_id'], tenant_id=row['tenant_id'],
+                              entry_type=TenantLedgerEntry.CHARGE, amount=row['owed'])
+            for row in owing.iterator(chunk_size=self.scale.batch_size)
+        ))
+        Tenant.objects.filter(user__in=users).reconcile_balances()
+
+        TenantArrears.refresh(as_of=self.today)
+        BuildingCollection.recompute(building_ids)
+        self.log('rebuilt occupation, counters, balances, arrears and collections')
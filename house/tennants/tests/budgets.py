@@ -0,0 +1,40 @@
+from django.test import override_settings
+
+
+class RequestBudgetMixin:
+    """ Assertions over the metrics RequestMetricsMiddleware attaches to test client responses. """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # a failed budget lists the statements that ran
+        cls.enterClassContext(override_settings(REQUEST_METRICS_KEEP_STATEMENTS=True))
+
+    def assertWithinBudget(self, response, queries=None, cache_misses=None):
+        metrics = response.request_metrics
+        path = response.wsgi_request.get_full_path()
+        if queries is not None and metrics.queries > queries:
+            self.fail(
+                f"{path} ran {metrics.queries} queries, budget is {queries}:\n"
+                + "\n".join(metrics.statements)
+            )
+        if cache_misses is not None and metrics.cache_misses > cache_misses:
+            self.fail(f"{path} missed the cache {metrics.cache_misses} times, budget is {cache_misses}")
+
+    def assertBudgetHolds(self, make_rows, url, queries, **budget):
+        """
+        Fetch `url` with the fixture as is, then again after `make_rows()`
+        has added more rows: both must fit the budget and cost the same,
+        so a per-row (N+1) query fails regardless of the budget's slack.
+        """
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200, url)
+        self.assertWithinBudget(first, queries=queries, **budget)
+
+        make_rows()
+        second = self.client.get(url)
+        self.assertWithinBudget(second, queries=queries, **budget)
+        self.assertEqual(
+            first.request_metrics.queries, second.request_metrics.queries,
+            f"{url} query count grew with the number of rows:\n" + "\n".join(second.request_metrics.statements)
+        )
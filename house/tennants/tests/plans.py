@@ -0,0 +1,80 @@
+import json
+import re
+from django.db import connections
+
+SQLITE_FULL_SCAN = re.compile(r'\bSCAN (\w+)$')
+
+
+def sqlite_problems(plan):
+    problems = []
+    for line in plan.splitlines():
+        detail = line.split(' ', 3)[-1]
+        if match := SQLITE_FULL_SCAN.search(detail):
+            problems.append(f'full scan of {match.group(1)}')
+        elif 'USE TEMP B-TREE FOR ORDER BY' in detail:
+            problems.append('filesort')
+    return problems
+
+
+def json_plan_nodes(plan):
+    """ Every dict in a JSON plan, depth first. """
+    if isinstance(plan, dict):
+        yield plan
+        plan = list(plan.values())
+    if isinstance(plan, list):
+        for value in plan:
+            yield from json_plan_nodes(value)
+
+
+def mysql_problems(plan):
+    problems = []
+    for node in json_plan_nodes(json.loads(plan)):
+        if node.get('access_type') == 'ALL':
+            problems.append(f"full scan of {node.get('table_name')}")
+        if node.get('using_filesort'):
+            problems.append('filesort')
+    return problems
+
+
+def postgresql_problems(plan):
+    problems = []
+    for node in json_plan_nodes(json.loads(plan) if isinstance(plan, str) else plan):
+        if node.get('Node Type') == 'Seq Scan':
+            problems.append(f"full scan of {node.get('Relation Name')}")
+        elif node.get('Node Type') in ('Sort', 'Incremental Sort'):
+            problems.append('filesort')
+    return problems
+
+
+def plan_problems(queryset):
+    """ Full table scans and sorts in the database's plan for `queryset`. """
+    vendor = connections[queryset.db].vendor
+    if vendor == 'sqlite':
+        return sqlite_problems(queryset.explain())
+    if vendor == 'mysql':
+        return mysql_problems(queryset.explain(format='json'))
+    if vendor == 'postgresql':
+        return postgresql_problems(queryset.explain(format='json'))
+    raise NotImplementedError(f'No query plan checks for {vendor}')
+
+
+def analyze(using='default'):
+    """ Refresh planner statistics so plans reflect the seeded rows. """
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        if connection.vendor == 'mysql':
+            tables = connection.introspection.django_table_names(only_existing=True)
+            cursor.execute(f"ANALYZE TABLE {', '.join(connection.ops.quote_name(table) for table in tables)}")
+            cursor.fetchall()
+        else:
+            cursor.execute('ANALYZE')
+
+
+class QueryPlanMixin:
+    """ Assertions over EXPLAIN output of querysets. """
+
+    def assertIndexed(self, queryset, name=None):
+        problems = plan_problems(queryset)
+        if problems:
+            self.fail(f"{name or queryset.model.__name__} query plan has {', '.join(problems)}:\n"
+                      f"{queryset.query}\n{queryset.explain()}")
@@ -0,0 +1,139 @@
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.test import APIClient
+from tennants.models import FlatBuilding, House, Tenant, RentPayment, TenantArrears
+
+AS_OF = date(2025, 6, 10)
+
+
+class TenantArrearsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='owner', password='testpass123')
+        self.buildings = [
+            FlatBuilding.objects.create(
+                user=self.user, building_name=f'Block {name}', address='Street 1', number_of_houses=5
+            )
+            for name in 'AB'
+        ]
+        self.tenants = []
+        for i, building in enumerate(self.buildings):
+            house = House.objects.create(
+                user=self.user, flat_building=building, house_number=str(i + 1),
+                house_rent_amount=Decimal('1000.00')
+            )
+            self.tenants.append(Tenant.objects.create(
+                user=self.user, full_name=f'Tenant {i}', email=f't{i}@example.com',
+                phone=f'+25471234560{i}', id_number=str(100 + i), house=house
+            ))
+
+    def tearDown(self):
+        cache.clear()
+
+    def invoice(self, tenant, year, month, paid='0.00'):
+        return RentPayment.objects.create(
+            user=self.user, tenant=tenant, year=year, rent_month=month, amount_paid=Decimal(paid)
+        )
+
+    def test_bucket_cutoffs(self):
+        # May fell overdue on June 1st: 10 days; April on May 1st: 41 days; and so on
+        self.assertEqual(TenantArrears.bucket_cutoff(AS_OF, 30), 2025 * 12 + 4)
+        self.assertEqual(TenantArrears.bucket_cutoff(AS_OF, 60), 2025 * 12 + 3)
+        self.assertEqual(TenantArrears.bucket_cutoff(AS_OF, 90), 2025 * 12 + 2)
+        # on the 31st even last month's invoice is 31 days late
+        self.assertEqual(TenantArrears.bucket_cutoff(date(2025, 7, 31), 30), 2025 * 12 + 6)
+
+    def test_refresh_ages_unpaid_invoices(self):
+        tenant = self.tenants[0]
+        self.invoice(tenant, 2025, 6)
+        self.invoice(tenant, 2025, 5, paid='400.00')
+        self.invoice(tenant, 2025, 4)
+        self.invoice(tenant, 2025, 3)
+        self.invoice(tenant, 2025, 1)
+        self.invoice(tenant, 2025, 2, paid='1000.00')
+
+        with self.assertNumQueries(5):
+            self.assertEqual(TenantArrears.refresh([tenant.pk], as_of=AS_OF), 1)
+
+        arrears = TenantArrears.objects.get(tenant=tenant)
+        self.assertEqual(
+            [getattr(arrears, name) for name in TenantArrears.BUCKET_FIELDS + ('total',)],
+            [Decimal('1000.00'), Decimal('600.00'), Decimal('1000.00'), Decimal('1000.00'),
+             Decimal('1000.00'), Decimal('4600.00')]
+        )
+        self.assertEqual(arrears.oldest_unpaid, date(2025, 1, 1))
+        self.assertEqual(arrears.flat_building, self.buildings[0])
+
+    def test_payments_refresh_their_tenant(self):
+        payment = self.invoice(self.tenants[0], 2025, 1)
+        self.assertEqual(TenantArrears.objects.get(tenant=self.tenants[0]).total, Decimal('1000.00'))
+
+        payment.amount_paid = Decimal('1000.00')
+        payment.save()
+        self.assertFalse(TenantArrears.objects.filter(tenant=self.tenants[0]).exists())
+
+        payment = self.invoice(self.tenants[1], 2025, 1, paid='250.00')
+        self.assertEqual(TenantArrears.objects.get(tenant=self.tenants[1]).total, Decimal('750.00'))
+        payment.delete()
+        self.assertFalse(TenantArrears.objects.exists())
+
+    def test_rent_run_and_rebuild(self):
+        RentPayment.create_rent_run(self.user, 2025, 6)
+        self.assertEqual(TenantArrears.objects.count(), 2)
+
+        TenantArrears.objects.all().delete()
+        out = StringIO()
+        call_command('rebuild_arrears', stdout=out)
+        self.assertIn('Rebuilt arrears for 2 tenants', out.getvalue())
+
+    def test_rollup_per_building_and_landlord(self):
+        self.invoice(self.tenants[0], 2025, 1)
+        self.invoice(self.tenants[0], 2025, 2)
+        self.invoice(self.tenants[1], 2025, 1, paid='500.00')
+
+        arrears = TenantArrears.objects.filter(user=self.user)
+        self.assertEqual(arrears.rollup()['total'], Decimal('2500.00'))
+        self.assertEqual(
+            [(row['flat_building'], row['tenants'], row['total']) for row in arrears.rollup('flat_building')],
+            [(self.buildings[0].pk, 1, Decimal('2000.00')), (self.buildings[1].pk, 1, Decimal('500.00'))]
+        )
+
+    def test_moving_tenant_moves_arrears(self):
+        self.invoice(self.tenants[0], 2025, 1)
+        house = House.objects.create(
+            user=self.user, flat_building=self.buildings[1], house_number='9', house_rent_amount=Decimal('1000.00')
+        )
+        self.tenants[0].house = house
+        self.tenants[0].save()
+        self.assertEqual(TenantArrears.objects.get(tenant=self.tenants[0]).flat_building, self.buildings[1])
+
+    def test_api_lists_largest_debts_first(self):
+        self.invoice(self.tenants[0], 2025, 1)
+        self.invoice(self.tenants[1], 2025, 1)
+        self.invoice(self.tenants[1], 2025, 2)
+
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        response = client.get('/api/arrears/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['tenant_name'] for row in response.json()['results']], ['Tenant 1', 'Tenant 0'])
+
+        response = client.get('/api/arrears/', {'building': self.buildings[0].pk})
+        self.assertEqual([row['tenant_name'] for row in response.json()['results']], ['Tenant 0'])
+
+        response = client.get('/api/arrears/summary/')
+        self.assertEqual(response.data['totals']['total'], Decimal('3000.00'))
+        self.assertEqual(response.data['buildings'][0]['flat_building__building_name'], 'Block B')
+
+    def test_overdue_page_reads_arrears(self):
+        self.invoice(self.tenants[0], 2025, 1)
+        self.client.force_login(self.user)
+        response = self.client.get('/payments/overdue/')
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Tenant 0')
+        self.assertEqual(response.context['totals']['total'], Decimal('1000.00'))
@@ -0,0 +1,83 @@
+from datetime import timedelta
+from django.contrib.auth.models import Group, User
+from django.contrib.auth.signals import user_logged_out
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from tennants.authentication import cache_user, user_cache, user_cache_key
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        user_cache().clear()
+        self.user = User.objects.create_user(username='owner', password='testpass123')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+
+    def tearDown(self):
+        cache.clear()
+        user_cache().clear()
+
+    def cached(self):
+        return user_cache().get(user_cache_key(self.user.pk))
+
+    def test_user_row_is_read_once(self):
+        self.assertEqual(self.client.get('/api/flats/').status_code, 200)
+        self.assertEqual(self.cached()['username'], 'owner')
+        self.assertNotIn('password', self.cached())
+        # page cache hit and user cache hit: no query at all
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get('/api/flats/').status_code, 200)
+
+    def test_cached_user_only_writes_cached_fields(self):
+        self.client.get('/api/flats/')
+        response = self.client.get('/api/flats/')
+        user = response.wsgi_request.user
+        self.assertEqual((user.pk, user.username), (self.user.pk, 'owner'))
+        self.assertEqual(user.get_deferred_fields(), {
+            field.attname for field in User._meta.concrete_fields
+            if field.attname not in ('id', 'username', 'is_active', 'is_staff', 'is_superuser')
+        })
+        user.save()
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password('testpass123'))
+
+    def test_page_cache_clear_keeps_users(self):
+        self.client.get('/api/flats/')
+        cache.clear()
+        self.assertIsNotNone(self.cached())
+
+    def test_deactivated_user_is_rejected(self):
+        self.client.get('/api/flats/')
+        self.user.is_active = False
+        self.user.save()
+        self.assertIsNone(self.cached())
+        self.assertEqual(self.client.get('/api/flats/').status_code, 401)
+
+    def test_stale_cached_user_is_still_checked(self):
+        self.user.is_active = False
+        cache_user(self.user)
+        self.assertEqual(self.client.get('/api/flats/').status_code, 401)
+
+    def test_expired_token_is_rejected_with_cached_user(self):
+        self.client.get('/api/flats/')
+        token = AccessToken.for_user(self.user)
+        token.set_exp(lifetime=-timedelta(seconds=1))
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertEqual(self.client.get('/api/flats/').status_code, 401)
+
+    def test_permission_changes_and_logout_evict(self):
+        group = Group.objects.create(name='managers')
+        self.client.get('/api/flats/')
+        self.user.groups.add(group)
+        self.assertIsNone(self.cached())
+
+        self.client.get('/api/flats/')
+        group.user_set.remove(self.user)
+        self.assertIsNone(self.cached())
+
+        self.client.get('/api/flats/')
+        user_logged_out.send(sender=User, request=None, user=self.user)
+        self.assertIsNone(self.cached())
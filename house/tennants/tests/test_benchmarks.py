@@ -0,0 +1,39 @@
+from django.core.cache import cache
+from django.test import TestCase
+from tennants.benchmarks import ENDPOINTS, BenchmarkRunner, compare, percentile
+from tennants.synthetic import Scale
+
+
+class BenchmarkTests(TestCase):
+    def tearDown(self):
+        cache.clear()
+
+    def test_percentile(self):
+        samples = list(range(1, 101))
+        self.assertEqual(percentile(samples, 50), 50)
+        self.assertEqual(percentile(samples, 95), 95)
+        self.assertEqual(percentile([3.0], 95), 3.0)
+
+    def test_runs_every_endpoint(self):
+        results = BenchmarkRunner(runs=2).run_scale(Scale(houses=3, occupancy=1))
+        self.assertEqual(results['rows']['rent_payments'], 72)
+        self.assertEqual(set(results['endpoints']), {name for name, _, _ in ENDPOINTS})
+        for name, metrics in results['endpoints'].items():
+            with self.subTest(endpoint=name):
+                self.assertGreater(metrics['queries'], 0)
+                self.assertGreater(metrics['peak_memory_kb'], 0)
+                self.assertLessEqual(metrics['p50_ms'], metrics['p95_ms'])
+
+    def test_compare_flags_regressions(self):
+        baseline = {'scales': {'small': {'endpoints': {
+            'dashboard': {'queries': 9, 'p95_ms': 10.0, 'peak_memory_kb': 100.0},
+        }}}}
+        results = {'scales': {'small': {'endpoints': {
+            'dashboard': {'queries': 10, 'p95_ms': 11.5, 'peak_memory_kb': 130.0},
+            'building-list': {'queries': 5, 'p95_ms': 5.0, 'peak_memory_kb': 50.0},
+        }}}}
+        self.assertEqual(compare(results, baseline, threshold=0.2), [
+            'small dashboard queries: 10 (baseline 9)',
+            'small dashboard peak_memory_kb: 130.0 (baseline 100.0)',
+        ])
+        self.assertEqual(compare(results, baseline, threshold=0.5), ['small dashboard queries: 10 (baseline 9)'])
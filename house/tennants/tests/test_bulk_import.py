@@ -0,0 +1,91 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from tennants.models import FlatBuilding, House, Tenant
+
+
+class TenantBulkImportTests(APITestCase):
+    url = '/api/tennants/bulk/'
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='owner', password='testpass123')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.building = FlatBuilding.objects.create(
+            user=self.user, building_name='Block A', address='Street 1', number_of_houses=50
+        )
+        self.houses = [
+            House.objects.create(user=self.user, flat_building=self.building, house_number=str(100 + i))
+            for i in range(40)
+        ]
+
+    def tearDown(self):
+        cache.clear()
+
+    def make_rows(self, count, start=0):
+        return [
+            {
+                'full_name': f'Tenant {i}',
+                'email': f'tenant{i}@example.com',
+                'phone': f'+2547{10000000 + i}',
+                'id_number': str(20000000 + i),
+                'house': self.houses[i].pk,
+            }
+            for i in range(start, start + count)
+        ]
+
+    def test_json_import_creates_tenants_and_fixes_occupation(self):
+        response = self.client.post(self.url, self.make_rows(3), format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 3)
+
+        self.assertEqual(Tenant.objects.filter(user=self.user).count(), 3)
+        self.assertEqual(House.objects.filter(occupation=True).count(), 3)
+        self.building.refresh_from_db()
+        self.assertEqual(self.building.how_many_occupied, 3)
+        self.assertEqual(self.building.tenant_count(), 3)
+
+    def test_csv_upload(self):
+        content = "full_name,email,phone,id_number,house\n"
+        content += f"Jane Doe,jane@example.com,+254712345001,,{self.houses[0].pk}\n"
+        content += "John Doe,john@example.com,+254712345002,,\n"
+        upload = SimpleUploadedFile('tenants.csv', content.encode('utf-8'), content_type='text/csv')
+
+        response = self.client.post(self.url, {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 2)
+        self.assertIsNone(Tenant.objects.get(email='john@example.com').house)
+
+    def test_per_row_errors_reject_the_batch(self):
+        Tenant.objects.create(
+            user=self.user, full_name='Existing', email='existing@example.com',
+            phone='+254700000001', id_number='99', house=self.houses[5]
+        )
+        rows = self.make_rows(3)
+        rows[1]['email'] = rows[0]['email']
+        rows[2]['phone'] = '+254700000001'
+        rows.append(dict(self.make_rows(1, start=10)[0], house=self.houses[5].pk))
+        rows.append(dict(self.make_rows(1, start=11)[0], house=999999))
+
+        response = self.client.post(self.url, rows, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = {entry['row']: ' '.join(entry['errors']) for entry in response.data['errors']}
+        self.assertIn('duplicated within the upload', errors[0])
+        self.assertIn('duplicated within the upload', errors[1])
+        self.assertIn('already in use', errors[2])
+        self.assertIn('already occupied', errors[3])
+        self.assertIn('does not exist', errors[4])
+        self.assertEqual(Tenant.objects.count(), 1)
+
+    def test_query_count_does_not_grow_with_batch_size(self):
+        with CaptureQueriesContext(connection) as small:
+            self.client.post(self.url, self.make_rows(2), format='json')
+        with CaptureQueriesContext(connection) as large:
+            self.client.post(self.url, self.make_rows(30, start=2), format='json')
+        self.assertEqual(Tenant.objects.count(), 32)
+        self.assertEqual(len(small), len(large))
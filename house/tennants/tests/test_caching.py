@@ -0,0 +1,212 @@
+import gzip
+from unittest import mock
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient, APIRequestFactory
+from decimal import Decimal
+from tennants.caching import (bump_cache_version, get_cache_version, make_cache_key)
+from tennants.models import FlatBuilding, House, Tenant, RentPayment
+from tennants.renderers import ORJSONRenderer
+
+
+class CacheVersionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='owner', password='testpass123')
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_bump_changes_cache_key(self):
+        """Bumping a namespace moves every page of it to a new key"""
+        request = APIRequestFactory().get('/api/flats/?page=2')
+        request.user = self.user
+        before = make_cache_key(request, prefix="flats")
+        bump_cache_version(self.user.id, "flats")
+        self.assertNotEqual(before, make_cache_key(request, prefix="flats"))
+
+    def test_bump_is_scoped_to_user_and_resource(self):
+        other = User.objects.create_user(username='other', password='testpass123')
+        houses = get_cache_version(self.user.id, "houses")
+        other_flats = get_cache_version(other.id, "flats")
+        bump_cache_version(self.user.id, "flats")
+        self.assertEqual(get_cache_version(self.user.id, "houses"), houses)
+        self.assertEqual(get_cache_version(other.id, "flats"), other_flats)
+
+    def test_model_signals_bump_dependent_namespaces(self):
+        flats = get_cache_version(self.user.id, "flats")
+        houses = get_cache_version(self.user.id, "houses")
+        building = FlatBuilding.objects.create(
+            user=self.user, building_name='Block A', address='Street 1', number_of_houses=2
+        )
+        self.assertNotEqual(get_cache_version(self.user.id, "flats"), flats)
+        self.assertEqual(get_cache_version(self.user.id, "houses"), houses)
+
+        arrears = get_cache_version(self.user.id, "arrears")
+        House.objects.create(user=self.user, flat_building=building, house_number='1')
+        self.assertNotEqual(get_cache_version(self.user.id, "houses"), houses)
+        self.assertNotEqual(get_cache_version(self.user.id, "arrears"), arrears)
+
+
+class CachedListInvalidationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='owner', password='testpass123')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.building = FlatBuilding.objects.create(
+            user=self.user, building_name='Block A', address='Street 1', number_of_houses=5
+        )
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_update_through_detail_view_refreshes_list(self):
+        self.assertEqual(self.client.get('/api/flats/').json()['results'][0]['building_name'], 'Block A')
+
+        response = self.client.patch(f'/api/flats/{self.building.pk}/', {'building_name': 'Block B'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(self.client.get('/api/flats/').json()['results'][0]['building_name'], 'Block B')
+
+    def test_create_refreshes_list(self):
+        self.assertEqual(self.client.get('/api/houses/').json()['count'], 0)
+        response = self.client.post('/api/houses/', {
+            'flat_building': self.building.pk,
+            'house_number': '101',
+            'house_rent_amount': Decimal('1000.00'),
+        })
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.client.get('/api/houses/').json()['count'], 1)
+
+    def test_delete_refreshes_list(self):
+        house = House.objects.create(user=self.user, flat_building=self.building, house_number='101')
+        self.assertEqual(self.client.get('/api/houses/').json()['count'], 1)
+        self.client.delete(f'/api/houses/{house.pk}/')
+        self.assertEqual(self.client.get('/api/houses/').json()['count'], 0)
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='owner', password='testpass123')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.building = FlatBuilding.objects.create(
+            user=self.user, building_name='Block A', address='Street 1', number_of_houses=5
+        )
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_unchanged_poll_is_304_without_queries(self):
+        response = self.client.get('/api/flats/')
+        etag = response['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/flats/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], etag)
+
+    def test_write_changes_etag(self):
+        etag = self.client.get('/api/houses/')['ETag']
+        House.objects.create(user=self.user, flat_building=self.building, house_number='101')
+
+        response = self.client.get('/api/houses/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.json()['count'], 1)
+
+    def test_detail_etag(self):
+        url = f'/api/flats/{self.building.pk}/'
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.client.patch(url, {'building_name': 'Block B'})
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['building_name'], 'Block B')
+
+    def test_rent_payment_detail_etag(self):
+        house = House.objects.create(
+            user=self.user, flat_building=self.building, house_number='1', house_rent_amount=Decimal('1000.00')
+        )
+        tenant = Tenant.objects.create(
+            user=self.user, full_name='John Doe', email='john@example.com', phone='+254712345678',
+            id_number='123', house=house
+        )
+        payment = RentPayment.objects.create(user=self.user, tenant=tenant, year=2025, rent_month=1)
+        url = f'/api/rentpayments/{payment.pk}/'
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.client.patch(url, {'amount_paid': '400.00'})
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['amount_paid'], '400.00')
+
+    def test_etag_varies_with_renderer_and_matches_weakly(self):
+        response = self.client.get('/api/flats/', HTTP_ACCEPT_ENCODING='gzip')
+        etag = response['ETag']
+        self.assertTrue(etag.startswith('W/'))
+        self.assertIn('Accept', response['Vary'])
+        self.assertIn('Accept-Encoding', response['Vary'])
+        # the identity body is the same representation, so a weak match still revalidates
+        self.assertEqual(self.client.get('/api/flats/', HTTP_IF_NONE_MATCH=etag.removeprefix('W/')).status_code,
+                         status.HTTP_304_NOT_MODIFIED)
+
+        html = self.client.get('/api/flats/', HTTP_ACCEPT='text/html')
+        self.assertNotEqual(html['ETag'], etag)
+        self.assertIn('Accept', html['Vary'])
+        response = self.client.get('/api/flats/', HTTP_ACCEPT='text/html', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_etag_is_per_user(self):
+        etag = self.client.get('/api/flats/')['ETag']
+        other = User.objects.create_user(username='other', password='testpass123')
+        self.client.force_authenticate(user=other)
+        self.assertEqual(self.client.get('/api/flats/', HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+
+
+def entry_key(etag):
+    """ The cache key a list response's W/"<key>-<format>" ETag was made from. """
+    return etag.removeprefix('W/').strip('"').rsplit('-', 1)[0]
+
+
+class CachedBytesTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='owner', password='testpass123')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        FlatBuilding.objects.create(user=self.user, building_name='Block A', address='Street 1', number_of_houses=5)
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_hit_serves_stored_bytes_without_rendering(self):
+        first = self.client.get('/api/flats/')
+        etag, content_type, body = cache.get(entry_key(first['ETag']))
+        self.assertEqual(gzip.decompress(body), first.content)
+        self.assertEqual(content_type, first['Content-Type'])
+
+        with self.assertNumQueries(0), mock.patch.object(ORJSONRenderer, 'render', side_effect=AssertionError):
+            second = self.client.get('/api/flats/')
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['ETag'], etag)
+        self.assertEqual(second.json()['results'][0]['building_name'], 'Block A')
+
+    def test_gzip_clients_get_the_compressed_bytes(self):
+        plain = self.client.get('/api/flats/')
+        response = self.client.get('/api/flats/', HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+
+    def test_browsable_api_is_not_cached(self):
+        response = self.client.get('/api/flats/', HTTP_ACCEPT='text/html')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(cache.get(entry_key(response['ETag'])))
@@ -0,0 +1,126 @@
+from decimal import Decimal
+from io import StringIO
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.test import APIClient
+from tennants.models import FlatBuilding, House, Tenant, RentPayment, BuildingCollection
+
+
+class BuildingCollectionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='owner', password='testpass123')
+        self.buildings = [
+            FlatBuilding.objects.create(
+                user=self.user, building_name=f'Block {name}', address='Street 1', number_of_houses=5
+            )
+            for name in 'AB'
+        ]
+        self.tenants = []
+        for i, building in enumerate(self.buildings * 2):
+            house = House.objects.create(
+                user=self.user, flat_building=building, house_number=str(i + 1),
+                house_rent_amount=Decimal('1000.00')
+            )
+            self.tenants.append(Tenant.objects.create(
+                user=self.user, full_name=f'Tenant {i}', email=f't{i}@example.com',
+                phone=f'+25471234560{i}', id_number=str(100 + i), house=house
+            ))
+
+    def tearDown(self):
+        cache.clear()
+
+    def row(self, building, year=2025, month=3):
+        row = BuildingCollection.objects.get(flat_building=building, year=year, month=month)
+        return row.expected_rent, row.collected, row.paid_invoices, row.unpaid_invoices
+
+    def rows(self):
+        return sorted(BuildingCollection.objects.values_list(
+            'flat_building', 'year', 'month', 'expected_rent', 'collected', 'paid_invoices', 'unpaid_invoices'))
+
+    def test_invoice_writes_move_the_rollup(self):
+        payment = RentPayment.objects.create(user=self.user, tenant=self.tenants[0], year=2025, rent_month=3)
+        RentPayment.objects.create(
+            user=self.user, tenant=self.tenants[2], year=2025, rent_month=3, amount_paid=Decimal('1000.00')
+        )
+        self.assertEqual(self.row(self.buildings[0]), (Decimal('2000.00'), Decimal('1000.00'), 1, 1))
+
+        payment.amount_paid = Decimal('1000.00')
+        payment.save()
+        self.assertEqual(self.row(self.buildings[0]), (Decimal('2000.00'), Decimal('2000.00'), 2, 0))
+
+        # moving the invoice to another month moves its share
+        payment.rent_month = 4
+        payment.save()
+        self.assertEqual(self.row(self.buildings[0]), (Decimal('1000.00'), Decimal('1000.00'), 1, 0))
+        self.assertEqual(self.row(self.buildings[0], month=4), (Decimal('1000.00'), Decimal('1000.00'), 1, 0))
+
+        payment.delete()
+        self.assertEqual(self.row(self.buildings[0], month=4), (Decimal('0.00'), Decimal('0.00'), 0, 0))
+
+    def test_incremental_rows_match_a_rebuild(self):
+        RentPayment.create_rent_run(self.user, 2025, 3)
+        for tenant in self.tenants[:3]:
+            payment = tenant.rent_payments.get()
+            payment.amount_paid = Decimal('600.00')
+            payment.save()
+        RentPayment.objects.create(user=self.user, tenant=self.tenants[1], year=2025, rent_month=2)
+        incremental = self.rows()
+
+        out = StringIO()
+        call_command('backfill_collections', stdout=out)
+        self.assertIn('Rebuilt 3 building-month collection rows', out.getvalue())
+        self.assertEqual(self.rows(), incremental)
+
+    def test_invoice_stays_with_its_building_when_the_tenant_moves(self):
+        RentPayment.create_rent_run(self.user, 2025, 3)
+        tenant = self.tenants[0]
+        tenant.house = House.objects.create(
+            user=self.user, flat_building=self.buildings[1], house_number='9', house_rent_amount=Decimal('1000.00')
+        )
+        tenant.save()
+
+        payment = tenant.rent_payments.get()
+        payment.amount_paid = Decimal('1000.00')
+        payment.save()
+        self.assertEqual(self.row(self.buildings[0]), (Decimal('2000.00'), Decimal('1000.00'), 1, 1))
+        self.assertEqual(self.row(self.buildings[1]), (Decimal('2000.00'), Decimal('0.00'), 0, 2))
+
+        incremental = self.rows()
+        BuildingCollection.recompute()
+        self.assertEqual(self.rows(), incremental)
+
+        payment.delete()
+        self.assertEqual(self.row(self.buildings[0]), (Decimal('1000.00'), Decimal('0.00'), 0, 1))
+
+    def test_payment_without_amount_change_leaves_rollup(self):
+        payment = RentPayment.objects.create(user=self.user, tenant=self.tenants[0], year=2025, rent_month=3)
+        payment.payment_method = 'cheque'
+        payment.save()
+        self.assertEqual(self.row(self.buildings[0]), (Decimal('1000.00'), Decimal('0.00'), 0, 1))
+
+    def test_report_reads_rollup(self):
+        RentPayment.create_rent_run(self.user, 2025, 3)
+        RentPayment.create_rent_run(self.user, 2025, 4)
+        payment = self.tenants[1].rent_payments.get(rent_month=3)
+        payment.amount_paid = Decimal('500.00')
+        payment.save()
+
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        with self.assertNumQueries(1):
+            response = client.get('/api/collections/', {'year': 2025, 'month': 3})
+        self.assertEqual(
+            [(row['flat_building__building_name'], row['expected_rent'], row['collected'], row['collection_rate'])
+             for row in response.data['buildings']],
+            [('Block A', Decimal('2000.00'), Decimal('0.00'), Decimal('0')),
+             ('Block B', Decimal('2000.00'), Decimal('500.00'), Decimal('0.25'))]
+        )
+
+        response = client.get('/api/collections/', {'year': 2025})
+        self.assertEqual(response.data['buildings'][1]['expected_rent'], Decimal('4000.00'))
+
+        response = client.get('/api/collections/', {'year': 2025, 'month': 13})
+        self.assertEqual(response.status_code, 400)
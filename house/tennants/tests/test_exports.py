@@ -0,0 +1,81 @@
+import csv
+import io
+import json
+from decimal import Decimal
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from tennants.exports import iter_rows, RENT_PAYMENT_COLUMNS
+from tennants.models import FlatBuilding, House, Tenant, RentPayment
+
+
+class ExportTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='owner', password='testpass123')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.building = FlatBuilding.objects.create(
+            user=self.user, building_name='Block A', address='Street 1', number_of_houses=5
+        )
+        house = House.objects.create(
+            user=self.user, flat_building=self.building, house_number='1', house_rent_amount=Decimal('1000.00')
+        )
+        self.tenant = Tenant.objects.create(
+            user=self.user, full_name='John Doe', email='john@example.com',
+            phone='+254712345678', id_number='123', house=house
+        )
+        for month in (1, 2, 3):
+            RentPayment.objects.create(
+                user=self.user, tenant=self.tenant, year=2025, rent_month=month,
+                amount_paid=Decimal('1000.00') if month < 3 else Decimal('0.00'), is_paid=month < 3
+            )
+        other = User.objects.create_user(username='other', password='testpass123')
+        RentPayment.objects.create(user=other, tenant=self.tenant, year=2024, rent_month=1)
+
+    def tearDown(self):
+        cache.clear()
+
+    def read(self, response):
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    def test_csv_export_streams_joined_columns(self):
+        response = self.client.get('/api/exports/rentpayments.csv')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+
+        rows = list(csv.DictReader(io.StringIO(self.read(response))))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]['tenant'], 'John Doe')
+        self.assertEqual(rows[0]['building'], 'Block A')
+        self.assertEqual(rows[0]['rent_amount'], '1000.00')
+
+    def test_ndjson_export_applies_filters(self):
+        response = self.client.get('/api/exports/rentpayments.ndjson', {'year': 2025, 'is_paid': 'false'})
+        rows = [json.loads(line) for line in self.read(response).splitlines()]
+        self.assertEqual([row['rent_month'] for row in rows], [3])
+
+        response = self.client.get('/api/exports/rentpayments.ndjson', {'building': self.building.pk, 'month': 2})
+        self.assertEqual(len(self.read(response).splitlines()), 1)
+
+    def test_tenant_export_serializes_phone(self):
+        response = self.client.get('/api/exports/tennants.ndjson')
+        row = json.loads(self.read(response).splitlines()[0])
+        self.assertEqual(row['phone'], '+254712345678')
+        self.assertEqual(row['building'], 'Block A')
+
+    def test_rows_are_read_in_keyset_pages(self):
+        queryset = RentPayment.objects.filter(user=self.user).order_by('-rent_month')
+        with self.assertNumQueries(2):
+            rows = list(iter_rows(queryset, RENT_PAYMENT_COLUMNS, chunk_size=2))
+        ids = list(RentPayment.objects.filter(user=self.user).order_by('pk').values_list('pk', flat=True))
+        self.assertEqual([row[0] for row in rows], ids)
+
+    def test_bad_requests(self):
+        self.assertEqual(self.client.get('/api/exports/houses.xlsx').status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(
+            self.client.get('/api/exports/rentpayments.csv', {'year': 'abc'}).status_code,
+            status.HTTP_400_BAD_REQUEST
+        )
@@ -202,48 +202,42 @@ class HouseModelTest(TestCase):
         with self.assertRaises(ValidationError):
             tenant2.full_clean()
 
-    def test_cache_invalidation_on_house_save(self):
-        """Test that building cache is invalidated when house is saved"""
-        # Set cache values
-        cache.set(f"flat_{self.flat_building.pk}_occupied", 2, timeout=60)
-        cache.set(f"flat_{self.flat_building.pk}_vacant", 3, timeout=60)
-        
-        # Verify cache is set
-        self.assertIsNotNone(cache.get(f"flat_{self.flat_building.pk}_occupied"))
-        self.assertIsNotNone(cache.get(f"flat_{self.flat_building.pk}_vacant"))
-        
-        # Save house - should clear cache via signal
+    def test_building_counters_on_house_save(self):
+        """Test that building counters follow house occupation changes"""
+        self.house.occupation = True
+        self.house.save()
+        self.flat_building.refresh_from_db()
+        self.assertEqual(self.flat_building.how_many_occupied, 1)
+        self.assertEqual(self.flat_building.vacant_houses, 4)
+
+        # Saving without an occupation change leaves the counters alone
         self.house.house_rent_amount = 1200
         self.house.save()
-        
-        # Cache should be cleared by signal
-        self.assertIsNone(cache.get(f"flat_{self.flat_building.pk}_occupied"))
-        self.assertIsNone(cache.get(f"flat_{self.flat_building.pk}_vacant"))
+        self.flat_building.refresh_from_db()
+        self.assertEqual(self.flat_building.how_many_occupied, 1)
 
-    def test_cache_invalidation_on_house_delete(self):
-        """Test that building cache is invalidated when house is deleted"""
-        # Create a house to delete
-        house_to_delete = House.objects.create(
+    def test_building_counters_on_house_delete(self):
+        """Test that building counters are recounted when a house is deleted"""
+        House.objects.create(
             user=self.user,
             flat_building=self.flat_building,
             house_number="102",
+            house_rent_amount=1000,
+            occupation=True
+        )
+        house_to_delete = House.objects.create(
+            user=self.user,
+            flat_building=self.flat_building,
+            house_number="103",
             house_rent_amount=1000
         )
-        
-        # Set cache values
-        cache.set(f"flat_{self.flat_building.pk}_occupied", 1, timeout=60)
-        cache.set(f"flat_{self.flat_building.pk}_vacant", 4, timeout=60)
-        
-        # Verify cache is set
-        self.assertIsNotNone(cache.get(f"flat_{self.flat_building.pk}_occupied"))
-        self.assertIsNotNone(cache.get(f"flat_{self.flat_building.pk}_vacant"))
-        
-        # Delete house - should clear cache via signal
+        # Simulate a drifted counter
+        FlatBuilding.objects.filter(pk=self.flat_building.pk).update(occupied_count=4)
+
         house_to_delete.delete()
-        
-        # Cache should be cleared by signal
-        self.assertIsNone(cache.get(f"flat_{self.flat_building.pk}_occupied"))
-        self.assertIsNone(cache.get(f"flat_{self.flat_building.pk}_vacant"))
+
+        self.flat_building.refresh_from_db()
+        self.assertEqual(self.flat_building.how_many_occupied, 1)
 
     def test_occupation_auto_update_via_tenant_signals(self):
         """Test that house occupation is automatically updated via tenant signals"""
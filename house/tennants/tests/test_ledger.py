@@ -0,0 +1,94 @@
+from decimal import Decimal
+from io import StringIO
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from tennants.caching import get_cache_version
+from tennants.models import FlatBuilding, House, Tenant, RentPayment, TenantLedgerEntry
+
+
+class TenantLedgerTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='owner', password='testpass123')
+        building = FlatBuilding.objects.create(
+            user=self.user, building_name='Block A', address='Street 1', number_of_houses=5
+        )
+        self.house = House.objects.create(
+            user=self.user, flat_building=building, house_number='1', house_rent_amount=Decimal('1000.00')
+        )
+        self.tenant = Tenant.objects.create(
+            user=self.user, full_name='John Doe', email='john@example.com',
+            phone='+254712345678', id_number='123', house=self.house
+        )
+
+    def tearDown(self):
+        cache.clear()
+
+    def balance(self):
+        return Tenant.objects.values_list('balance', flat=True).get(pk=self.tenant.pk)
+
+    def test_invoice_and_payments_move_balance(self):
+        payment = RentPayment.objects.create(user=self.user, tenant=self.tenant, year=2025, rent_month=1)
+        self.assertEqual(self.balance(), Decimal('1000.00'))
+
+        payment.amount_paid = Decimal('400.00')
+        payment.save()
+        self.assertEqual(self.balance(), Decimal('600.00'))
+
+        # overpayment settles the invoice without turning into credit
+        payment.amount_paid = Decimal('1500.00')
+        payment.save()
+        self.assertEqual(self.balance(), Decimal('0.00'))
+
+        self.assertEqual(
+            list(self.tenant.ledger_entries.order_by('pk').values_list('entry_type', 'amount')),
+            [('charge', Decimal('1000.00')), ('payment', Decimal('-400.00')), ('payment', Decimal('-600.00'))]
+        )
+
+    def test_deleting_invoice_reverses_what_it_owed(self):
+        payment = RentPayment.objects.create(
+            user=self.user, tenant=self.tenant, year=2025, rent_month=1, amount_paid=Decimal('250.00')
+        )
+        self.assertEqual(self.balance(), Decimal('750.00'))
+        payment.delete()
+        self.assertEqual(self.balance(), Decimal('0.00'))
+        self.assertTrue(self.tenant.ledger_entries.filter(entry_type='reversal').exists())
+
+    def test_stale_tenant_save_does_not_overwrite_balance(self):
+        stale = Tenant.objects.get(pk=self.tenant.pk)
+        RentPayment.objects.create(user=self.user, tenant=self.tenant, year=2025, rent_month=1)
+        stale.full_name = 'John Q. Doe'
+        stale.save()
+        self.assertEqual(self.balance(), Decimal('1000.00'))
+
+    def test_rent_run_charges_balances(self):
+        RentPayment.create_rent_run(self.user, 2025, 2)
+        self.assertEqual(self.balance(), Decimal('1000.00'))
+        self.assertEqual(self.tenant.ledger_entries.get().entry_type, TenantLedgerEntry.CHARGE)
+
+    def test_reconcile_command_repairs_drift(self):
+        RentPayment.objects.create(user=self.user, tenant=self.tenant, year=2025, rent_month=1)
+        Tenant.objects.filter(pk=self.tenant.pk).update(balance=Decimal('5.00'))
+
+        version = get_cache_version(self.user.id, 'tenants')
+        out = StringIO()
+        call_command('reconcile_balances', stdout=out)
+        self.assertIn('1 had drifted', out.getvalue())
+        self.assertEqual(self.balance(), Decimal('1000.00'))
+        self.assertGreater(get_cache_version(self.user.id, 'tenants'), version)
+
+    def test_save_without_amount_change_skips_ledger(self):
+        payment = RentPayment.objects.create(user=self.user, tenant=self.tenant, year=2025, rent_month=1)
+        stale = RentPayment.objects.get(pk=payment.pk)
+        payment.amount_paid = Decimal('300.00')
+        payment.save()
+
+        # only the method changed: savepoint, UPDATE, release; no lookups, no lock, no posting,
+        # and the stale amount is not written back
+        stale.payment_method = 'mobile_money'
+        with self.assertNumQueries(3):
+            stale.save()
+        self.assertEqual(RentPayment.objects.get(pk=payment.pk).amount_paid, Decimal('300.00'))
+        self.assertEqual(self.balance(), Decimal('700.00'))
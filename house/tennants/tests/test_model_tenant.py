@@ -3,7 +3,10 @@ from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 from django.db.models import Sum
 from django.core.cache import cache
-from tennants.models import FlatBuilding, House, Tenant, RentPayment
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from unittest import mock
+from tennants.models import FlatBuilding, House, Tenant, RentPayment, HOUSE_OCCUPIED_MESSAGE
 
 
 class TenantModelTest(TestCase):
@@ -94,6 +97,103 @@ class TenantModelTest(TestCase):
         with self.assertRaises(ValidationError):
             tenant2.full_clean()
 
+    def test_active_tenant_constraint_maps_to_validation_error(self):
+        """Test that the database constraint surfaces as the validation message"""
+        tenant2 = Tenant(
+            user=self.user,
+            full_name="Jane Doe",
+            email="jane@example.com",
+            phone="+254712345679",
+            house=self.house,
+            id_number="87654321"
+        )
+        with self.assertRaisesMessage(ValidationError, HOUSE_OCCUPIED_MESSAGE):
+            tenant2.full_clean()
+        with self.assertRaisesMessage(ValidationError, HOUSE_OCCUPIED_MESSAGE):
+            tenant2.save()
+        self.assertIsNone(tenant2.pk)
+
+        # former tenants may keep pointing at the house
+        tenant2.is_active = False
+        tenant2.save()
+        self.assertIsNotNone(tenant2.pk)
+
+    def test_active_tenant_checked_without_partial_indexes(self):
+        """Test that backends without partial indexes (MySQL) check occupancy before writing"""
+        tenant2 = Tenant(
+            user=self.user,
+            full_name="Jane Doe",
+            email="jane@example.com",
+            phone="+254712345679",
+            house=self.house,
+            id_number="87654321"
+        )
+        with mock.patch.object(connection.features, 'supports_partial_indexes', False):
+            with CaptureQueriesContext(connection) as queries:
+                with self.assertRaisesMessage(ValidationError, HOUSE_OCCUPIED_MESSAGE):
+                    tenant2.save()
+            self.assertFalse(any(query['sql'].startswith('INSERT') for query in queries))
+
+            tenant2.is_active = False
+            tenant2.save()
+            self.assertIsNotNone(tenant2.pk)
+
+    def test_active_tenant_constraint_message_in_admin(self):
+        """Test that the admin form reports the same occupied-house message"""
+        admin = User.objects.create_superuser(username='admin', password='testpass123')
+        self.client.force_login(admin)
+        response = self.client.post('/admin/tennants/tenant/add/', {
+            'full_name': 'Jane Doe', 'email': 'jane@example.com', 'phone': '+254712345679',
+            'id_number': '87654321', 'house': self.house.pk, 'rent_due_date': '2025-01-01',
+            'is_active': 'on',
+        })
+        self.assertContains(response, HOUSE_OCCUPIED_MESSAGE)
+        self.assertFalse(Tenant.objects.filter(email='jane@example.com').exists())
+
+    def test_save_skips_work_for_unchanged_fields(self):
+        """Test that saving a tenant only checks and invalidates what changed"""
+        tenant = Tenant.objects.get(pk=self.tenant.pk)
+        tenant.full_name = "John Q. Doe"
+        # savepoint, UPDATE, release: unchanged unique columns and house are not re-checked
+        with self.assertNumQueries(3):
+            tenant.save()
+
+        tenant.email = "john.q@example.com"
+        with self.assertNumQueries(4):
+            tenant.save()
+
+    def test_refresh_from_db_resets_tracked_values(self):
+        """Test that a refreshed tenant is counted by what the database now holds"""
+        tenant = Tenant.objects.get(pk=self.tenant.pk)
+        other = Tenant.objects.get(pk=self.tenant.pk)
+        other.is_active = False
+        other.save()
+
+        tenant.refresh_from_db()
+        tenant.full_name = "John Q. Doe"
+        tenant.save()
+        self.flat_building.refresh_from_db()
+        self.assertEqual(self.flat_building.active_tenant_count, 0)
+
+        tenant.refresh_from_db(fields=['is_active'])
+        self.assertFalse(tenant.has_changed('is_active'))
+
+    def test_moving_tenant_frees_previous_house(self):
+        """Test that a move updates both houses without re-querying tenants"""
+        other_house = House.objects.create(
+            user=self.user, flat_building=self.flat_building, house_number="102"
+        )
+        tenant = Tenant.objects.get(pk=self.tenant.pk)
+        tenant.house = other_house
+        tenant.save()
+
+        self.house.refresh_from_db()
+        other_house.refresh_from_db()
+        self.assertFalse(self.house.occupation)
+        self.assertTrue(other_house.occupation)
+        self.flat_building.refresh_from_db()
+        self.assertEqual(self.flat_building.how_many_occupied, 1)
+
     def test_update_balance_method(self):
         """Test update_balance method"""
         # Create rent payments
@@ -243,11 +343,12 @@ class TenantModelTest(TestCase):
         test_house.refresh_from_db()
         self.assertFalse(test_house.occupation)
 
-    def test_building_cache_invalidation_on_tenant_operations(self):
-        """Test that building cache is invalidated on tenant operations"""
-        # Set building cache
-        cache.set(f"flat_{self.flat_building.pk}_occupied", 0, timeout=60)
-        cache.set(f"flat_{self.flat_building.pk}_vacant", 5, timeout=60)
+    def test_building_counters_on_tenant_operations(self):
+        """Test that building counters follow tenant activation and removal"""
+        self.flat_building.refresh_from_db()
+        self.assertEqual(self.flat_building.how_many_occupied, 1)
+        self.assertEqual(self.flat_building.tenant_count(), 1)
+
         # create a new house in the building
         new_house = House.objects.create(
             user=self.user,
@@ -255,7 +356,6 @@ class TenantModelTest(TestCase):
             house_number="104",
             house_rent_amount=1400
         )
-        # Create tenant - this should trigger house save which clears building cache
         new_tenant = Tenant.objects.create(
             user=self.user,
             full_name="Cache Test Tenant",
@@ -265,10 +365,20 @@ class TenantModelTest(TestCase):
             is_active=True,
             id_number="1122334455"
         )
-        
-        # Building cache should be cleared via house signals
-        self.assertIsNone(cache.get(f"flat_{self.flat_building.pk}_occupied"))
-        self.assertIsNone(cache.get(f"flat_{self.flat_building.pk}_vacant"))
+        self.flat_building.refresh_from_db()
+        self.assertEqual(self.flat_building.how_many_occupied, 2)
+        self.assertEqual(self.flat_building.tenant_count(), 2)
+
+        new_tenant.is_active = False
+        new_tenant.save()
+        self.flat_building.refresh_from_db()
+        self.assertEqual(self.flat_building.how_many_occupied, 1)
+        self.assertEqual(self.flat_building.tenant_count(), 1)
+
+        self.tenant.delete()
+        self.flat_building.refresh_from_db()
+        self.assertEqual(self.flat_building.how_many_occupied, 0)
+        self.assertEqual(self.flat_building.tenant_count(), 0)
 
     def test_string_representation(self):
         """Test string representation of Tenant"""
@@ -0,0 +1,72 @@
+from decimal import Decimal
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient, APITestCase
+from tennants.models import FlatBuilding, House, Tenant, RentPayment
+
+
+class CursorPaginationTests(APITestCase):
+    url = '/api/rentpayments/'
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='owner', password='testpass123')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        building = FlatBuilding.objects.create(
+            user=self.user, building_name='Block A', address='Street 1', number_of_houses=5
+        )
+        house = House.objects.create(
+            user=self.user, flat_building=building, house_number='1', house_rent_amount=Decimal('1000.00')
+        )
+        self.tenant = Tenant.objects.create(
+            user=self.user, full_name='John Doe', email='john@example.com',
+            phone='+254712345678', id_number='123', house=house
+        )
+        for i in range(25):
+            RentPayment.objects.create(
+                user=self.user, tenant=self.tenant, year=2020 + i // 12, rent_month=i % 12 + 1,
+                amount_paid=Decimal('1000.00'), is_paid=True
+            )
+
+    def tearDown(self):
+        cache.clear()
+
+    def fetch(self, url, params=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response, [query['sql'].upper() for query in queries]
+
+    def test_page_numbers_remain_the_default(self):
+        response, _ = self.fetch(self.url)
+        self.assertEqual(response.json()['count'], 25)
+        self.assertEqual(len(response.json()['results']), 10)
+
+    def test_cursor_pages_walk_the_table_without_count_or_offset(self):
+        response, first_queries = self.fetch(self.url, {'cursor': ''})
+        self.assertNotIn('count', response.json())
+        seen = [row['id'] for row in response.json()['results']]
+
+        page_queries = []
+        while response.json()['next']:
+            response, queries = self.fetch(response.json()['next'])
+            page_queries.append(queries)
+            seen += [row['id'] for row in response.json()['results']]
+
+        self.assertEqual(seen, list(RentPayment.objects.order_by('id').values_list('id', flat=True)))
+        for queries in [first_queries] + page_queries:
+            self.assertFalse(any('COUNT(' in sql or 'OFFSET' in sql for sql in queries))
+        self.assertEqual(len(page_queries[-1]), len(first_queries))
+
+    def test_counts_are_cached_until_a_write(self):
+        response = self.client.get('/api/counts/')
+        self.assertEqual(response.json(), {'tenants': 1, 'houses': 1, 'flats': 1, 'rent_payments': 25})
+
+        with self.assertNumQueries(0):
+            self.client.get('/api/counts/')
+
+        RentPayment.objects.create(user=self.user, tenant=self.tenant, year=2030, rent_month=1, is_paid=True)
+        self.assertEqual(self.client.get('/api/counts/').json()['rent_payments'], 26)
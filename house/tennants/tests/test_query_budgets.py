@@ -0,0 +1,121 @@
+from decimal import Decimal
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from tennants.middleware import collect_metrics
+from tennants.models import FlatBuilding, House, Tenant, RentPayment
+from tennants.tests.budgets import RequestBudgetMixin
+
+
+class QueryBudgetTests(RequestBudgetMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_superuser(username='owner', password='testpass123')
+        self.building = FlatBuilding.objects.create(
+            user=self.user, building_name='Block A', address='Street 1', number_of_houses=200
+        )
+        self.rows = 0
+        self.add_rows(2)
+
+    def tearDown(self):
+        cache.clear()
+
+    def add_rows(self, count=3):
+        for i in range(self.rows, self.rows + count):
+            house = House.objects.create(
+                user=self.user, flat_building=self.building, house_number=str(i + 1),
+                house_rent_amount=Decimal('1000.00')
+            )
+            tenant = Tenant.objects.create(
+                user=self.user, full_name=f'Tenant {i}', email=f't{i}@example.com',
+                phone=f'+2547123456{i:02d}', id_number=str(100 + i), house=house
+            )
+            RentPayment.objects.create(
+                user=self.user, tenant=tenant, year=2025, rent_month=1,
+                amount_paid=Decimal('1000.00'), is_paid=True
+            )
+            RentPayment.objects.create(user=self.user, tenant=tenant, year=2025, rent_month=2)
+        self.rows += count
+        cache.clear()
+
+    def test_api_lists(self):
+        # COUNT + page; force_authenticate skips the JWT user lookup a real client pays for
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        for url in ['/api/tennants/', '/api/houses/', '/api/flats/', '/api/rentpayments/']:
+            with self.subTest(url=url):
+                self.assertBudgetHolds(self.add_rows, url, queries=3, cache_misses=2)
+
+    def test_web_pages(self):
+        # session and user lookups are included in every budget
+        self.client.force_login(self.user)
+        tenant = Tenant.objects.first()
+        budgets = {
+            '/dashboard/': 10,
+            '/buildings/': 6,
+            f'/buildings/{self.building.pk}/': 7,
+            '/houses/': 7,
+            '/tenants/': 6,
+            f'/tenants/{tenant.pk}/': 11,
+            '/payments/': 6,
+            '/payments/overdue/': 7,
+        }
+        for url, queries in budgets.items():
+            with self.subTest(url=url):
+                self.assertBudgetHolds(self.add_rows, url, queries=queries)
+
+    def test_admin_changelists(self):
+        self.client.force_login(self.user)
+        for model in ['tenant', 'house', 'flatbuilding', 'rentpayment', 'paymenthistory', 'tenantledgerentry',
+                      'tenantarrears', 'rentreminder', 'buildingcollection']:
+            url = f'/admin/tennants/{model}/'
+            with self.subTest(url=url):
+                self.assertBudgetHolds(self.add_rows, url, queries=9)
+
+    @override_settings(REQUEST_METRICS_HEADERS=True)
+    def test_metrics_headers(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get('/api/flats/')
+        self.assertEqual(response['X-Query-Count'], '2')
+        # the version counter and the page
+        self.assertEqual(response['X-Cache-Sets'], '2')
+        self.assertIn('SELECT', response['X-Slowest-Query'])
+
+        response = self.client.get('/api/flats/')
+        self.assertEqual(response['X-Query-Count'], '0')
+        self.assertEqual(response['X-Cache-Misses'], '0')
+
+    def test_metrics_logged_without_headers(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        with self.assertLogs('tennants.metrics', level='INFO') as logs:
+            response = self.client.get('/api/flats/')
+        self.assertNotIn('X-Query-Count', response)
+        self.assertIn('"path": "/api/flats/"', logs.output[0])
+
+    def test_statements_only_kept_on_request(self):
+        with collect_metrics(keep_statements=False) as metrics:
+            list(FlatBuilding.objects.all())
+        self.assertEqual(metrics.queries, 1)
+        self.assertIsNone(metrics.statements)
+
+        # RequestBudgetMixin turns REQUEST_METRICS_KEEP_STATEMENTS on for the budget messages
+        self.client.force_login(self.user)
+        metrics = self.client.get('/admin/tennants/house/').request_metrics
+        self.assertGreater(metrics.queries, 0)
+        self.assertEqual(len(metrics.statements), metrics.queries)
+
+        with self.settings(REQUEST_METRICS_KEEP_STATEMENTS=False):
+            self.assertIsNone(self.client.get('/admin/tennants/house/').request_metrics.statements)
+
+    def test_cache_instrumentation_is_scoped_to_the_block(self):
+        backend_class = type(caches['default'])
+        original = backend_class.get
+        with collect_metrics() as metrics:
+            cache.get('missing')
+            self.assertIn('get', vars(caches['default']))
+        self.assertEqual(metrics.cache_misses, 1)
+        self.assertNotIn('get', vars(caches['default']))
+        self.assertIs(backend_class.get, original)
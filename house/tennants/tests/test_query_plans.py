@@ -0,0 +1,47 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+from tennants.models import House, Tenant, RentPayment, TenantLedgerEntry, TenantArrears
+from tennants.synthetic import Scale, SyntheticDataGenerator, SYNTHETIC_USERNAME
+from tennants.tests.plans import QueryPlanMixin, analyze
+from tennants.views import TenantListView, HouseListView, RentPaymentListView
+
+
+class QueryPlanTests(QueryPlanMixin, TestCase):
+    """ The hot queries must stay on an index, without a sort step, on a multi-landlord dataset. """
+
+    @classmethod
+    def setUpTestData(cls):
+        SyntheticDataGenerator(Scale(users=4, buildings=3, houses=10, years=1)).run()
+        analyze()
+        cls.user = User.objects.filter(username__startswith=SYNTHETIC_USERNAME).order_by('pk').first()
+        cls.tenant = Tenant.objects.filter(user=cls.user, is_active=True).order_by('pk').first()
+
+    def view_queryset(self, view_class):
+        request = APIRequestFactory().get('/')
+        force_authenticate(request, user=self.user)
+        view = view_class()
+        view.setup(request)
+        view.request = view.initialize_request(request)
+        # first page, as the paginators slice it
+        return view.get_queryset()[:10]
+
+    def hot_queries(self):
+        user = self.user
+        return {
+            'tenant list': self.view_queryset(TenantListView),
+            'active tenant list': Tenant.objects.filter(user=user, is_active=True).order_by('id')[:10],
+            'house list': self.view_queryset(HouseListView),
+            'vacant houses': House.objects.filter(user=user, occupation=False).order_by('id'),
+            'occupied houses': House.objects.filter(user=user, occupation=True),
+            'paid rent payment list': self.view_queryset(RentPaymentListView),
+            'recent payments': RentPayment.objects.filter(user=user).order_by('-payment_date')[:5],
+            'overdue payments of a tenant': RentPayment.objects.filter(tenant=self.tenant, is_paid=False),
+            'ledger of a tenant': TenantLedgerEntry.objects.filter(tenant=self.tenant),
+            'arrears list': TenantArrears.objects.filter(user=user).order_by('-total')[:50],
+        }
+
+    def test_hot_queries_use_indexes(self):
+        for name, queryset in self.hot_queries().items():
+            with self.subTest(name):
+                self.assertIndexed(queryset, name)
@@ -0,0 +1,101 @@
+import json
+import os
+import tempfile
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from tennants.models import FlatBuilding, House, Tenant, RentPayment, RentReminder
+from tennants.reminders import BaseReminderBackend, FileReminderBackend, send_rent_reminders
+
+TODAY = date(2025, 6, 10)
+
+
+class FailingBackend(BaseReminderBackend):
+    async def send(self, reminder):
+        if reminder.full_name == 'Tenant 0':
+            raise ConnectionError('gateway down')
+
+
+class RentReminderTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='owner', password='testpass123')
+        building = FlatBuilding.objects.create(
+            user=self.user, building_name='Block A', address='Street 1', number_of_houses=10
+        )
+        self.tenants = []
+        for i in range(4):
+            house = House.objects.create(
+                user=self.user, flat_building=building, house_number=str(i + 1),
+                house_rent_amount=Decimal('1000.00')
+            )
+            self.tenants.append(Tenant.objects.create(
+                user=self.user, full_name=f'Tenant {i}', email=f't{i}@example.com',
+                phone=f'+25471234560{i}', id_number=str(100 + i), house=house,
+                rent_due_date=date(2025, 6, 12) if i < 3 else date(2025, 6, 28),
+            ))
+        # overdue: May is unpaid
+        RentPayment.objects.create(
+            user=self.user, tenant=self.tenants[0], year=2025, rent_month=5, amount_paid=Decimal('400.00')
+        )
+        # due in two days, but June is already paid
+        RentPayment.objects.create(
+            user=self.user, tenant=self.tenants[1], year=2025, rent_month=6, amount_paid=Decimal('1000.00')
+        )
+        # tenants[2] is due in two days; tenants[3] is not due yet
+        handle, self.path = tempfile.mkstemp(suffix='.jsonl')
+        os.close(handle)
+
+    def tearDown(self):
+        cache.clear()
+        os.remove(self.path)
+
+    def sent_lines(self):
+        with open(self.path) as handle:
+            return [json.loads(line) for line in handle]
+
+    def test_sends_due_and_overdue_reminders_once_per_cycle(self):
+        backend = FileReminderBackend(path=self.path)
+        self.assertEqual(send_rent_reminders(backend, today=TODAY), (2, 2))
+
+        lines = sorted(self.sent_lines(), key=lambda line: line['tenant_id'])
+        self.assertEqual(
+            [(line['tenant_id'], line['kind'], line['amount_due']) for line in lines],
+            [(self.tenants[0].pk, 'overdue', '600.00'), (self.tenants[2].pk, 'due', '1000.00')]
+        )
+        self.assertEqual(
+            set(RentReminder.objects.values_list('tenant_id', 'cycle')),
+            {(self.tenants[0].pk, date(2025, 6, 1)), (self.tenants[2].pk, date(2025, 6, 1))}
+        )
+
+        # a rerun in the same month finds nobody; in July every due date has passed and July is unpaid
+        self.assertEqual(send_rent_reminders(backend, today=date(2025, 6, 11)), (0, 0))
+        self.assertEqual(send_rent_reminders(backend, today=date(2025, 7, 1), dry_run=True)[0], 4)
+
+    def test_failed_sends_are_not_recorded(self):
+        with self.assertLogs('tennants.reminders', 'ERROR'):
+            self.assertEqual(send_rent_reminders(FailingBackend(), today=TODAY), (2, 1))
+        self.assertEqual(list(RentReminder.objects.values_list('tenant_id', flat=True)), [self.tenants[2].pk])
+
+    def test_selection_is_one_query_per_batch(self):
+        # two batches of one plus the empty page, each followed by one bulk insert
+        backend = FileReminderBackend(path=self.path)
+        with self.assertNumQueries(5):
+            send_rent_reminders(backend, today=TODAY, batch_size=1)
+
+        with self.assertNumQueries(1):
+            send_rent_reminders(backend, today=TODAY, batch_size=1)
+
+    def test_management_command(self):
+        out = StringIO()
+        call_command('send_rent_reminders', '--dry-run', '--days-ahead=30', stdout=out)
+        self.assertIn('tenants would be reminded', out.getvalue())
+        self.assertFalse(RentReminder.objects.exists())
+
+        out = StringIO()
+        call_command('send_rent_reminders', '--backend=tennants.reminders.ConsoleReminderBackend', stdout=out)
+        self.assertIn('rent reminders', out.getvalue())
@@ -0,0 +1,57 @@
+import io
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from uuid import UUID
+from django.test import SimpleTestCase
+from phonenumber_field.phonenumber import PhoneNumber
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+from tennants.parsers import ORJSONParser
+from tennants.renderers import ORJSONRenderer
+
+PAYLOAD = {
+    'count': 2,
+    'next': None,
+    'results': ReturnList([
+        ReturnDict({
+            'id': 1, 'full_name': 'Wanjiru Kamau   Njeri', 'balance': Decimal('1500.50'),
+            'house_rent_amount': '12000.00', 'is_active': True, 'rent_due_date': date(2025, 6, 5),
+            'created_at': datetime(2025, 6, 1, 8, 30, 15, 123456, tzinfo=timezone.utc),
+            'reminder_time': time(9, 0, 0, 500000), 'grace': timedelta(days=3),
+            'key': UUID('12345678-1234-5678-1234-567812345678'), 'ratio': 0.85,
+        }, serializer=None),
+    ], serializer=None),
+    'totals': {2025: Decimal('0.10'), 'unicode': 'Ksh 1,000 — ok\u2028next'},
+}
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    def test_matches_stdlib_renderer(self):
+        self.assertEqual(ORJSONRenderer().render(PAYLOAD), JSONRenderer().render(PAYLOAD))
+
+    def test_phone_numbers_render_as_strings(self):
+        rendered = ORJSONRenderer().render({'phone': PhoneNumber.from_string('+254712345678')})
+        self.assertEqual(rendered, b'{"phone":"+254712345678"}')
+
+    def test_indent_falls_back_to_stdlib(self):
+        media_type = 'application/json; indent=2'
+        self.assertEqual(ORJSONRenderer().render(PAYLOAD, media_type), JSONRenderer().render(PAYLOAD, media_type))
+
+    def test_none_renders_empty(self):
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+
+class ORJSONParserTests(SimpleTestCase):
+    def parse(self, parser, body):
+        return parser.parse(io.BytesIO(body), 'application/json', {})
+
+    def test_matches_stdlib_parser(self):
+        body = JSONRenderer().render({'rows': [{'amount_paid': 1500.5, 'name': 'Jürgen'}], 'ok': True})
+        self.assertEqual(self.parse(ORJSONParser(), body), self.parse(JSONParser(), body))
+
+    def test_rejects_invalid_json_and_nan(self):
+        for body in (b'{"a": ', b'[NaN]'):
+            with self.assertRaises(ParseError):
+                self.parse(ORJSONParser(), body)
@@ -0,0 +1,92 @@
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+from tennants.models import FlatBuilding, House, Tenant, RentPayment
+
+
+class RentRunTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='owner', password='testpass123')
+        self.building = FlatBuilding.objects.create(
+            user=self.user, building_name='Block A', address='Street 1', number_of_houses=10
+        )
+        self.tenants = []
+        for i in range(3):
+            house = House.objects.create(
+                user=self.user, flat_building=self.building, house_number=str(i + 1),
+                house_rent_amount=Decimal('1000.00') * (i + 1)
+            )
+            self.tenants.append(Tenant.objects.create(
+                user=self.user, full_name=f'Tenant {i}', email=f't{i}@example.com',
+                phone=f'+25471234560{i}', id_number=str(100 + i), house=house
+            ))
+        # neither of these is billed
+        self.tenants[2].is_active = False
+        self.tenants[2].save()
+        Tenant.objects.create(
+            user=self.user, full_name='Homeless', email='h@example.com',
+            phone='+254712345699', id_number='999'
+        )
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_creates_invoices_with_house_rent(self):
+        # select + insert invoices, select + insert charges, one balance UPDATE, then
+        # delete + select + insert of the arrears and of the building collection rows,
+        # each in a nested savepoint, all inside a savepoint
+        with self.assertNumQueries(17):
+            created = RentPayment.create_rent_run(self.user, 2025, 3)
+        self.assertEqual(created, 2)
+
+        invoices = RentPayment.objects.filter(year=2025, rent_month=3).order_by('rent_amount')
+        self.assertEqual(
+            [(p.tenant_id, p.rent_amount, p.is_paid) for p in invoices],
+            [(self.tenants[0].pk, Decimal('1000.00'), False), (self.tenants[1].pk, Decimal('2000.00'), False)]
+        )
+
+    def test_rerun_is_idempotent(self):
+        RentPayment.objects.create(user=self.user, tenant=self.tenants[0], year=2025, rent_month=3, amount_paid=1000)
+        self.assertEqual(RentPayment.create_rent_run(self.user, 2025, 3), 1)
+        self.assertEqual(RentPayment.create_rent_run(self.user, 2025, 3), 0)
+        self.assertEqual(RentPayment.objects.filter(year=2025, rent_month=3).count(), 2)
+
+    def test_counts_only_the_invoices_it_inserted(self):
+        bulk_create = RentPayment.objects.bulk_create
+
+        def concurrent_run_first(invoices, **kwargs):
+            # another run bills the second tenant between our read and our insert
+            RentPayment.objects.create(user=self.user, tenant=self.tenants[1], year=2025, rent_month=3)
+            return bulk_create(invoices, **kwargs)
+
+        with mock.patch.object(RentPayment.objects, 'bulk_create', side_effect=concurrent_run_first):
+            self.assertEqual(RentPayment.create_rent_run(self.user, 2025, 3), 1)
+        self.assertEqual(RentPayment.objects.filter(year=2025, rent_month=3).count(), 2)
+        self.tenants[1].refresh_from_db()
+        self.assertEqual(self.tenants[1].balance, Decimal('2000.00'))
+
+    def test_management_command(self):
+        out = StringIO()
+        call_command('generate_rent_run', year=2025, month=4, stdout=out)
+        self.assertIn('Created 2 rent invoices', out.getvalue())
+
+    def test_api_action(self):
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        response = client.post('/api/rentpayments/rent-run/', {'year': 2025, 'rent_month': 5}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 2)
+
+        response = client.post('/api/rentpayments/rent-run/', {'year': 2025, 'rent_month': 5}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['created'], 0)
+
+        response = client.post('/api/rentpayments/rent-run/', {'year': 2025, 'rent_month': 13}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
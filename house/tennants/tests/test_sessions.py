@@ -0,0 +1,94 @@
+from unittest import mock
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from tennants.sessions import SessionStore
+
+
+class CacheSessionTests(TestCase):
+    def setUp(self):
+        caches['sessions'].clear()
+
+    def tearDown(self):
+        caches['sessions'].clear()
+
+    def stored(self, data):
+        session = SessionStore()
+        session.update(data)
+        session.save()
+        return SessionStore(session.session_key)
+
+    def test_unchanged_session_is_touched_not_rewritten(self):
+        session = self.stored({'user': 1})
+        self.assertEqual(session['user'], 1)
+        with mock.patch.object(session._cache, 'set') as cache_set, \
+                mock.patch.object(session._cache, 'touch', wraps=session._cache.touch) as touch:
+            session.save()
+        cache_set.assert_not_called()
+        touch.assert_called_once_with(session.cache_key, 300)
+
+    def test_changed_session_is_written(self):
+        session = self.stored({'user': 1})
+        session['user'] = 2
+        session.save()
+        self.assertEqual(SessionStore(session.session_key)['user'], 2)
+
+    def test_expired_session_is_not_revived(self):
+        session = self.stored({'user': 1})
+        key = session.session_key
+        session._cache.delete(session.cache_key)
+        session.save()
+        self.assertFalse(SessionStore().exists(key))
+
+    def test_pages_do_not_write_sessions_to_the_database(self):
+        user = User.objects.create_user(username='owner', password='testpass123')
+        self.client.force_login(user)
+        self.assertFalse(Session.objects.exists())
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(3):
+                self.assertEqual(self.client.get('/dashboard/').status_code, 200)
+        self.assertFalse([query for query in queries if 'django_session' in query['sql']])
+        self.assertIn('sessionid', self.client.cookies)
+
+    def test_inactive_session_logs_out(self):
+        user = User.objects.create_user(username='owner', password='testpass123')
+        self.client.force_login(user)
+        session = SessionStore(self.client.cookies['sessionid'].value)
+        session._cache.delete(session.cache_key)
+        response = self.client.get('/dashboard/')
+        self.assertEqual(response.status_code, 302)
+
+
+class SessionFallbackTests(TestCase):
+    def setUp(self):
+        self.down = mock.patch.multiple(
+            caches['sessions'], get=mock.DEFAULT, add=mock.DEFAULT, set=mock.DEFAULT, touch=mock.DEFAULT,
+            has_key=mock.DEFAULT, delete=mock.DEFAULT,
+        )
+
+    def fail_all(self, mocks):
+        for method in mocks.values():
+            method.side_effect = ConnectionError('cache down')
+
+    @override_settings(SESSION_DB_FALLBACK=True)
+    def test_database_serves_sessions_while_cache_is_down(self):
+        with self.down as mocks, self.assertLogs('tennants.sessions', 'WARNING'):
+            self.fail_all(mocks)
+            session = SessionStore()
+            session['user'] = 1
+            session.save()
+            self.assertTrue(Session.objects.filter(session_key=session.session_key).exists())
+            self.assertEqual(SessionStore(session.session_key)['user'], 1)
+            session.delete()
+        self.assertFalse(Session.objects.exists())
+
+    def test_cache_errors_raise_without_fallback(self):
+        with self.down as mocks:
+            self.fail_all(mocks)
+            session = SessionStore()
+            session['user'] = 1
+            with self.assertRaises(ConnectionError):
+                session.save()
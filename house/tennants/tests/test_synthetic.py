@@ -0,0 +1,74 @@
+import json
+import os
+import tempfile
+from datetime import date
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Sum
+from django.contrib.auth.models import User
+from django.test import TestCase
+from tennants.models import FlatBuilding, House, Tenant, RentPayment, TenantArrears, BuildingCollection
+from tennants.synthetic import Scale, SyntheticDataGenerator
+
+
+class SyntheticDataTests(TestCase):
+    def generate(self, **scale):
+        return SyntheticDataGenerator(Scale(**scale), today=date(2025, 6, 10)).run()
+
+    def test_generates_consistent_dataset(self):
+        counts = self.generate(users=2, buildings=2, houses=5, tenants=20, occupancy=0.8, years=1)
+        self.assertEqual(counts, {'users': 2, 'buildings': 4, 'houses': 20, 'tenants': 20, 'rent_payments': 192})
+
+        self.assertEqual(Tenant.objects.filter(is_active=True).count(), 16)
+        self.assertEqual(House.objects.filter(occupation=True).count(), 16)
+        self.assertEqual(FlatBuilding.objects.aggregate(total=Sum('active_tenant_count'))['total'], 16)
+        self.assertEqual(RentPayment.objects.order_by('year', 'rent_month').values_list(
+            'year', 'rent_month').first(), (2024, 7))
+
+        owed = sum(payment.balance for payment in RentPayment.objects.all())
+        self.assertEqual(Tenant.objects.aggregate(total=Sum('balance'))['total'], owed)
+        self.assertEqual(TenantArrears.objects.aggregate(total=Sum('total'))['total'], owed)
+        self.assertEqual(
+            BuildingCollection.objects.aggregate(total=Sum('expected_rent'))['total'],
+            RentPayment.objects.aggregate(total=Sum('rent_amount'))['total'],
+        )
+
+    def test_reads_back_pks_without_returning_bulk_insert(self):
+        with mock.patch.object(type(connection.features), 'can_return_rows_from_bulk_insert', False):
+            counts = self.generate(users=2, buildings=2, houses=3, occupancy=1, years=1, batch_size=4)
+        self.assertEqual(counts['tenants'], 12)
+        self.assertEqual(RentPayment.objects.values('tenant').distinct().count(), 12)
+        self.assertEqual(
+            set(Tenant.objects.values_list('house__flat_building__user__username', 'user__username')),
+            {('synthetic0', 'synthetic0'), ('synthetic1', 'synthetic1')},
+        )
+        self.assertEqual(FlatBuilding.objects.aggregate(total=Sum('active_tenant_count'))['total'], 12)
+
+    def test_same_seed_same_data(self):
+        self.generate(seed=7)
+        first = list(RentPayment.objects.order_by('pk').values_list('rent_amount', 'amount_paid', 'payment_method'))
+        self.generate(seed=7)
+        second = list(RentPayment.objects.order_by('pk').values_list('rent_amount', 'amount_paid', 'payment_method'))
+        self.assertEqual(first, second[len(first):])
+        self.assertEqual(User.objects.filter(username__startswith='synthetic').count(), 2)
+
+    def test_management_command(self):
+        out = StringIO()
+        call_command('populate_dummy_data', '--houses=3', '--occupancy=1', stdout=out)
+        self.assertIn('Created 1 users, 2 buildings, 6 houses, 6 tenants, 72 rent payments', out.getvalue())
+
+    def test_seed_load_test_writes_working_credentials(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'load_users.json')
+            call_command('seed_load_test', '--large=0', '--small=2', f'--output={path}', stdout=StringIO())
+            with open(path) as handle:
+                accounts = json.load(handle)
+
+        self.assertEqual([account['persona'] for account in accounts], ['small_landlord'] * 2)
+        self.assertEqual(len({account['username'] for account in accounts}), 2)
+        response = self.client.post('/api/token/', {
+            'username': accounts[0]['username'], 'password': accounts[0]['password'],
+        })
+        self.assertEqual(response.status_code, 200)
@@ -66,22 +66,22 @@ class BaseTestCase(APITestCase):
         
         # User 1 should only see their building
         response = self.client1.get('/api/flats/')
-        print(response.data)
+        print(response.json())
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        print(response.data)
-        self.assertEqual(response.data['count'], 1)
-        self.assertEqual(len(response.data['results']), 1)
-        self.assertEqual(response.data['results'][0]['building_name'], 'User1 Building')
+        print(response.json())
+        self.assertEqual(response.json()['count'], 1)
+        self.assertEqual(len(response.json()['results']), 1)
+        self.assertEqual(response.json()['results'][0]['building_name'], 'User1 Building')
 
         cache.clear()
 
         # User 2 should only see their building
         response = self.client2.get('/api/flats/')
-        print(response.data)
+        print(response.json())
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data['count'], 1)
-        self.assertEqual(len(response.data['results']), 1)
-        self.assertEqual(response.data['results'][0]['building_name'], 'User2 Building')
+        self.assertEqual(response.json()['count'], 1)
+        self.assertEqual(len(response.json()['results']), 1)
+        self.assertEqual(response.json()['results'][0]['building_name'], 'User2 Building')
    
     def base_test_filter_by_name(self):
         """Test filtering flat buildings by name"""
@@ -100,9 +100,9 @@ class BaseTestCase(APITestCase):
         
         cache.clear()
         response = self.client1.get('/api/flats/?name=Sunrise')
-        self.assertEqual(response.data['count'], 1)
-        self.assertEqual(len(response.data['results']), 1)
-        self.assertIn('Sunrise', response.data['results'][0]['building_name'])
+        self.assertEqual(response.json()['count'], 1)
+        self.assertEqual(len(response.json()['results']), 1)
+        self.assertIn('Sunrise', response.json()['results'][0]['building_name'])
     
     def test_cache_works_correctly(self):
         """Test that caching returns same data on repeated requests"""
@@ -121,7 +121,7 @@ class BaseTestCase(APITestCase):
         # Second request - should hit cache
         response2 = self.client1.get('/api/flats/')
         
-        self.assertEqual(response1.data, response2.data)
+        self.assertEqual(response1.json(), response2.json())
     
     def test_cannot_delete_with_existing_houses(self):
         """Test that flat buildings with houses cannot be deleted"""
@@ -241,9 +241,9 @@ class HouseViewTests(BaseTestCase):
         # User 1 should ONLY see their house
         response = self.client1.get('/api/houses/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data['count'], 1)
-        self.assertEqual(len(response.data['results']), 1)
-        self.assertEqual(response.data['results'][0]['house_number'], '101')
+        self.assertEqual(response.json()['count'], 1)
+        self.assertEqual(len(response.json()['results']), 1)
+        self.assertEqual(response.json()['results'][0]['house_number'], '101')
         
 
     def test_cannot_access_other_users_house_detail(self):
@@ -277,8 +277,8 @@ class HouseViewTests(BaseTestCase):
         
         cache.clear()
         response = self.client1.get(f'/api/houses/?flat_building_id={self.flat1.id}')
-        self.assertEqual(response.data['count'], 2)
-        self.assertEqual(len(response.data['results']), 2)
+        self.assertEqual(response.json()['count'], 2)
+        self.assertEqual(len(response.json()['results']), 2)
 
 
 class TenantViewTests(BaseTestCase):
@@ -374,9 +374,9 @@ class TenantViewTests(BaseTestCase):
         
         # Filter by active status
         response = self.client1.get('/api/tennants/?is_active=true')
-        self.assertEqual(response.data['count'], 1)
-        self.assertEqual(len(response.data['results']), 1)
-        self.assertEqual(response.data['results'][0]['full_name'], 'Active Tenant')
+        self.assertEqual(response.json()['count'], 1)
+        self.assertEqual(len(response.json()['results']), 1)
+        self.assertEqual(response.json()['results'][0]['full_name'], 'Active Tenant')
 
 class RentPaymentViewTests(BaseTestCase):
     """Tests for RentPayment views"""
@@ -446,9 +446,9 @@ class RentPaymentViewTests(BaseTestCase):
         cache.clear()
         response = self.client1.get('/api/rentpayments/')
         # Should only return paid payments
-        self.assertEqual(response.data['count'], 1)
-        self.assertEqual(len(response.data['results']), 1)
-        self.assertEqual(response.data['results'][0]['rent_month'], 1)
+        self.assertEqual(response.json()['count'], 1)
+        self.assertEqual(len(response.json()['results']), 1)
+        self.assertEqual(response.json()['results'][0]['rent_month'], 1)
 
 
 class PermissionTests(BaseTestCase):
@@ -475,7 +475,7 @@ class PermissionTests(BaseTestCase):
         
         # User 2 shouldn't see User 1's data
         response = self.client2.get('/api/flats/')
-        self.assertEqual(response.data['count'], 0)
+        self.assertEqual(response.json()['count'], 0)
 
 
 class AuthenticationTests(TestCase):
@@ -1,15 +1,14 @@
 from django.urls import path
-from .views import (TenantListView,HouseDetailView,TenantDetailView, 
+from .views import (TenantListView,HouseDetailView,TenantDetailView, TenantBulkCreateView,
                     FlatBuildingDetailView, user_login, AdminLogoutView, HouseListView,FlatBuildingListView, RentPaymentListView, 
-                    RegisterAdminView, RegisterUserView, OverduePaymentsView,
-                    BuildingListView, BuildingCreateView, BuildingDetailView, BuildingUpdateView, BuildingDeleteView,
-                    HouseCreateView, HouseListView , HouseUpdateView, HouseDeleteView, HouseDetailView, dashboard,
-                    TenantCreateView, TenantUpdateView, TenantDeleteView, TenantDetailView,
-                    PaymentListView, PaymentCreateView,
+                    RentPaymentDetailView, RegisterAdminView, RegisterUserView, RentRunView,
+                    RentPaymentExportView, TenantExportView, HouseExportView, ResourceCountView,
+                    ArrearsListView, ArrearsSummaryView, CollectionReportView,
 )
 
 urlpatterns = [
     path('tennants/', TenantListView.as_view(), name = 'tennant-list'),
+    path('tennants/bulk/', TenantBulkCreateView.as_view(), name='tennant-bulk'),
     path('tennants/<int:pk>/', TenantDetailView.as_view(),name ='tennants-list'),
 
     path("houses/", HouseListView.as_view(), name="house-list"),
@@ -21,41 +20,19 @@ urlpatterns = [
     path('flats/new/', FlatBuildingDetailView.as_view(), name='flat-update'),
     path('flats/<int:pk>/', FlatBuildingDetailView.as_view(), name='flat-detail'),
     path('rentpayments/', RentPaymentListView.as_view(), name='rent-payment-list'),
+    path('rentpayments/<int:pk>/', RentPaymentDetailView.as_view(), name='rent-payment-detail'),
+    path('rentpayments/rent-run/', RentRunView.as_view(), name='rent-run'),
     path('register/user/', RegisterUserView.as_view(), name='register-user'),
 
-    
-]
+    path('counts/', ResourceCountView.as_view(), name='resource-counts'),
 
+    path('arrears/', ArrearsListView.as_view(), name='arrears-list'),
+    path('arrears/summary/', ArrearsSummaryView.as_view(), name='arrears-summary'),
+    path('collections/', CollectionReportView.as_view(), name='collection-report'),
 
-urlpatterns = [
-    # ========================================
-    # WEB INTERFACE (Template-based)
-    # ========================================
-    path('', dashboard, name='dashboard'),
-    
-    # Buildings
-    path('buildings/', BuildingListView.as_view(), name='building_list'),
-    path('buildings/add/', BuildingCreateView.as_view(), name='building_add'),
-    path('buildings/<int:pk>/', BuildingDetailView.as_view(), name='building_detail'),
-    path('buildings/<int:pk>/edit/', BuildingUpdateView.as_view(), name='building_edit'),
-    path('buildings/<int:pk>/delete/', BuildingDeleteView.as_view(), name='building_delete'),
-    
-    # Houses
-    path('houses/', HouseListView.as_view(), name='house_list'),
-    path('houses/add/', HouseCreateView.as_view(), name='house_add'),
-    path('houses/<int:pk>/', HouseDetailView.as_view(), name='house_detail'),
-    path('houses/<int:pk>/edit/', HouseUpdateView.as_view(), name='house_edit'),
-    path('houses/<int:pk>/delete/', HouseDeleteView.as_view(), name='house_delete'),
-
-    # Tenants
-    path('tenants/', TenantListView.as_view(), name='tenant_list'),
-    path('tenants/add/', TenantCreateView.as_view(), name='tenant_add'),
-    path('tenants/<int:pk>/', TenantDetailView.as_view(), name='tenant_detail'),
-    path('tenants/<int:pk>/edit/', TenantUpdateView.as_view(), name='tenant_edit'),
-    path('tenants/<int:pk>/delete/', TenantDeleteView.as_view(), name='tenant_delete'), 
+    path('exports/rentpayments.<str:export_format>', RentPaymentExportView.as_view(), name='rent-payment-export'),
+    path('exports/tennants.<str:export_format>', TenantExportView.as_view(), name='tennant-export'),
+    path('exports/houses.<str:export_format>', HouseExportView.as_view(), name='house-export'),
 
-    # Payments
-    path('payments/', PaymentListView.as_view(), name='payment_list'),
-    path('payments/add/', PaymentCreateView.as_view(), name='payment_add'),
-    path('payments/overdue/', OverduePaymentsView.as_view(), name='overdue_payments'),
-]
\ No newline at end of file
+    
+]
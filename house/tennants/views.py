@@ -7,12 +7,14 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework import serializers, generics
 from rest_framework.filters import OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
-from .models import Tenant, House, RentPayment, FlatBuilding
+from .models import Tenant, House, RentPayment, FlatBuilding, TenantArrears, BuildingCollection
 from .serializers import (TenantSerializer, HouseSerializer, RentPaymentSerializer,
-                          FlatBuildingSerializer, RegisterAdminSerializer, AdminLoginSerializer)
+                          FlatBuildingSerializer, RegisterAdminSerializer, AdminLoginSerializer,
+                          RentRunSerializer, TenantArrearsSerializer, CollectionReportSerializer)
 import logging
 import requests
 from django.conf import settings
+from django.utils import timezone
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth import authenticate, login
@@ -27,10 +29,16 @@ from rest_framework.response import Response
 from rest_framework import status, permissions
 from rest_framework.exceptions import PermissionDenied, NotFound
 from rest_framework_simplejwt.tokens import RefreshToken
-import hashlib
 import json
 import logging
 from .forms import RegistrationForm
+from .caching import VersionedCacheMixin, bump_cache_version, get_cached_count
+from .routers import ReplicaReadMixin
+from .bulk import import_tenants, read_csv_rows
+from .parsers import ORJSONParser
+from .exports import (export_response, EXPORT_FORMATS, RENT_PAYMENT_COLUMNS,
+                      TENANT_COLUMNS, HOUSE_COLUMNS)
+from rest_framework.parsers import MultiPartParser, FormParser
 from django.shortcuts import render, redirect
 
 
@@ -41,36 +49,21 @@ from django.urls import reverse_lazy
 from django.contrib import messages
 from django.shortcuts import render
 from django.core.exceptions import ValidationError
+from django.db.models import Count, Q, Sum
 from .models import Tenant, House, RentPayment, FlatBuilding
 
 
 
 logger = logging.getLogger(__name__)
 
-CACHE_TTL = getattr(settings, 'CACHE_TTL', 60 * 15)
-
-def make_cache_key(request, prefix=""):
-    user_id = getattr(request.user, 'id', 'anonymous')
-    key = f"{prefix}:{user_id}:{request.get_full_path()}"
-    return hashlib.md5(key.encode('utf-8')).hexdigest()
-
-def get_cached_response(request, prefix=""):
-    key = make_cache_key(request, prefix)
-    return cache.get(key)
-
-def set_cached_response(request, data, prefix=""):
-    key = make_cache_key(request, prefix)
-    cache.set(key, data, CACHE_TTL)
-
-def clear_cache_pattern(request, prefix=""):
-    cache.delete_pattern(f"*{prefix}*")
 
 
 # ============================================================================
 # TENANT VIEWS
 # ============================================================================
 
-class TenantListView(generics.ListCreateAPIView):
+class TenantListView(ReplicaReadMixin, VersionedCacheMixin, generics.ListCreateAPIView):
+    cache_prefix = "tenants"
     serializer_class = TenantSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, OrderingFilter]
@@ -81,26 +74,38 @@ class TenantListView(generics.ListCreateAPIView):
         """Filter tenants to only show current user's tenants"""
         return Tenant.objects.filter(user=self.request.user).order_by('id')
     
-    def get(self, request, *args, **kwargs):
-        cached = get_cached_response(request, prefix="tenants")
-        if cached:
-            logger.debug(f"Serving cached tenants for user={request.user}") 
-            return Response(cached)
-        
-        response = super().get(request, *args, **kwargs)
-        set_cached_response(request, response.data, prefix="tenants")
-        logger.debug(f"Caching tenants for user={request.user}")
-        return response
-
     def perform_create(self, serializer):
     #    return proper response on capacity validation error during tenant creation
         try:
             tenant = serializer.save(user=self.request.user)
-            clear_cache_pattern(self.request, "tenants")
         except ValidationError as e:
             raise serializers.ValidationError({"detail": str(e)})
 
-class TenantDetailView(generics.RetrieveUpdateDestroyAPIView):
+class TenantBulkCreateView(APIView):
+    """Import many tenants at once from a JSON array or an uploaded CSV file"""
+    permission_classes = [IsAuthenticated]
+    parser_classes = [ORJSONParser, MultiPartParser, FormParser]
+
+    def post(self, request, *args, **kwargs):
+        upload = request.FILES.get('file')
+        rows = read_csv_rows(upload) if upload else request.data
+        if not isinstance(rows, list) or not rows:
+            return Response(
+                {"detail": "Send a non-empty JSON array of tenants or a CSV file in the 'file' field."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        created, errors = import_tenants(request.user, rows)
+        if errors:
+            return Response(
+                {"created": 0, "errors": [{"row": row, "errors": row_errors} for row, row_errors in errors.items()]},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response({"created": created}, status=status.HTTP_201_CREATED)
+
+class TenantDetailView(ReplicaReadMixin, VersionedCacheMixin, generics.RetrieveUpdateDestroyAPIView):
+    cache_prefix = "tenants"
+    cache_responses = False
     serializer_class = TenantSerializer
     permission_classes = [IsAuthenticated]
 
@@ -118,17 +123,16 @@ class TenantDetailView(generics.RetrieveUpdateDestroyAPIView):
 # HOUSE VIEWS
 # ============================================================================
 
-class HouseListView(generics.ListCreateAPIView):
+class HouseListView(ReplicaReadMixin, VersionedCacheMixin, generics.ListCreateAPIView):
+    cache_prefix = "houses"
     serializer_class = HouseSerializer
     permission_classes = [IsAuthenticated]
     ordering_fields = ['house_number', 'house_size', 'house_rent_amount']
 
     def get_queryset(self):
         """Filter houses to only show current user's houses"""
-        print("Fetching houses for user:", self.request.user)
         queryset = House.objects.filter(user=self.request.user)
-        print("Initial queryset count:", queryset.count())
-        
+
         # Optional filter by flat_building
         flat_building_id = self.request.query_params.get('flat_building_id')
         if flat_building_id:
@@ -137,27 +141,16 @@ class HouseListView(generics.ListCreateAPIView):
         
         return queryset.order_by('id')
 
-    def get(self, request, *args, **kwargs):
-        cached = get_cached_response(request, prefix="houses")
-        if cached:
-            logger.debug(f"Serving cached houses for user={request.user}")
-            return Response(cached)
-        response = super().get(request, *args, **kwargs)
-        set_cached_response(request, response.data, prefix="houses")
-        logger.debug(f"Caching houses for user={request.user}")
-        return response
-    
-
-
     def perform_create(self, serializer):
         """return proper response on capacity validation error during house creation"""
         try:
             house = serializer.save(user=self.request.user)
-            clear_cache_pattern(self.request, "houses")
         except ValidationError as e:
             raise serializers.ValidationError({"detail": str(e)})
 
-class HouseDetailView(generics.RetrieveUpdateDestroyAPIView):
+class HouseDetailView(ReplicaReadMixin, VersionedCacheMixin, generics.RetrieveUpdateDestroyAPIView):
+    cache_prefix = "houses"
+    cache_responses = False
     serializer_class = HouseSerializer
     permission_classes = [IsAuthenticated]
     lookup_field = 'pk'
@@ -171,7 +164,8 @@ class HouseDetailView(generics.RetrieveUpdateDestroyAPIView):
 # FLAT BUILDING VIEWS
 # ============================================================================
 
-class FlatBuildingListView(generics.ListCreateAPIView):
+class FlatBuildingListView(ReplicaReadMixin, VersionedCacheMixin, generics.ListCreateAPIView):
+    cache_prefix = "flats"
     serializer_class = FlatBuildingSerializer
     permission_classes = [IsAuthenticated]
 
@@ -187,20 +181,13 @@ class FlatBuildingListView(generics.ListCreateAPIView):
         
         return queryset.order_by('id')
 
-    def get(self, request, *args, **kwargs):
-        cached = get_cached_response(request, prefix="flats")
-        if cached:
-            return Response(cached)
-        response = super().get(request, *args, **kwargs)
-        set_cached_response(request, response.data, prefix="flats")
-        return response
-
     def perform_create(self, serializer):
         flat_building = serializer.save(user=self.request.user)
-        clear_cache_pattern(self.request, "flats")
 
 
-class FlatBuildingDetailView(generics.RetrieveUpdateDestroyAPIView):
+class FlatBuildingDetailView(ReplicaReadMixin, VersionedCacheMixin, generics.RetrieveUpdateDestroyAPIView):
+    cache_prefix = "flats"
+    cache_responses = False
     serializer_class = FlatBuildingSerializer
     permission_classes = [IsAuthenticated]
     lookup_field = 'pk' 
@@ -224,7 +211,8 @@ class FlatBuildingDetailView(generics.RetrieveUpdateDestroyAPIView):
 # RENT PAYMENT VIEWS
 # ============================================================================
 
-class RentPaymentListView(generics.ListCreateAPIView):
+class RentPaymentListView(ReplicaReadMixin, VersionedCacheMixin, generics.ListCreateAPIView):
+    cache_prefix = "rent_payments"
     serializer_class = RentPaymentSerializer
     permission_classes = [IsAuthenticated]
 
@@ -235,20 +223,36 @@ class RentPaymentListView(generics.ListCreateAPIView):
             user=self.request.user
         ).order_by('id')
 
-    def get(self, request, *args, **kwargs):
-        cached = get_cached_response(request, prefix="rent_payments")
-        if cached:
-            return Response(cached)
-        response = super().get(request, *args, **kwargs)
-        set_cached_response(request, response.data, prefix="rent_payments")
-        return response
-
     def perform_create(self, serializer):
         rent_payment = serializer.save(user=self.request.user)
-        clear_cache_pattern(self.request, "rent_payments")
 
 
-class RentPaymentDetailView(generics.RetrieveUpdateDestroyAPIView):
+class RentRunView(APIView):
+    """Create this month's (or the given month's) unpaid invoices for every active tenant"""
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        today = timezone.now().date()
+        serializer = RentRunSerializer(data={
+            'year': request.data.get('year', today.year),
+            'rent_month': request.data.get('rent_month', today.month),
+        })
+        serializer.is_valid(raise_exception=True)
+        year = serializer.validated_data['year']
+        month = serializer.validated_data['rent_month']
+
+        created = RentPayment.create_rent_run(request.user, year, month)
+        if created:
+            bump_cache_version(request.user.id, 'rent_payments', 'tenants', 'arrears')
+        return Response(
+            {"year": year, "rent_month": month, "created": created},
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK
+        )
+
+
+class RentPaymentDetailView(ReplicaReadMixin, VersionedCacheMixin, generics.RetrieveUpdateDestroyAPIView):
+    cache_prefix = "rent_payments"
+    cache_responses = False
     serializer_class = RentPaymentSerializer
     permission_classes = [IsAuthenticated]
 
@@ -263,6 +267,174 @@ class RentPaymentDetailView(generics.RetrieveUpdateDestroyAPIView):
         return queryset.order_by('id')
 
 
+# ============================================================================
+# ARREARS VIEWS
+# ============================================================================
+
+class ArrearsListView(ReplicaReadMixin, VersionedCacheMixin, generics.ListAPIView):
+    """Tenants who owe rent, largest debt first, aged into overdue buckets"""
+    cache_prefix = "arrears"
+    serializer_class = TenantArrearsSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        queryset = TenantArrears.objects.filter(user=self.request.user)
+
+        building_id = self.request.query_params.get('building')
+        if building_id:
+            queryset = queryset.filter(flat_building_id=building_id)
+
+        return queryset.select_related('tenant__house', 'flat_building').order_by('-total', 'id')
+
+
+class ArrearsSummaryView(APIView):
+    """Arrears buckets rolled up for the landlord and per building"""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        arrears = TenantArrears.objects.filter(user=request.user)
+        return Response({
+            'totals': arrears.rollup(),
+            'buildings': list(arrears.rollup('flat_building', 'flat_building__building_name')),
+        })
+
+
+class CollectionReportView(APIView):
+    """Expected against collected rent per building for a year, or one month of it"""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        serializer = CollectionReportSerializer(data={
+            'year': request.query_params.get('year', timezone.now().year),
+            **({'month': request.query_params['month']} if 'month' in request.query_params else {}),
+        })
+        serializer.is_valid(raise_exception=True)
+        year = serializer.validated_data['year']
+        month = serializer.validated_data.get('month')
+
+        rows = BuildingCollection.objects.filter(user=request.user, year=year)
+        if month:
+            rows = rows.filter(month=month)
+        buildings = list(rows.order_by().values('flat_building', 'flat_building__building_name').annotate(
+            expected_rent=Sum('expected_rent'),
+            collected=Sum('collected'),
+            paid_invoices=Sum('paid_invoices'),
+            unpaid_invoices=Sum('unpaid_invoices'),
+        ).order_by('flat_building__building_name'))
+
+        for building in buildings:
+            expected = building['expected_rent']
+            building['collection_rate'] = round(building['collected'] / expected, 4) if expected else None
+        return Response({'year': year, 'month': month, 'buildings': buildings})
+
+
+# ============================================================================
+# COUNT VIEWS
+# ============================================================================
+
+class ResourceCountView(APIView):
+    """
+    Totals for the list endpoints, for clients paging with `?cursor=`.
+    Each count is cached until a write to that resource bumps its namespace.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get_querysets(self, user):
+        # same rows as the matching list views
+        return {
+            'tenants': Tenant.objects.filter(user=user),
+            'houses': House.objects.filter(user=user),
+            'flats': FlatBuilding.objects.filter(user=user),
+            'rent_payments': RentPayment.objects.filter(user=user, is_paid=True),
+        }
+
+    def get(self, request, *args, **kwargs):
+        return Response({
+            resource: get_cached_count(request.user.id, resource, queryset)
+            for resource, queryset in self.get_querysets(request.user).items()
+        })
+
+
+# ============================================================================
+# EXPORT VIEWS
+# ============================================================================
+
+class BaseExportView(APIView):
+    """Stream every matching row as CSV or NDJSON instead of paging through the list endpoint"""
+    permission_classes = [IsAuthenticated]
+    columns = []
+    filename = ''
+    # query parameter -> queryset lookup
+    filters = {}
+
+    def get_queryset(self):
+        raise NotImplementedError
+
+    def perform_content_negotiation(self, request, force=False):
+        # the body is CSV/NDJSON whatever the client accepts; errors still render as JSON
+        return super().perform_content_negotiation(request, force=True)
+
+    def filter_queryset(self, queryset):
+        params = self.request.query_params
+        for param, lookup in self.filters.items():
+            value = params.get(param)
+            if value in (None, ''):
+                continue
+            if lookup.endswith(('is_paid', 'is_active', 'occupation')):
+                value = value.lower() in ('1', 'true', 'yes')
+            elif not value.isdigit():
+                raise serializers.ValidationError({param: "Must be a whole number."})
+            queryset = queryset.filter(**{lookup: value})
+        return queryset
+
+    def get(self, request, export_format, *args, **kwargs):
+        if export_format not in EXPORT_FORMATS:
+            raise NotFound(f"Unsupported export format '{export_format}'.")
+        queryset = self.filter_queryset(self.get_queryset()).order_by('id')
+        logger.info(f"Streaming {self.filename} export as {export_format} for user={request.user}")
+        return export_response(queryset, self.columns, self.filename, export_format)
+
+
+class RentPaymentExportView(BaseExportView):
+    columns = RENT_PAYMENT_COLUMNS
+    filename = 'rent_payments'
+    filters = {
+        'year': 'year',
+        'month': 'rent_month',
+        'is_paid': 'is_paid',
+        'building': 'tenant__house__flat_building_id',
+        'tenant': 'tenant_id',
+    }
+
+    def get_queryset(self):
+        return RentPayment.objects.filter(user=self.request.user)
+
+
+class TenantExportView(BaseExportView):
+    columns = TENANT_COLUMNS
+    filename = 'tenants'
+    filters = {
+        'is_active': 'is_active',
+        'building': 'house__flat_building_id',
+        'house': 'house_id',
+    }
+
+    def get_queryset(self):
+        return Tenant.objects.filter(user=self.request.user)
+
+
+class HouseExportView(BaseExportView):
+    columns = HOUSE_COLUMNS
+    filename = 'houses'
+    filters = {
+        'occupation': 'occupation',
+        'building': 'flat_building_id',
+    }
+
+    def get_queryset(self):
+        return House.objects.filter(user=self.request.user)
+
+
 # ============================================================================
 # AUTHENTICATION VIEWS
 # ============================================================================
@@ -381,15 +553,19 @@ def register(request):
 @login_required
 def dashboard(request):
     """Main dashboard showing summary stats"""
-    buildings = FlatBuilding.objects.filter(user=request.user)
-    total_houses = House.objects.filter(user=request.user).count()
-    occupied_houses = House.objects.filter(user=request.user, occupation=True).count()
+    buildings = FlatBuilding.objects.filter(user=request.user).with_stats()
+    house_totals = House.objects.filter(user=request.user).aggregate(
+        total=Count('pk'),
+        occupied=Count('pk', filter=Q(occupation=True)),
+    )
+    total_houses = house_totals['total']
+    occupied_houses = house_totals['occupied']
     active_tenants = Tenant.objects.filter(user=request.user, is_active=True).count()
     
     # Recent payments (last 5)
     recent_payments = RentPayment.objects.filter(
         user=request.user
-    ).order_by('-payment_date')[:5]
+    ).select_related('tenant').order_by('-payment_date')[:5]
     
     context = {
         'buildings': buildings,
@@ -406,13 +582,13 @@ def dashboard(request):
 # BUILDING VIEWS
 # ============================================================================
 
-class BuildingListView(LoginRequiredMixin, ListView):
+class BuildingListView(LoginRequiredMixin, ReplicaReadMixin, ListView):
     model = FlatBuilding
     template_name = 'buildings/building_list.html'
     context_object_name = 'buildings'
     
     def get_queryset(self):
-        return FlatBuilding.objects.filter(user=self.request.user)
+        return FlatBuilding.objects.filter(user=self.request.user).with_stats()
 
 
 class BuildingCreateView(LoginRequiredMixin, CreateView):
@@ -460,7 +636,7 @@ class BuildingDetailView(LoginRequiredMixin, DetailView):
     context_object_name = 'building'
     
     def get_queryset(self):
-        return FlatBuilding.objects.filter(user=self.request.user)
+        return FlatBuilding.objects.filter(user=self.request.user).with_stats()
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -473,13 +649,13 @@ class BuildingDetailView(LoginRequiredMixin, DetailView):
 # HOUSE VIEWS
 # ============================================================================
 
-class HouseListView(LoginRequiredMixin, ListView):
+class HouseWebListView(LoginRequiredMixin, ReplicaReadMixin, ListView):
     model = House
     template_name = 'houses/house_list.html'
     context_object_name = 'houses'
     
     def get_queryset(self):
-        queryset = House.objects.filter(user=self.request.user)
+        queryset = House.objects.filter(user=self.request.user).select_related('flat_building')
         # Optional filter by building
         building_id = self.request.GET.get('building')
         if building_id:
@@ -542,7 +718,7 @@ class HouseDeleteView(LoginRequiredMixin, DeleteView):
         return House.objects.filter(user=self.request.user)
 
 
-class HouseDetailView(LoginRequiredMixin, DetailView):
+class HouseWebDetailView(LoginRequiredMixin, DetailView):
     model = House
     template_name = 'houses/house_detail.html'
     context_object_name = 'house'
@@ -561,13 +737,13 @@ class HouseDetailView(LoginRequiredMixin, DetailView):
 # TENANT VIEWS
 # ============================================================================
 
-class TenantListView(LoginRequiredMixin, ListView):
+class TenantWebListView(LoginRequiredMixin, ReplicaReadMixin, ListView):
     model = Tenant
     template_name = 'tenants/tenant_list.html'
     context_object_name = 'tenants'
     
     def get_queryset(self):
-        queryset = Tenant.objects.filter(user=self.request.user)
+        queryset = Tenant.objects.filter(user=self.request.user).select_related('house__flat_building')
         # Optional filter by active status
         status = self.request.GET.get('status')
         if status == 'active':
@@ -631,7 +807,7 @@ class TenantDeleteView(LoginRequiredMixin, DeleteView):
         return Tenant.objects.filter(user=self.request.user)
 
 
-class TenantDetailView(LoginRequiredMixin, DetailView):
+class TenantWebDetailView(LoginRequiredMixin, DetailView):
     model = Tenant
     template_name = 'tenants/tenant_detail.html'
     context_object_name = 'tenant'
@@ -651,13 +827,15 @@ class TenantDetailView(LoginRequiredMixin, DetailView):
 # PAYMENT VIEWS
 # ============================================================================
 
-class PaymentListView(LoginRequiredMixin, ListView):
+class PaymentListView(LoginRequiredMixin, ReplicaReadMixin, ListView):
     model = RentPayment
     template_name = 'payments/payment_list.html'
     context_object_name = 'payments'
     
     def get_queryset(self):
-        return RentPayment.objects.filter(user=self.request.user).order_by('-payment_date')
+        return RentPayment.objects.filter(
+            user=self.request.user
+        ).select_related('tenant__house').order_by('-payment_date')
 
 
 class PaymentCreateView(LoginRequiredMixin, CreateView):
@@ -681,13 +859,25 @@ class PaymentCreateView(LoginRequiredMixin, CreateView):
         return super().form_valid(form)
 
 
-class OverduePaymentsView(LoginRequiredMixin, ListView):
-    model = RentPayment
+class OverduePaymentsView(LoginRequiredMixin, ReplicaReadMixin, ListView):
+    model = TenantArrears
     template_name = 'payments/overdue_payments.html'
-    context_object_name = 'overdue_payments'
-    
+    context_object_name = 'arrears'
+    paginate_by = 50
+
     def get_queryset(self):
-        return RentPayment.objects.filter(
-            user=self.request.user,
-            is_paid=False
-        ).order_by('year', 'rent_month')
\ No newline at end of file
+        return TenantArrears.objects.filter(
+            user=self.request.user
+        ).select_related('tenant__house', 'flat_building').order_by('-total', 'id')
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        paginator = super().get_paginator(queryset, per_page, **kwargs)
+        # the rollup already counted the rows
+        paginator.count = self.totals['tenants']
+        return paginator
+
+    def get_context_data(self, **kwargs):
+        self.totals = TenantArrears.objects.filter(user=self.request.user).rollup()
+        context = super().get_context_data(**kwargs)
+        context['totals'] = self.totals
+        return context
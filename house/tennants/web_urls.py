@@ -0,0 +1,38 @@
+from django.urls import path
+from .views import (OverduePaymentsView,
+                    BuildingListView, BuildingCreateView, BuildingDetailView, BuildingUpdateView, BuildingDeleteView,
+                    HouseCreateView, HouseWebListView, HouseUpdateView, HouseDeleteView, HouseWebDetailView,
+                    TenantCreateView, TenantUpdateView, TenantDeleteView, TenantWebListView, TenantWebDetailView,
+                    PaymentListView, PaymentCreateView,
+)
+
+urlpatterns = [
+    # ========================================
+    # WEB INTERFACE (Template-based)
+    # ========================================
+    # Buildings
+    path('buildings/', BuildingListView.as_view(), name='building_list'),
+    path('buildings/add/', BuildingCreateView.as_view(), name='building_add'),
+    path('buildings/<int:pk>/', BuildingDetailView.as_view(), name='building_detail'),
+    path('buildings/<int:pk>/edit/', BuildingUpdateView.as_view(), name='building_edit'),
+    path('buildings/<int:pk>/delete/', BuildingDeleteView.as_view(), name='building_delete'),
+    
+    # Houses
+    path('houses/', HouseWebListView.as_view(), name='house_list'),
+    path('houses/add/', HouseCreateView.as_view(), name='house_add'),
+    path('houses/<int:pk>/', HouseWebDetailView.as_view(), name='house_detail'),
+    path('houses/<int:pk>/edit/', HouseUpdateView.as_view(), name='house_edit'),
+    path('houses/<int:pk>/delete/', HouseDeleteView.as_view(), name='house_delete'),
+
+    # Tenants
+    path('tenants/', TenantWebListView.as_view(), name='tenant_list'),
+    path('tenants/add/', TenantCreateView.as_view(), name='tenant_add'),
+    path('tenants/<int:pk>/', TenantWebDetailView.as_view(), name='tenant_detail'),
+    path('tenants/<int:pk>/edit/', TenantUpdateView.as_view(), name='tenant_edit'),
+    path('tenants/<int:pk>/delete/', TenantDeleteView.as_view(), name='tenant_delete'), 
+
+    # Payments
+    path('payments/', PaymentListView.as_view(), name='payment_list'),
+    path('payments/add/', PaymentCreateView.as_view(), name='payment_add'),
+    path('payments/overdue/', OverduePaymentsView.as_view(), name='overdue_payments'),
+]